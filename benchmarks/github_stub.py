@@ -0,0 +1,428 @@
+import base64
+import datetime as dt
+import hashlib
+import http.server
+import json
+import re
+import threading
+import time
+import urllib.parse
+from typing import Any, Dict, Final, List, Optional, Tuple
+
+from ge_releaser.pulls import format_github_timestamp
+
+RATE_LIMIT: Final[int] = 5000
+DEFAULT_PER_PAGE: Final[int] = 30
+MAX_PER_PAGE: Final[int] = 100
+
+_MERGED_SINCE: Final[re.Pattern] = re.compile(r"merged:>(\S+)")
+_MERGED_RANGE: Final[re.Pattern] = re.compile(r"merged:(\d\S*)\.\.(\S+)")
+_BASE: Final[re.Pattern] = re.compile(r"base:(\S+)")
+_AUTHOR_ALIAS: Final[re.Pattern] = re.compile(r"pr(\d+): pullRequest\(number: (\d+)\)")
+
+
+class StubPullRequest:
+    __slots__ = (
+        "number",
+        "title",
+        "author",
+        "base_ref",
+        "merged_at",
+        "updated_at",
+        "labels",
+        "merge_sha",
+    )
+
+    def __init__(
+        self,
+        number: int,
+        title: str,
+        author: str,
+        base_ref: str,
+        merged_at: Optional[dt.datetime],
+        updated_at: dt.datetime,
+        labels: Optional[List[str]] = None,
+        merge_sha: Optional[str] = None,
+    ) -> None:
+        self.number = number
+        self.title = title
+        self.author = author
+        self.base_ref = base_ref
+        self.merged_at = merged_at
+        self.updated_at = updated_at
+        self.labels = labels or []
+        # Made up from the number unless the PR stands for a commit of a synthetic repo
+        self.merge_sha = merge_sha or hashlib.sha1(str(number).encode()).hexdigest()
+
+    def to_rest(self, api: str, repo_name: str) -> Dict[str, Any]:
+        return {
+            "number": self.number,
+            "title": self.title,
+            "state": "closed",
+            "url": f"{api}/repos/{repo_name}/pulls/{self.number}",
+            "html_url": f"https://github.com/{repo_name}/pull/{self.number}",
+            "user": {"login": self.author},
+            "base": {"ref": self.base_ref},
+            "labels": [{"name": label} for label in self.labels],
+            "created_at": format_github_timestamp(self.updated_at),
+            "updated_at": format_github_timestamp(self.updated_at),
+            "merged_at": format_github_timestamp(self.merged_at)
+            if self.merged_at
+            else None,
+        }
+
+    def to_graphql(self) -> Dict[str, Any]:
+        assert self.merged_at is not None
+        return {
+            "number": self.number,
+            "title": self.title,
+            "mergedAt": format_github_timestamp(self.merged_at),
+            "author": {"login": self.author},
+            "baseRefName": self.base_ref,
+            "labels": {"nodes": [{"name": label} for label in self.labels]},
+            "mergeCommit": {"oid": self.merge_sha},
+        }
+
+
+class StubState:
+    """
+    What the stand-in serves: one repo's PRs (newest first) and releases, plus the rate limit.
+    """
+
+    def __init__(
+        self,
+        repo_name: str,
+        pull_requests: List[StubPullRequest],
+        releases: Dict[str, dt.datetime],
+    ) -> None:
+        self.repo_name = repo_name
+        self.pull_requests = sorted(
+            pull_requests, key=lambda pr: pr.updated_at, reverse=True
+        )
+        self.by_number = {pr.number: pr for pr in pull_requests}
+        self.initial_releases = dict(releases)
+        self.lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        with self.lock:
+            self.releases: Dict[str, Dict[str, Any]] = {
+                tag: self._release(i + 1, tag, created_at, "")
+                for i, (tag, created_at) in enumerate(self.initial_releases.items())
+            }
+            self.created_pulls: List[Dict[str, Any]] = []
+            self.remaining = RATE_LIMIT
+            self.reset_at = int(time.time()) + 3600
+            self.requests = 0
+
+    def spend(self) -> Tuple[int, int]:
+        with self.lock:
+            self.requests += 1
+            if time.time() >= self.reset_at:
+                self.remaining = RATE_LIMIT
+                self.reset_at = int(time.time()) + 3600
+            self.remaining = max(self.remaining - 1, 0)
+            return self.remaining, self.reset_at
+
+    def _release(
+        self, id: int, tag: str, created_at: dt.datetime, body: str
+    ) -> Dict[str, Any]:
+        return {
+            "id": id,
+            "tag_name": tag,
+            "name": tag,
+            "body": body,
+            "draft": False,
+            "prerelease": False,
+            "url": f"/repos/{self.repo_name}/releases/{id}",
+            "html_url": f"https://github.com/{self.repo_name}/releases/tag/{tag}",
+            "created_at": format_github_timestamp(created_at),
+            "published_at": format_github_timestamp(created_at),
+        }
+
+
+class _Handler(http.server.BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    server: "GitHubStub"
+
+    def log_message(self, format: str, *args: Any) -> None:
+        return
+
+    @property
+    def state(self) -> StubState:
+        return self.server.state
+
+    @property
+    def api(self) -> str:
+        return f"http://{self.headers.get('Host')}"
+
+    def do_GET(self) -> None:
+        url = urllib.parse.urlsplit(self.path)
+        query = dict(urllib.parse.parse_qsl(url.query))
+        repo = f"/repos/{self.state.repo_name}"
+
+        if url.path == repo:
+            owner, name = self.state.repo_name.split("/")
+            self._json(
+                200,
+                {
+                    "full_name": self.state.repo_name,
+                    "name": name,
+                    "owner": {"login": owner},
+                    "url": f"{self.api}{repo}",
+                    "default_branch": "develop",
+                },
+            )
+        elif url.path == f"{repo}/pulls":
+            prs = [
+                pr
+                for pr in self.state.pull_requests
+                if "base" not in query or pr.base_ref == query["base"]
+            ]
+            self._page(
+                url.path,
+                query,
+                [pr.to_rest(self.api, self.state.repo_name) for pr in prs],
+            )
+        elif url.path == f"{repo}/releases":
+            with self.state.lock:
+                releases = sorted(
+                    self.state.releases.values(),
+                    key=lambda r: r["created_at"],
+                    reverse=True,
+                )
+            self._page(url.path, query, releases)
+        elif url.path.startswith(f"{repo}/releases/tags/"):
+            tag = urllib.parse.unquote(url.path.rsplit("/", 1)[1])
+            release = self.state.releases.get(tag)
+            if release is None:
+                self._json(404, {"message": "Not Found"})
+            else:
+                self._json(200, release)
+        else:
+            self._json(404, {"message": "Not Found"})
+
+    def do_POST(self) -> None:
+        length = int(self.headers.get("Content-Length", 0))
+        payload = json.loads(self.rfile.read(length) or b"{}")
+        repo = f"/repos/{self.state.repo_name}"
+
+        if self.path == "/graphql":
+            self._json(200, self._graphql(payload["query"], payload["variables"]))
+        elif self.path == f"{repo}/pulls":
+            with self.state.lock:
+                number = (
+                    max(self.state.by_number, default=0)
+                    + len(self.state.created_pulls)
+                    + 1
+                )
+                pr = {
+                    "number": number,
+                    "title": payload["title"],
+                    "state": "open",
+                    "url": f"{self.api}{repo}/pulls/{number}",
+                    "html_url": f"https://github.com/{self.state.repo_name}/pull/{number}",
+                    "user": {"login": "releaser"},
+                    "base": {"ref": payload["base"]},
+                    "head": {"ref": payload["head"]},
+                }
+                self.state.created_pulls.append(pr)
+            self._json(201, pr)
+        elif self.path == f"{repo}/releases":
+            tag = payload["tag_name"]
+            with self.state.lock:
+                release = self.state._release(
+                    len(self.state.releases) + 1,
+                    tag,
+                    dt.datetime.utcnow().replace(microsecond=0),
+                    payload.get("body", ""),
+                )
+                self.state.releases[tag] = release
+            self._json(201, release)
+        else:
+            self._json(404, {"message": "Not Found"})
+
+    def do_PATCH(self) -> None:
+        length = int(self.headers.get("Content-Length", 0))
+        payload = json.loads(self.rfile.read(length) or b"{}")
+        updated: Optional[Dict[str, Any]] = None
+        with self.state.lock:
+            for release in self.state.releases.values():
+                if self.path == release["url"]:
+                    release.update(payload)
+                    updated = dict(release)
+                    break
+        # Responding spends from the rate limit, which takes the state lock again
+        if updated is None:
+            self._json(404, {"message": "Not Found"})
+        else:
+            self._json(200, updated)
+
+    def _graphql(self, query: str, variables: Dict[str, Any]) -> Dict[str, Any]:
+        if "search(" in query:
+            search = variables["query"]
+            since = _MERGED_SINCE.search(search)
+            between = _MERGED_RANGE.search(search)
+            base = _BASE.search(search)
+            matches = [
+                pr
+                for pr in self.state.pull_requests
+                if pr.merged_at is not None
+                and (
+                    since is None
+                    or format_github_timestamp(pr.merged_at) > since.group(1)
+                )
+                and (
+                    between is None
+                    or between.group(1)
+                    <= format_github_timestamp(pr.merged_at)
+                    <= between.group(2)
+                )
+                and (base is None or pr.base_ref == base.group(1))
+            ]
+            offset = (
+                int(base64.b64decode(variables["after"]))
+                if variables.get("after")
+                else 0
+            )
+            first = variables["first"]
+            page = matches[offset : offset + first]
+            end = offset + len(page)
+            return {
+                "data": {
+                    "search": {
+                        "issueCount": len(matches),
+                        "pageInfo": {
+                            "hasNextPage": end < len(matches),
+                            "endCursor": base64.b64encode(str(end).encode()).decode(),
+                        },
+                        "nodes": [pr.to_graphql() for pr in page],
+                    }
+                }
+            }
+
+        repository: Dict[str, Any] = {}
+        errors = []
+        for alias, number in _AUTHOR_ALIAS.findall(query):
+            pr = self.state.by_number.get(int(number))
+            if pr is None:
+                repository[f"pr{alias}"] = None
+                errors.append(
+                    {
+                        "message": f"Could not resolve to a PullRequest with the number of {number}."
+                    }
+                )
+            else:
+                repository[f"pr{alias}"] = {
+                    "author": {"login": pr.author},
+                    "labels": {"nodes": [{"name": label} for label in pr.labels]},
+                }
+        response: Dict[str, Any] = {"data": {"repository": repository}}
+        if errors:
+            response["errors"] = errors
+        return response
+
+    def _page(
+        self, path: str, query: Dict[str, str], items: List[Dict[str, Any]]
+    ) -> None:
+        page = int(query.get("page", 1))
+        per_page = min(int(query.get("per_page", DEFAULT_PER_PAGE)), MAX_PER_PAGE)
+        last = max((len(items) + per_page - 1) // per_page, 1)
+
+        links = []
+        for rel, target in (("next", page + 1), ("last", last)):
+            if rel == "next" and page >= last:
+                continue
+            params = urllib.parse.urlencode({**query, "page": target})
+            links.append(f'<{self.api}{path}?{params}>; rel="{rel}"')
+
+        start = (page - 1) * per_page
+        self._json(
+            200,
+            items[start : start + per_page],
+            {"Link": ", ".join(links)} if links else {},
+        )
+
+    def _json(
+        self, status: int, payload: Any, headers: Optional[Dict[str, str]] = None
+    ) -> None:
+        body = json.dumps(payload).encode("utf-8")
+        etag = f'"{hashlib.sha1(body).hexdigest()}"'
+        # Like GitHub, conditional requests that come back 304 are free
+        if status == 200 and self.headers.get("If-None-Match") == etag:
+            status, body = 304, b""
+            remaining, reset_at = self.state.remaining, self.state.reset_at
+        else:
+            remaining, reset_at = self.state.spend()
+
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("ETag", etag)
+        self.send_header("X-RateLimit-Limit", str(RATE_LIMIT))
+        self.send_header("X-RateLimit-Remaining", str(remaining))
+        self.send_header("X-RateLimit-Reset", str(reset_at))
+        self.send_header("X-RateLimit-Used", str(RATE_LIMIT - remaining))
+        self.send_header("X-RateLimit-Resource", "core")
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+
+class GitHubStub(http.server.ThreadingHTTPServer):
+    """
+    A local stand-in for the GitHub REST and GraphQL endpoints `GitService` calls, with
+    GitHub's pagination (`Link` headers), ETags and `X-RateLimit-*` headers.
+    """
+
+    daemon_threads = True
+
+    def __init__(self, state: StubState) -> None:
+        super().__init__(("127.0.0.1", 0), _Handler)
+        self.state = state
+        self._thread = threading.Thread(target=self.serve_forever, daemon=True)
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.server_address[1]}"
+
+    def __enter__(self) -> "GitHubStub":
+        self._thread.start()
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        self.shutdown()
+        self.server_close()
+
+
+def synthetic_pull_requests(
+    count: int,
+    newest_merge: dt.datetime,
+    base_ref: str,
+    authors: List[str],
+    spacing: dt.timedelta = dt.timedelta(hours=1),
+) -> List[StubPullRequest]:
+    """
+    PRs numbered 1..count and merged `spacing` apart, the last one at `newest_merge`.
+
+    Every tenth PR was closed without merging, and every fifth is from an outside contributor.
+    """
+    pull_requests = []
+    for number in range(1, count + 1):
+        merged_at = newest_merge - (count - number) * spacing
+        external = number % 5 == 0
+        pull_requests.append(
+            StubPullRequest(
+                number=number,
+                title=f"[FEATURE] Synthetic change number {number}",
+                author=f"contributor-{number}"
+                if external
+                else authors[number % len(authors)],
+                base_ref=base_ref,
+                merged_at=None if number % 10 == 0 else merged_at,
+                updated_at=merged_at,
+                labels=["enhancement"],
+            )
+        )
+    return pull_requests
@@ -0,0 +1,362 @@
+"""
+Time the releaser against a synthetic GX repo and a local GitHub stand-in.
+
+    python -m benchmarks.run --tags 10000 --prs 5000 --changelog-mb 5
+    python -m benchmarks.run --compare benchmarks/results/<earlier run>.json
+"""
+
+import contextlib
+import datetime as dt
+import io
+import json
+import os
+import pathlib
+import platform
+import shutil
+import statistics
+import subprocess
+import tempfile
+import time
+from typing import Any, Callable, Dict, Final, Iterator, List, Optional
+
+import click
+
+from benchmarks.github_stub import GitHubStub, StubState, synthetic_pull_requests
+from benchmarks.synthetic_repo import (
+    TEAM_MEMBERS,
+    SyntheticRepo,
+    commit_time,
+    generate,
+)
+from ge_releaser.constants import (
+    GITHUB_REPO,
+    PR_FETCH_WORKERS,
+    REMOTE,
+    TRUNK,
+    GxFile,
+)
+
+RESULTS_DIR: Final[str] = os.path.join(os.path.dirname(__file__), "results")
+RESULTS_FORMAT: Final[int] = 1
+
+# Flag benchmarks whose median got slower than the baseline by more than this
+REGRESSION_THRESHOLD: Final[float] = 0.10
+
+
+@contextlib.contextmanager
+def _cwd(path: str) -> Iterator[None]:
+    previous = os.getcwd()
+    os.chdir(path)
+    try:
+        yield
+    finally:
+        os.chdir(previous)
+
+
+@contextlib.contextmanager
+def _quiet() -> Iterator[None]:
+    with contextlib.redirect_stdout(io.StringIO()):
+        yield
+
+
+def _summarize(runs: List[float]) -> Dict[str, Any]:
+    return {
+        "runs": runs,
+        "min": min(runs),
+        "median": statistics.median(runs),
+        "mean": statistics.mean(runs),
+    }
+
+
+def measure(
+    fn: Callable[[], Any],
+    repeat: int,
+    setup: Optional[Callable[[], None]] = None,
+) -> Dict[str, Any]:
+    """
+    Time `repeat` calls of `fn`, running the (untimed) `setup` before each one.
+    """
+    runs: List[float] = []
+    for _ in range(repeat):
+        if setup is not None:
+            setup()
+        start = time.perf_counter()
+        fn()
+        runs.append(time.perf_counter() - start)
+    return _summarize(runs)
+
+
+def _git_service(repo: SyntheticRepo, api_url: str) -> Any:
+    # Imported late so `--help` doesn't pay for GitPython/PyGithub
+    from ge_releaser.git import GitService
+
+    with _cwd(repo.path):
+        return GitService(
+            github_token="synthetic",
+            repo_name=GITHUB_REPO,
+            trunk=TRUNK,
+            remote=REMOTE,
+            http_cache=None,
+            api_url=api_url,
+        )
+
+
+def bench_hot_functions(
+    template: SyntheticRepo, stub: GitHubStub, workdir: str, repeat: int
+) -> Dict[str, Dict[str, Any]]:
+    from ge_releaser.changelog import ChangelogEntry, TeamsIndex
+    from ge_releaser.cmd.prep import _collect_prs_since_last_release
+    from ge_releaser.cmd.publish import _gather_release_notes
+    from ge_releaser.constants import RELEASER_STATE_DIR
+    from ge_releaser.tags import TAG_INDEX_FILE
+
+    repo = template.copy_to(os.path.join(workdir, "hot"))
+    git = _git_service(repo, stub.url)
+    index_path = os.path.join(repo.path, ".git", RELEASER_STATE_DIR, TAG_INDEX_FILE)
+    changelog = os.path.join(repo.path, GxFile.CHANGELOG_MD_V1.value)
+    scratch = os.path.join(workdir, "changelog.md")
+
+    # A new service per run, so the tag index is read back from disk (or rebuilt) every time
+    fresh = {"git": git}
+
+    def _renew_service() -> None:
+        fresh["git"] = _git_service(repo, stub.url)
+
+    def _drop_tag_index() -> None:
+        if os.path.exists(index_path):
+            os.remove(index_path)
+        _renew_service()
+
+    def _collect() -> List[Any]:
+        stub.state.reset()
+        return _collect_prs_since_last_release(
+            git, template.last_version, PR_FETCH_WORKERS
+        )
+
+    results: Dict[str, Dict[str, Any]] = {}
+    with _cwd(repo.path), _quiet():
+        results["get_tags.cold"] = measure(
+            lambda: fresh["git"].get_tags(), repeat, setup=_drop_tag_index
+        )
+        results["get_tags.warm"] = measure(
+            lambda: fresh["git"].get_tags(), repeat, setup=_renew_service
+        )
+        results["_collect_prs_since_last_release"] = measure(_collect, repeat)
+
+        snapshots = _collect()
+        teams = TeamsIndex.from_file()
+        results["ChangelogEntry.write"] = measure(
+            lambda: ChangelogEntry(snapshots, teams).write(
+                scratch, template.next_version
+            ),
+            repeat,
+            setup=lambda: shutil.copyfile(changelog, scratch),
+        )
+        # The oldest release is the last section, the worst case for a scan
+        results["_gather_release_notes"] = measure(
+            lambda: _gather_release_notes(
+                template.versions[0], pathlib.Path(changelog)
+            ),
+            repeat,
+        )
+    return results
+
+
+def bench_end_to_end(
+    template: SyntheticRepo, stub: GitHubStub, workdir: str, repeat: int
+) -> Dict[str, Dict[str, Any]]:
+    """
+    Run tag, prep and publish in sequence on a fresh copy of the repo for every round.
+
+    The commands are called directly rather than through the CLI, which skips the preflight
+    checks (they would reach out to the real GitHub).
+    """
+    from ge_releaser.cmd.prep import prep
+    from ge_releaser.cmd.publish import publish
+    from ge_releaser.cmd.tag import tag
+
+    runs: Dict[str, List[float]] = {"tag": [], "prep": [], "publish": []}
+    for i in range(repeat):
+        stub.state.reset()
+        repo = template.copy_to(os.path.join(workdir, f"e2e-{i}"))
+        with _cwd(repo.path), _quiet():
+            git = _git_service(repo, stub.url)
+            commands = {
+                "tag": lambda: tag(
+                    git=git,
+                    commit="HEAD",
+                    version_number=template.next_version,
+                    is_stable_release=True,
+                ),
+                "prep": lambda: prep(git=git),
+                "publish": lambda: publish(git=git),
+            }
+            for name, command in commands.items():
+                start = time.perf_counter()
+                command()
+                runs[name].append(time.perf_counter() - start)
+        shutil.rmtree(os.path.join(workdir, f"e2e-{i}"))
+
+    return {name: _summarize(durations) for name, durations in runs.items()}
+
+
+def compare(current: Dict[str, Any], baseline: Dict[str, Any]) -> List[str]:
+    """
+    Print median timings against `baseline`; returns the names of regressed benchmarks.
+    """
+    regressions: List[str] = []
+    click.echo(f"{'benchmark':40} {'baseline':>10} {'current':>10} {'change':>8}")
+    for name, result in current["benchmarks"].items():
+        previous = baseline["benchmarks"].get(name)
+        if previous is None:
+            click.echo(f"{name:40} {'-':>10} {result['median']:>10.4f}")
+            continue
+        change = result["median"] / previous["median"] - 1
+        regressed = change > REGRESSION_THRESHOLD
+        if regressed:
+            regressions.append(name)
+        click.secho(
+            f"{name:40} {previous['median']:>10.4f} {result['median']:>10.4f} {change:>+8.1%}",
+            fg="red" if regressed else None,
+        )
+    return regressions
+
+
+def _source_revision() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"],
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+@click.command()
+@click.option(
+    "--tags", "tag_count", type=click.IntRange(min=2), default=2000, show_default=True
+)
+@click.option(
+    "--prs", "pr_count", type=click.IntRange(min=1), default=2000, show_default=True
+)
+@click.option(
+    "--recent-prs",
+    type=click.IntRange(min=1),
+    default=300,
+    show_default=True,
+    help="PRs merged since the last release",
+)
+@click.option("--changelog-mb", type=float, default=2.0, show_default=True)
+@click.option("--repeat", type=click.IntRange(min=1), default=3, show_default=True)
+@click.option(
+    "--output",
+    type=click.Path(file_okay=False),
+    default=RESULTS_DIR,
+    show_default=True,
+    help="Directory the results JSON is written to",
+)
+@click.option(
+    "--compare",
+    "baseline_path",
+    type=click.Path(exists=True, dir_okay=False),
+    default=None,
+    help="Earlier results to compare against; exits non-zero on a regression",
+)
+def main(
+    tag_count: int,
+    pr_count: int,
+    recent_prs: int,
+    changelog_mb: float,
+    repeat: int,
+    output: str,
+    baseline_path: Optional[str],
+) -> None:
+    recent_prs = min(recent_prs, pr_count)
+    params = {
+        "tags": tag_count,
+        "prs": pr_count,
+        "recent_prs": recent_prs,
+        "changelog_mb": changelog_mb,
+        "repeat": repeat,
+    }
+
+    workdir = tempfile.mkdtemp(prefix="ge_releaser_bench.")
+    try:
+        start = time.perf_counter()
+        # The newest PRs are also the squash merges after the last tag
+        template = generate(
+            os.path.join(workdir, "template"),
+            tag_count=tag_count,
+            changelog_bytes=int(changelog_mb * 1024 * 1024),
+            pending_prs=list(range(pr_count - recent_prs + 1, pr_count + 1)),
+        )
+        click.secho(
+            f"Generated synthetic repo in {time.perf_counter() - start:.1f}s", dim=True
+        )
+
+        # The last release was published just before the oldest of the recent PRs was merged
+        newest_merge = dt.datetime(2030, 1, 1)
+        last_release = (
+            newest_merge - dt.timedelta(hours=recent_prs) + dt.timedelta(minutes=30)
+        )
+        state = StubState(
+            repo_name=GITHUB_REPO,
+            pull_requests=synthetic_pull_requests(
+                pr_count, newest_merge, base_ref=TRUNK, authors=TEAM_MEMBERS
+            ),
+            releases={
+                **{
+                    version: commit_time(i + 2)
+                    for i, version in enumerate(template.versions[:-1])
+                },
+                template.last_version: last_release,
+            },
+        )
+
+        benchmarks: Dict[str, Dict[str, Any]] = {}
+        with GitHubStub(state) as stub:
+            benchmarks.update(bench_hot_functions(template, stub, workdir, repeat))
+            benchmarks.update(bench_end_to_end(template, stub, workdir, repeat))
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    results = {
+        "format": RESULTS_FORMAT,
+        "created_at": dt.datetime.now(dt.timezone.utc).isoformat(),
+        "revision": _source_revision(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "params": params,
+        "benchmarks": benchmarks,
+    }
+    os.makedirs(output, exist_ok=True)
+    path = os.path.join(
+        output, f"{dt.datetime.now(dt.timezone.utc):%Y%m%dT%H%M%SZ}.json"
+    )
+    with open(path, "w") as f:
+        json.dump(results, f, indent=2)
+        f.write("\n")
+
+    for name, result in benchmarks.items():
+        click.echo(
+            f"{name:40} median {result['median']:.4f}s  min {result['min']:.4f}s"
+        )
+    click.secho(f"Results written to {path}", fg="green")
+
+    if baseline_path is not None:
+        with open(baseline_path) as f:
+            baseline = json.load(f)
+        if baseline.get("params") != params:
+            click.secho(
+                f"Baseline was run with different parameters: {baseline.get('params')}",
+                fg="yellow",
+            )
+        if compare(results, baseline):
+            raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,211 @@
+import datetime as dt
+import os
+import shutil
+import subprocess
+from typing import Final, List, NamedTuple, Tuple
+
+from ge_releaser.constants import GITHUB_REPO, TRUNK, GxFile
+
+# Commits are an hour apart, starting here
+EPOCH: Final[dt.datetime] = dt.datetime(2020, 1, 1)
+COMMIT_SPACING: Final[dt.timedelta] = dt.timedelta(hours=1)
+
+TEAM_MEMBERS: Final[List[str]] = [f"member-{i}" for i in range(20)]
+
+_IDENTITY: Final[str] = "Synthetic Bench <bench@example.com>"
+
+_DATA_COMPONENT: Final[str] = """export default {{
+  release_version: 'great_expectations, version {version}',
+  min_python: 'Python 3.9',
+  max_python: 'Python 3.12'
+}}
+"""
+
+_DOCS_CONFIG: Final[str] = """module.exports = {{
+  title: 'Great Expectations',
+  presets: [],
+  versions: {{
+    current: {{
+      label: '{version}',
+      path: ''
+    }}
+  }}
+}}
+"""
+
+_CHANGELOG_HEADER: Final[str] = """---
+id: changelog
+title: Changelog
+---
+
+"""
+
+
+class SyntheticRepo(NamedTuple):
+    """
+    A working clone at `path` whose `origin` is the bare repo at `remote`.
+
+    `versions` are the tagged releases, oldest first; `pending_prs` are the PR numbers of the
+    squash merges on the trunk after the last tag, newest first.
+    """
+
+    path: str
+    remote: str
+    versions: List[str]
+    pending_prs: List[int]
+
+    @property
+    def last_version(self) -> str:
+        return self.versions[-1]
+
+    @property
+    def next_version(self) -> str:
+        major, minor, patch = self.last_version.split(".")
+        return f"{major}.{minor}.{int(patch) + 1}"
+
+    def copy_to(self, root: str) -> "SyntheticRepo":
+        """
+        Copy the clone and its remote under `root`, for a run that is free to modify both.
+        """
+        path = os.path.join(root, "work")
+        remote = os.path.join(root, "origin.git")
+        shutil.copytree(self.path, path, symlinks=True)
+        shutil.copytree(self.remote, remote, symlinks=True)
+        _git(path, "remote", "set-url", "origin", remote)
+        return self._replace(path=path, remote=remote)
+
+
+def synthetic_versions(count: int) -> List[str]:
+    return [f"1.{i // 100}.{i % 100}" for i in range(count)]
+
+
+def generate(
+    root: str,
+    tag_count: int,
+    changelog_bytes: int,
+    pending_prs: List[int],
+) -> SyntheticRepo:
+    """
+    Build a repo with the `GxFile` layout under `root`: one commit per release tag, followed
+    by a squash merge for each of `pending_prs` (oldest first), and a changelog of roughly
+    `changelog_bytes` with a section per release.
+    """
+    path = os.path.join(root, "work")
+    remote = os.path.join(root, "origin.git")
+    versions = synthetic_versions(tag_count)
+
+    os.makedirs(path)
+    _git(path, "init", "--quiet", "--initial-branch", TRUNK)
+    subprocess.run(
+        ["git", "fast-import", "--quiet"],
+        cwd=path,
+        input=b"".join(_fast_import_stream(versions, changelog_bytes, pending_prs)),
+        check=True,
+    )
+    _git(path, "pack-refs", "--all")
+    _git(path, "checkout", "--quiet", "--force", TRUNK)
+    _git(path, "config", "user.name", "Synthetic Bench")
+    _git(path, "config", "user.email", "bench@example.com")
+
+    _git(root, "clone", "--quiet", "--bare", path, remote)
+    _git(path, "remote", "add", "origin", remote)
+    _git(path, "fetch", "--quiet", "origin")
+    _git(path, "branch", "--quiet", "--set-upstream-to", f"origin/{TRUNK}")
+
+    return SyntheticRepo(
+        path=path,
+        remote=remote,
+        versions=versions,
+        pending_prs=list(reversed(pending_prs)),
+    )
+
+
+def commit_time(mark: int) -> dt.datetime:
+    """
+    The (naive UTC) commit time of the `mark`-th commit; the commit tagged `versions[i]` is
+    mark `i + 2`.
+    """
+    return EPOCH + mark * COMMIT_SPACING
+
+
+def _timestamp(mark: int) -> int:
+    return int(commit_time(mark).replace(tzinfo=dt.timezone.utc).timestamp())
+
+
+def render_changelog(versions: List[str], changelog_bytes: int) -> str:
+    line_template = "* [FEATURE] Synthetic change number {number} ([#{number}](https://github.com/{repo}/pull/{number}))\n"
+    per_section = max(1, changelog_bytes // (len(versions) * len(line_template)))
+
+    parts = [_CHANGELOG_HEADER]
+    number = len(versions) * per_section
+    for release in reversed(versions):
+        parts.append(f"\n### {release}\n")
+        for _ in range(per_section):
+            parts.append(line_template.format(number=number, repo=GITHUB_REPO))
+            number -= 1
+    return "".join(parts)
+
+
+def render_teams() -> str:
+    members = "".join(f"  - {login}\n" for login in TEAM_MEMBERS)
+    return f"core:\n{members}"
+
+
+def _fast_import_stream(
+    versions: List[str], changelog_bytes: int, pending_prs: List[int]
+) -> List[bytes]:
+    latest = versions[-1]
+    stream: List[bytes] = []
+
+    def _commit(mark: int, message: str, files: List[Tuple[str, str]]) -> None:
+        stream.append(
+            f"commit refs/heads/{TRUNK}\nmark :{mark}\n"
+            f"committer {_IDENTITY} {_timestamp(mark)} +0000\n".encode()
+        )
+        stream.append(_data(message))
+        if mark > 1:
+            stream.append(f"from :{mark - 1}\n".encode())
+        for path, contents in files:
+            stream.append(f"M 100644 inline {path}\n".encode())
+            stream.append(_data(contents))
+        stream.append(b"\n")
+
+    _commit(
+        1,
+        "Initial commit",
+        [
+            (GxFile.CHANGELOG_MD_V1.value, render_changelog(versions, changelog_bytes)),
+            (GxFile.TEAMS.value, render_teams()),
+            (GxFile.DOCS_DATA_COMPONENT.value, _DATA_COMPONENT.format(version=latest)),
+            (GxFile.DOCS_CONFIG.value, _DOCS_CONFIG.format(version=latest)),
+        ],
+    )
+    for i, release in enumerate(versions, start=2):
+        _commit(
+            i,
+            f"[RELEASE] {release}",
+            [(GxFile.DEPLOYMENT_VERSION.value, f"{release}\n")],
+        )
+        stream.append(
+            f"tag {release}\nfrom :{i}\ntagger {_IDENTITY} {_timestamp(i)} +0000\n".encode()
+        )
+        stream.append(_data(release))
+
+    mark = len(versions) + 1
+    for number in pending_prs:
+        mark += 1
+        _commit(
+            mark,
+            f"[FEATURE] Synthetic change number {number} (#{number})",
+            [("great_expectations/synthetic.py", f"CHANGE = {number}\n")],
+        )
+    return stream
+
+
+def _data(contents: str) -> bytes:
+    encoded = contents.encode("utf-8")
+    return b"data %d\n" % len(encoded) + encoded + b"\n"
+
+
+def _git(cwd: str, *args: str) -> None:
+    subprocess.run(["git", *args], cwd=cwd, check=True)
@@ -1,92 +1,185 @@
 import datetime as dt
-import enum
 import re
-from typing import Callable, Dict, List, Tuple
-
-from github.PullRequest import PullRequest
-
-from ge_releaser.constants import GxFile, GxURL
-
-
-class ChangelogCategory(enum.Enum):
-    MINORBUMP = "MINORBUMP"
-    FEATURE = "FEATURE"
-    BUGFIX = "BUGFIX"
-    DOCS = "DOCS"
-    MAINTENANCE = "MAINTENANCE"
-    CONTRIB = "CONTRIB"
-
-
-class ChangelogCommit:
-    def __init__(self, pr: PullRequest) -> None:
-        teams: str
-        with open(GxFile.TEAMS) as f:
-            teams = f.read().strip()
-
-        title = pr.title.strip()
-        try:
-            type_, self.desc = re.match(r"\[([a-zA-Z]+)\] ?(.*)", title).group(1, 2)
-            type_ = type_.upper()
-            self.pr_type = (
-                ChangelogCategory[type_]
-                if type_ in ChangelogCategory.__members__
-                else ChangelogCategory.MAINTENANCE
-            )
-        except AttributeError:
-            print(f"Couldn't parse PR title: {title} ({pr.number})")
-            self.pr_type = ChangelogCategory.MAINTENANCE
-            self.desc = pr.title
-
-        self.number = pr.number
-        self.merge_timestamp = pr.merged_at
-        self.attribution = (
-            f" (thanks @{pr.user.login})" if pr.user.login not in teams else ""
+from typing import (
+    Callable,
+    Dict,
+    Final,
+    FrozenSet,
+    Generator,
+    Iterable,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    Tuple,
+)
+
+from ge_releaser.changelog_io import ChangelogFile
+from ge_releaser.classify import ChangelogCategory, Classification, Classifier
+from ge_releaser.constants import CHANGELOG_RULES_FILE, GITHUB_REPO, GxFile
+from ge_releaser.pulls import PullRequestSnapshot
+
+
+CATEGORY_ORDER: Final[Dict[ChangelogCategory, int]] = {
+    c: i + 1 for i, c in enumerate(ChangelogCategory)
+}
+
+# The `- login` items of the member lists in teams.yml (optionally quoted or with an `@`);
+# team names, other keys and comments are left out
+_TEAMS_LOGIN_PATTERN: Final[re.Pattern] = re.compile(
+    r"""^[ \t]*-[ \t]+["']?@?([A-Za-z0-9](?:[A-Za-z0-9-]*[A-Za-z0-9])?)["']?[ \t]*(?:#.*)?$""",
+    re.M,
+)
+
+
+class TeamsIndex:
+    """
+    The logins listed in `.github/teams.yml`, parsed once into a set.
+    """
+
+    __slots__ = ("_members",)
+
+    def __init__(self, members: Iterable[str]) -> None:
+        self._members: FrozenSet[str] = frozenset(m.lower() for m in members)
+
+    @classmethod
+    def from_file(cls, path: str = GxFile.TEAMS) -> "TeamsIndex":
+        with open(path) as f:
+            return cls(_TEAMS_LOGIN_PATTERN.findall(f.read()))
+
+    def __contains__(self, login: object) -> bool:
+        return isinstance(login, str) and login.lower() in self._members
+
+    def __len__(self) -> int:
+        return len(self._members)
+
+
+class ChangelogCommit(NamedTuple):
+    """
+    One changelog line; small and immutable so large entries don't keep PR payloads alive.
+    """
+
+    number: int
+    category: ChangelogCategory
+    desc: str
+    merged_at: dt.datetime
+    author: str
+    external: bool
+
+    @classmethod
+    def from_snapshot(
+        cls,
+        pr: PullRequestSnapshot,
+        teams: TeamsIndex,
+        classification: Classification,
+    ) -> "ChangelogCommit":
+        return cls(
+            number=pr["number"],
+            category=classification.category,
+            desc=classification.desc,
+            merged_at=pr["merged_at"],
+            author=pr["author"],
+            external=pr["author"] not in teams,
         )
 
-    def sort_key(self) -> Tuple[int, dt.datetime]:
-        categories: Dict[ChangelogCategory, int] = {
-            c: i + 1 for i, c in enumerate(ChangelogCategory)
-        }
-        return categories[self.pr_type], self.merge_timestamp
+    @property
+    def attribution(self) -> str:
+        return f" (thanks @{self.author})" if self.external else ""
+
+    def sort_key(self) -> Tuple[int, dt.datetime, int]:
+        # PR number breaks ties so the order never depends on how the PRs were fetched
+        return CATEGORY_ORDER[self.category], self.merged_at, self.number
 
-    def __str__(self) -> str:
-        details = f"* [{self.pr_type.value}] {self.desc}"
+    def render(self, pull_requests_url: str) -> str:
+        """
+        The changelog line, linking to the PR under `pull_requests_url`.
+        """
+        details = f"* [{self.category.value}] {self.desc}"
         reference = (
-            f"([#{self.number}]({GxURL.PULL_REQUESTS}/{self.number})){self.attribution}"
+            f"([#{self.number}]({pull_requests_url}/{self.number})){self.attribution}"
         )
         return f"{details} {reference}"
 
 
 class ChangelogEntry:
-    def __init__(self, pull_requests: List[PullRequest]) -> None:
-        changelog_commits: List[ChangelogCommit] = []
-        for pr in pull_requests:
-            changelog_commit: ChangelogCommit = ChangelogCommit(pr)
-            changelog_commits.append(changelog_commit)
+    """
+    The changelog lines of one release, bucketed by category as the PRs stream in.
+
+    Each bucket is only sorted on its own when the entry is rendered, so building an entry
+    never needs all of the PRs at once.
+    """
+
+    def __init__(
+        self,
+        pull_requests: Iterable[PullRequestSnapshot] = (),
+        teams: Optional[TeamsIndex] = None,
+        classifier: Optional[Classifier] = None,
+        repo_name: str = GITHUB_REPO,
+    ) -> None:
+        """
+        `repo_name` is the GitHub repo the PRs were merged into, which the lines link to.
+        """
+        if teams is None:
+            teams = TeamsIndex.from_file()
+        if classifier is None:
+            classifier = Classifier.from_file(CHANGELOG_RULES_FILE)
+
+        self._teams = teams
+        self._classifier = classifier
+        self._pull_requests_url = f"https://github.com/{repo_name}/pull"
+        # In `CATEGORY_ORDER`, which is the order the buckets are rendered in
+        self._buckets: Dict[ChangelogCategory, List[ChangelogCommit]] = {
+            category: [] for category in CATEGORY_ORDER
+        }
+        self.extend(pull_requests)
+
+    def extend(self, pull_requests: Iterable[PullRequestSnapshot]) -> None:
+        for pr, classification in self._classifier.classify_stream(pull_requests):
+            self.add(ChangelogCommit.from_snapshot(pr, self._teams, classification))
+
+    def add(self, commit: ChangelogCommit) -> None:
+        self._buckets[commit.category].append(commit)
 
-        changelog_commits.sort(key=ChangelogCommit.sort_key)
-        self.commits = changelog_commits
+    def __len__(self) -> int:
+        return sum(len(bucket) for bucket in self._buckets.values())
+
+    @property
+    def commits(self) -> Generator[ChangelogCommit, None, None]:
+        """
+        The lines of the entry, in changelog order.
+        """
+        for bucket in self._buckets.values():
+            bucket.sort(key=ChangelogCommit.sort_key)
+            yield from bucket
 
     def write(
         self,
         outfile: str,
-        current_version: str,
         release_version: str,
-    ) -> None:
-        with open(outfile, "r") as f:
-            contents: List[str] = f.readlines()
+    ) -> str:
+        """
+        Insert the entry for `release_version` into `outfile` and return the inserted text.
+        """
+        changelog = ChangelogFile(outfile)
+        if changelog.find(release_version) is not None:
+            raise ValueError(f"{outfile} already has an entry for {release_version}")
 
-        insertion_point: int = 0
-        for i, line in enumerate(contents):
-            if current_version in line:
-                insertion_point = i - 1
-                break
+        # The new entry goes in front of the newest version older than it
+        section = changelog.table.below(release_version)
 
         assert (
-            insertion_point > 0
+            section is not None and section.insert_offset > 0
         ), "Could not find appropriate insertion point for new changelog entry"
 
-        render_fn: Callable[[str], List[str]]
+        rendered = self.render(outfile, release_version)
+        changelog.insert(section.insert_offset, rendered)
+        return rendered
+
+    def render(self, outfile: str, release_version: str) -> str:
+        """
+        The entry for `release_version` in the format of `outfile` (Markdown or reStructuredText).
+        """
+        render_fn: Callable[[str], Iterator[str]]
         if outfile.endswith(".md"):
             render_fn = self._render_to_md
         elif outfile.endswith(".rst"):
@@ -94,32 +187,17 @@ class ChangelogEntry:
         else:
             raise ValueError("Invalid file type!")
 
-        contents[insertion_point:insertion_point] = render_fn(release_version)
+        return "".join(render_fn(release_version))
 
-        with open(outfile, "w") as f:
-            f.writelines(contents)
+    def _render_to_md(self, release_version: str) -> Iterator[str]:
+        yield f"\n### {release_version}\n"
+        yield from self._render_contents()
 
-    def _render_to_md(self, release_version: str) -> List[str]:
-        rendered: List[str] = []
-        title: str = f"\n### {release_version}\n"
-        rendered.append(title)
-        contents: List[str] = self._render_contents()
-        rendered.extend(contents)
-        return rendered
+    def _render_to_rst(self, release_version: str) -> Iterator[str]:
+        yield f"\n{release_version}\n"
+        yield "-----------------\n"
+        yield from self._render_contents()
 
-    def _render_to_rst(self, release_version: str) -> List[str]:
-        rendered: List[str] = []
-        title: str = f"\n{release_version}\n"
-        rendered.append(title)
-        divider: str = "-----------------\n"
-        rendered.append(divider)
-        contents: List[str] = self._render_contents()
-        rendered.extend(contents)
-        return rendered
-
-    def _render_contents(self) -> List[str]:
-        rendered: List[str] = []
+    def _render_contents(self) -> Iterator[str]:
         for commit in self.commits:
-            rendered.append(f"{commit}\n")
-
-        return rendered
+            yield f"{commit.render(self._pull_requests_url)}\n"
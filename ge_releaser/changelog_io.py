@@ -0,0 +1,294 @@
+import bisect
+import contextlib
+import mmap
+import os
+import re
+import shutil
+import tempfile
+from typing import (
+    BinaryIO,
+    Dict,
+    Final,
+    Generator,
+    Iterable,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    Tuple,
+    Union,
+)
+
+from packaging import version
+
+_COPY_CHUNK_SIZE: Final[int] = 1024 * 1024
+
+# `### 0.18.8`
+MD_HEADING: Final[re.Pattern] = re.compile(rb"^#{1,6}[ \t]+([^\r\n]*?)[ \t]*\r?$", re.M)
+# 0.18.8
+# -----------------
+RST_HEADING: Final[re.Pattern] = re.compile(
+    rb"^(\S[^\r\n]*?)[ \t]*\r?\n([-=~^])\2{2,}[ \t]*\r?$", re.M
+)
+
+
+class Section(NamedTuple):
+    """
+    Byte offsets of one changelog section.
+
+    `insert_offset` is the start of the line before the heading (usually blank), which is where
+    a newer section gets spliced in.
+    """
+
+    title: str
+    version: Optional[version.Version]
+    insert_offset: int
+    heading_offset: int
+    body_offset: int
+
+
+def _parse_heading_version(title: str) -> Optional[version.Version]:
+    # Allow trailing annotations such as `### 0.18.8 (yanked)`
+    candidate = title.split(maxsplit=1)[0] if title else ""
+    try:
+        return version.Version(candidate)
+    except version.InvalidVersion:
+        return None
+
+
+class SectionTable:
+    """
+    Versioned changelog sections sorted by `packaging.Version`, for exact and neighbour lookups.
+    """
+
+    def __init__(self, sections: List[Section]) -> None:
+        versioned = [s for s in sections if s.version is not None]
+        # Stable sort: if a version appears twice, the one nearest the top wins
+        versioned.sort(key=lambda s: s.version)
+        self._sections = versioned
+        self._versions = [s.version for s in versioned]
+
+    def __len__(self) -> int:
+        return len(self._sections)
+
+    def __iter__(self) -> Iterator[Section]:
+        return iter(self._sections)
+
+    def get(self, release_version: Union[str, version.Version]) -> Optional[Section]:
+        target = version.Version(str(release_version))
+        i = bisect.bisect_left(self._versions, target)
+        if i < len(self._versions) and self._versions[i] == target:
+            return self._sections[i]
+        return None
+
+    def below(self, release_version: Union[str, version.Version]) -> Optional[Section]:
+        """
+        The section for the highest version lower than `release_version`; in a newest-first
+        changelog, this is the section a new `release_version` entry goes in front of.
+        """
+        target = version.Version(str(release_version))
+        i = bisect.bisect_left(self._versions, target)
+        return self._sections[i - 1] if i > 0 else None
+
+    def above(self, release_version: Union[str, version.Version]) -> Optional[Section]:
+        target = version.Version(str(release_version))
+        i = bisect.bisect_right(self._versions, target)
+        return self._sections[i] if i < len(self._sections) else None
+
+
+class ChangelogFile:
+    """
+    Reads and edits a changelog without loading it: headings (`### <version>` in Markdown,
+    underlined titles in reStructuredText) are matched directly against a memory map, and
+    edits are streamed into a temporary file that atomically replaces the original.
+    """
+
+    def __init__(self, path: str) -> None:
+        self._path = path
+        self._heading = RST_HEADING if path.endswith(".rst") else MD_HEADING
+        self._sections: Optional[List[Section]] = None
+        self._table: Optional[SectionTable] = None
+
+    @property
+    def path(self) -> str:
+        return self._path
+
+    @property
+    def sections(self) -> List[Section]:
+        """
+        All sections, top to bottom.
+        """
+        if self._sections is None:
+            self._sections = list(self._scan())
+        return self._sections
+
+    @property
+    def table(self) -> SectionTable:
+        if self._table is None:
+            self._table = SectionTable(self.sections)
+        return self._table
+
+    def find(self, release_version: str) -> Optional[Section]:
+        """
+        The section of `release_version`. Until the table is needed, headings are scanned only
+        as far as that section, so finding a recent release doesn't read the whole file.
+        """
+        if self._sections is not None:
+            return self.table.get(release_version)
+
+        target = version.Version(release_version)
+        scanned: List[Section] = []
+        with contextlib.closing(self._scan()) as sections:
+            for section in sections:
+                # The first match is the one nearest the top, as in the table
+                if section.version == target:
+                    return section
+                scanned.append(section)
+        # Every heading was read, so keep them for the table
+        self._sections = scanned
+        return None
+
+    def _scan(self) -> Generator[Section, None, None]:
+        with open(self._path, "rb") as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                return
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                size = len(mm)
+                for match in self._heading.finditer(mm):
+                    heading_offset = match.start()
+                    title = match.group(1).strip().decode("utf-8")
+                    insert_offset = (
+                        mm.rfind(b"\n", 0, heading_offset - 1) + 1
+                        if heading_offset > 0
+                        else 0
+                    )
+                    yield Section(
+                        title=title,
+                        version=_parse_heading_version(title),
+                        insert_offset=insert_offset,
+                        heading_offset=heading_offset,
+                        body_offset=min(match.end() + 1, size),
+                    )
+
+    def read_section_lines(self, section: Section) -> List[str]:
+        """
+        Return the lines of a section's body up to its first blank line.
+        """
+        return next(self.iter_section_lines([section]))[1]
+
+    def iter_section_lines(
+        self, sections: Iterable[Section]
+    ) -> Generator[Tuple[Section, List[str]], None, None]:
+        """
+        Read the body lines of many sections while mapping the file only once.
+        """
+        with open(self._path, "rb") as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                return
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                for section in sections:
+                    mm.seek(section.body_offset)
+                    lines: List[str] = []
+                    for line in iter(mm.readline, b""):
+                        if not line.strip():
+                            break
+                        lines.append(line.decode("utf-8"))
+                    yield section, lines
+
+    def insert(self, offset: int, text: str) -> None:
+        """
+        Splice `text` in at byte `offset`; see `splice`.
+        """
+        self.splice([(offset, offset, text)])
+
+    def replace_sections(self, entries: Dict[str, str]) -> Tuple[int, int]:
+        """
+        Replace the sections of the versions in `entries` (heading and body) with the given
+        text, and insert those the changelog doesn't have yet in version order, in a single
+        streamed rewrite. Returns the number of sections replaced and inserted.
+
+        The text of each entry is expected to start with a blank line, like a rendered
+        `ChangelogEntry`.
+        """
+        edits: List[Tuple[int, int, version.Version, str]] = []
+        replaced = 0
+        with open(self._path, "rb") as f:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                for release_version, text in entries.items():
+                    target = version.Version(release_version)
+                    section = self.table.get(release_version)
+                    if section is not None:
+                        # Keep whatever precedes the heading; the entry brings its own blank line
+                        end = _body_end(mm, section)
+                        edits.append(
+                            (section.heading_offset, end, target, text.lstrip("\n"))
+                        )
+                        replaced += 1
+                        continue
+                    below = self.table.below(release_version)
+                    if below is None or below.insert_offset == 0:
+                        raise ValueError(
+                            f"Could not find where the entry for {release_version} goes in {self._path}"
+                        )
+                    edits.append(
+                        (below.insert_offset, below.insert_offset, target, text)
+                    )
+
+        # Entries inserted at the same spot go newest first, like the rest of the changelog
+        edits.sort(key=lambda e: e[2], reverse=True)
+        edits.sort(key=lambda e: (e[0], e[1]))
+        self.splice([(start, end, text) for start, end, _, text in edits])
+        return replaced, len(edits) - replaced
+
+    def splice(self, edits: List[Tuple[int, int, str]]) -> None:
+        """
+        Replace the byte ranges `[start, end)` with the given texts by streaming the changelog
+        and the new texts into a temporary file next to it, then atomically renaming it over the
+        original. Edits must be sorted and must not overlap.
+        """
+        directory = os.path.dirname(os.path.abspath(self._path))
+        fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".changelog.")
+        try:
+            with open(self._path, "rb") as src, os.fdopen(fd, "wb") as dst:
+                position = 0
+                for start, end, text in edits:
+                    if start < position or end < start:
+                        raise ValueError("Changelog edits must be sorted and disjoint")
+                    _copy_bytes(src, dst, start - position)
+                    dst.write(text.encode("utf-8"))
+                    src.seek(end)
+                    position = end
+                shutil.copyfileobj(src, dst, _COPY_CHUNK_SIZE)
+                dst.flush()
+                os.fsync(dst.fileno())
+            shutil.copymode(self._path, tmp_path)
+            os.replace(tmp_path, self._path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+
+        # Every offset after the first edit has moved
+        self._sections = None
+        self._table = None
+
+
+def _body_end(mm: mmap.mmap, section: Section) -> int:
+    """
+    Offset just past the last line of a section's body (its first blank line ends it).
+    """
+    mm.seek(section.body_offset)
+    end = section.body_offset
+    for line in iter(mm.readline, b""):
+        if not line.strip():
+            break
+        end = mm.tell()
+    return end
+
+
+def _copy_bytes(src: BinaryIO, dst: BinaryIO, count: int) -> None:
+    while count > 0:
+        chunk = src.read(min(_COPY_CHUNK_SIZE, count))
+        if not chunk:
+            break
+        dst.write(chunk)
+        count -= len(chunk)
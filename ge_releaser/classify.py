@@ -0,0 +1,261 @@
+import enum
+import itertools
+import json
+import os
+import re
+import time
+from typing import (
+    Dict,
+    Final,
+    Generator,
+    Iterable,
+    List,
+    NamedTuple,
+    Optional,
+    Tuple,
+)
+
+from ge_releaser.constants import CLASSIFY_BATCH_SIZE, ClassificationRule
+from ge_releaser.pulls import PullRequestSnapshot
+from ge_releaser.trace import TRACER
+
+
+class ChangelogCategory(enum.Enum):
+    MINORBUMP = "MINORBUMP"
+    FEATURE = "FEATURE"
+    BUGFIX = "BUGFIX"
+    DOCS = "DOCS"
+    MAINTENANCE = "MAINTENANCE"
+    CONTRIB = "CONTRIB"
+
+
+# `[FIX] Foo`: every category name is its own tag, plus these aliases
+DEFAULT_TAG_ALIASES: Final[Dict[str, ChangelogCategory]] = {
+    "FEAT": ChangelogCategory.FEATURE,
+    "FIX": ChangelogCategory.BUGFIX,
+    "BUG": ChangelogCategory.BUGFIX,
+    "DOC": ChangelogCategory.DOCS,
+    "MAINT": ChangelogCategory.MAINTENANCE,
+    "CHORE": ChangelogCategory.MAINTENANCE,
+}
+
+# `fix(core)!: Foo`, see https://www.conventionalcommits.org
+DEFAULT_PREFIXES: Final[Dict[str, ChangelogCategory]] = {
+    "feat": ChangelogCategory.FEATURE,
+    "fix": ChangelogCategory.BUGFIX,
+    "docs": ChangelogCategory.DOCS,
+    "build": ChangelogCategory.MAINTENANCE,
+    "chore": ChangelogCategory.MAINTENANCE,
+    "ci": ChangelogCategory.MAINTENANCE,
+    "perf": ChangelogCategory.MAINTENANCE,
+    "refactor": ChangelogCategory.MAINTENANCE,
+    "revert": ChangelogCategory.MAINTENANCE,
+    "style": ChangelogCategory.MAINTENANCE,
+    "test": ChangelogCategory.MAINTENANCE,
+}
+
+# Used only when the title has neither a known tag nor a known prefix; earlier entries win
+DEFAULT_LABELS: Final[Dict[str, ChangelogCategory]] = {
+    "bug": ChangelogCategory.BUGFIX,
+    "enhancement": ChangelogCategory.FEATURE,
+    "feature": ChangelogCategory.FEATURE,
+    "documentation": ChangelogCategory.DOCS,
+    "contrib": ChangelogCategory.CONTRIB,
+    "dependencies": ChangelogCategory.MAINTENANCE,
+}
+
+_RULES_KEYS: Final[Tuple[str, ...]] = ("tags", "prefixes", "labels", "default")
+_TAG_KEY: Final[re.Pattern] = re.compile(r"[A-Za-z]+")
+
+
+class ClassificationRules(NamedTuple):
+    """
+    The table a `Classifier` is compiled from.
+    """
+
+    tags: Dict[str, ChangelogCategory]
+    prefixes: Dict[str, ChangelogCategory]
+    labels: Dict[str, ChangelogCategory]
+    default: ChangelogCategory = ChangelogCategory.MAINTENANCE
+
+    @classmethod
+    def defaults(cls) -> "ClassificationRules":
+        tags = {c.value: c for c in ChangelogCategory}
+        tags.update(DEFAULT_TAG_ALIASES)
+        return cls(
+            tags=tags, prefixes=dict(DEFAULT_PREFIXES), labels=dict(DEFAULT_LABELS)
+        )
+
+    @classmethod
+    def from_file(cls, path: str) -> "ClassificationRules":
+        """
+        The default rules, extended or overridden by a JSON object such as
+        `{"tags": {"HOTFIX": "BUGFIX"}, "prefixes": {...}, "labels": {...}, "default": "DOCS"}`.
+        A missing file leaves the defaults as they are.
+        """
+        rules = cls.defaults()
+        if not os.path.exists(path):
+            return rules
+        with open(path) as f:
+            entries = json.load(f)
+        if not isinstance(entries, dict):
+            raise ValueError(f"{path} must contain a JSON object")
+        unknown = set(entries) - set(_RULES_KEYS)
+        if unknown:
+            raise ValueError(f"{path} has unknown keys {sorted(unknown)}")
+
+        for key, normalize in (
+            ("tags", str.upper),
+            ("prefixes", str.lower),
+            ("labels", str.lower),
+        ):
+            table: Dict[str, ChangelogCategory] = getattr(rules, key)
+            for name, category in entries.get(key, {}).items():
+                if key == "tags" and not _TAG_KEY.fullmatch(name):
+                    raise ValueError(f"Tag '{name}' in {path} must only have letters")
+                table[normalize(name)] = _category(path, category)
+
+        if "default" in entries:
+            rules = rules._replace(default=_category(path, entries["default"]))
+        return rules
+
+
+def _category(path: str, name: str) -> ChangelogCategory:
+    try:
+        return ChangelogCategory[name.upper()]
+    except (KeyError, AttributeError):
+        raise ValueError(f"Unknown changelog category '{name}' in {path}") from None
+
+
+class Classification(NamedTuple):
+    category: ChangelogCategory
+    desc: str
+    rule: ClassificationRule
+
+
+class ClassificationStats:
+    """
+    Running totals of everything a `Classifier` has classified.
+    """
+
+    def __init__(self) -> None:
+        self.titles = 0
+        self.seconds = 0.0
+        self.categories: Dict[ChangelogCategory, int] = {
+            c: 0 for c in ChangelogCategory
+        }
+        self.rules: Dict[ClassificationRule, int] = {r: 0 for r in ClassificationRule}
+
+    @property
+    def throughput(self) -> float:
+        """
+        Titles classified per second.
+        """
+        return self.titles / self.seconds if self.seconds else 0.0
+
+    def __str__(self) -> str:
+        categories = ", ".join(
+            f"{category.value}: {count}"
+            for category, count in self.categories.items()
+            if count
+        )
+        return (
+            f"{self.titles} titles ({categories}); "
+            f"{self.rules[ClassificationRule.DEFAULT]} fell back to the default "
+            f"({self.throughput:,.0f} titles/s)"
+        )
+
+
+class Classifier:
+    """
+    Sorts PR titles into changelog categories.
+
+    The tags and conventional-commit prefixes of the rules are compiled into a single regular
+    expression, so a title costs one match and a dict lookup, and never an exception.
+    """
+
+    def __init__(self, rules: Optional[ClassificationRules] = None) -> None:
+        if rules is None:
+            rules = ClassificationRules.defaults()
+        self._rules = rules
+        self._label_rank = {
+            label: (rank, category)
+            for rank, (label, category) in enumerate(rules.labels.items())
+        }
+        # `(?!)` never matches, for rules without prefixes
+        prefixes = "|".join(map(re.escape, rules.prefixes)) or "(?!)"
+        # Any bracketed tag is stripped from the description, even one the rules don't know
+        self._pattern = re.compile(
+            r"(?:\[(?P<tag>[A-Za-z]+)\]"
+            rf"|(?P<prefix>(?i:{prefixes}))(?:\([^)]*\))?!?:)"
+            r"\s*(?P<desc>.*)",
+            re.S,
+        )
+        self.stats = ClassificationStats()
+
+    @classmethod
+    def from_file(cls, path: str) -> "Classifier":
+        return cls(ClassificationRules.from_file(path))
+
+    def classify(self, title: str, labels: Iterable[str] = ()) -> Classification:
+        title = title.strip()
+        match = self._pattern.match(title)
+        desc = title
+        if match is not None:
+            tag, prefix, desc = match.group("tag", "prefix", "desc")
+            category = (
+                self._rules.tags.get(tag.upper())
+                if tag is not None
+                else self._rules.prefixes.get(prefix.lower())
+            )
+            if category is not None:
+                rule = ClassificationRule.TAG if tag else ClassificationRule.PREFIX
+                return Classification(category, desc, rule)
+
+        ranked = [
+            self._label_rank[label]
+            for label in map(str.lower, labels)
+            if label in self._label_rank
+        ]
+        if ranked:
+            _, category = min(ranked)
+            return Classification(category, desc, ClassificationRule.LABEL)
+        return Classification(self._rules.default, desc, ClassificationRule.DEFAULT)
+
+    def classify_batch(
+        self, pull_requests: Iterable[PullRequestSnapshot]
+    ) -> List[Classification]:
+        """
+        Classify many PRs at once, adding them to `stats`.
+        """
+        start = time.perf_counter()
+        classifications = [
+            self.classify(pr["title"], pr["labels"]) for pr in pull_requests
+        ]
+        elapsed = time.perf_counter() - start
+
+        stats = self.stats
+        stats.titles += len(classifications)
+        stats.seconds += elapsed
+        for classification in classifications:
+            stats.categories[classification.category] += 1
+            stats.rules[classification.rule] += 1
+        TRACER.count("classify.titles", len(classifications))
+        TRACER.count("classify.seconds", elapsed)
+        return classifications
+
+    def classify_stream(
+        self,
+        pull_requests: Iterable[PullRequestSnapshot],
+        batch_size: int = CLASSIFY_BATCH_SIZE,
+    ) -> Generator[Tuple[PullRequestSnapshot, Classification], None, None]:
+        """
+        Classify PRs as they are produced, `batch_size` at a time, so that only one batch is
+        held at once.
+        """
+        iterator = iter(pull_requests)
+        while True:
+            batch = list(itertools.islice(iterator, batch_size))
+            if not batch:
+                return
+            yield from zip(batch, self.classify_batch(batch))
@@ -1,24 +1,91 @@
+import datetime as dt
+import functools
 import logging
 import os
-from typing import Final
+import time
+from typing import TYPE_CHECKING, Any, Callable, Final, Optional, TypeVar, cast
 
 import click
 
-from ge_releaser.cmd.prep import prep
-from ge_releaser.cmd.publish import publish
-from ge_releaser.cmd.tag import tag
-from ge_releaser.git import GitService
-from ge_releaser.utils import setup
+from ge_releaser.constants import (
+    BACKFILL_WORKERS,
+    BATCH_WORKERS,
+    PR_FETCH_WORKERS,
+    WAIT_TIMEOUT,
+    PrCollector,
+    ReleaseCommand,
+)
+from ge_releaser.trace import TRACER
+
+# Command modules pull in GitPython, PyGithub and requests; they are imported inside each command
+# so that `--help` and argument validation stay instant and never touch the network.
+if TYPE_CHECKING:
+    from ge_releaser.git import GitService
 
 LOG_LEVEL_NAME: Final[str] = os.environ.get("GE_RELEASE_LOG_LEVEL", "WARNING")
 LOG_LEVEL: Final[int] = logging.getLevelName(LOG_LEVEL_NAME.upper())
 
 logging.basicConfig(level=LOG_LEVEL)
 
+F = TypeVar("F", bound=Callable[..., Any])
+
+
+def pass_git(
+    needs_github: bool = True, worktree_optional_flag: Optional[str] = None
+) -> Callable[[F], F]:
+    """
+    Like `click.pass_obj`, but runs the preflight checks and builds the `GitService` only
+    once click has parsed and validated the command's arguments.
+
+    When the command's `worktree_optional_flag` is set, the checks of the working tree are
+    skipped, since the command then doesn't use it.
+    """
+
+    def decorator(f: F) -> F:
+        @functools.wraps(f)
+        def new_func(*args: Any, **kwargs: Any) -> Any:
+            from ge_releaser.utils import setup
+
+            with TRACER.span("setup"):
+                needs_worktree = not (
+                    worktree_optional_flag and kwargs.get(worktree_optional_flag)
+                )
+                git = setup(needs_github=needs_github, needs_worktree=needs_worktree)
+            return f(git, *args, **kwargs)
+
+        return cast(F, new_func)
+
+    return decorator
+
+
+def _validate_version_number(
+    ctx: click.Context, param: click.Parameter, value: Optional[str]
+) -> Optional[str]:
+    if value is None:
+        return value
+
+    from ge_releaser.cmd.tag import check_version_validity
+
+    try:
+        check_version_validity(
+            version_number=value,
+            is_stable_release=ctx.params.get("is_stable_release", False),
+        )
+    except ValueError as e:
+        raise click.BadParameter(str(e), ctx=ctx, param=param) from e
+    return value
+
 
 @click.group()
+@click.option(
+    "--trace",
+    "trace_path",
+    type=click.Path(dir_okay=False, writable=True),
+    default=None,
+    help="Write a JSON trace of step timings and GitHub API usage to this file",
+)
 @click.pass_context
-def cli(ctx: click.Context) -> None:
+def cli(ctx: click.Context, trace_path: Optional[str]) -> None:
     """
     A set of utilities to aid with the Great Expectations release process!
 
@@ -26,38 +93,283 @@ def cli(ctx: click.Context) -> None:
 
     Please run `<command> help` for more specific details.
     """
-    setup(ctx)
+    if trace_path is None:
+        return
+
+    TRACER.enable()
+    command = ctx.invoked_subcommand
+    # Callbacks run last-in first-out: the command span is closed before the trace is written
+    ctx.call_on_close(lambda: TRACER.write(trace_path, command=command))
+    ctx.with_resource(TRACER.span(f"command.{command}"))
 
 
 @cli.command(name="tag", help="Tag the new release")
 @click.argument("commit", type=str, nargs=1, required=True)
-@click.argument("version_number", type=str, nargs=1, required=True)
-@click.option("--stable", "is_stable_release", default=False, is_flag=True)
-@click.pass_obj
+@click.argument(
+    "version_number",
+    type=str,
+    nargs=1,
+    required=True,
+    callback=_validate_version_number,
+)
+# Eager so that it is parsed before `version_number` is validated against it
+@click.option(
+    "--stable", "is_stable_release", default=False, is_flag=True, is_eager=True
+)
+@click.option(
+    "--wait",
+    "wait_for_release",
+    default=False,
+    is_flag=True,
+    help="Wait for the CI run of the tag to pass and the release to reach PyPI",
+)
+@pass_git(needs_github=False)
 def tag_cmd(
-    git: GitService, commit: str, version_number: str, is_stable_release: bool
+    git: "GitService",
+    commit: str,
+    version_number: str,
+    is_stable_release: bool,
+    wait_for_release: bool,
 ) -> None:
+    from ge_releaser.cmd.tag import tag
+    from ge_releaser.cmd.wait import wait
+
     tag(
         git=git,
         commit=commit,
         version_number=version_number,
         is_stable_release=is_stable_release,
     )
+    if wait_for_release:
+        wait(git=git, version_number=version_number)
+
+
+@cli.command(
+    name="wait",
+    help="Wait for the CI run of a pushed tag to pass and the release to reach PyPI",
+)
+@click.argument("version_number", type=str, nargs=1, required=True)
+@click.option(
+    "--timeout",
+    type=click.IntRange(min=1),
+    default=WAIT_TIMEOUT // 60,
+    show_default=True,
+    help="Minutes to wait before giving up",
+)
+@pass_git()
+def wait_cmd(git: "GitService", version_number: str, timeout: int) -> None:
+    from ge_releaser.cmd.wait import wait
+
+    wait(git=git, version_number=version_number, timeout=timeout * 60)
 
 
 @cli.command(
     name="prep",
     help="Prepare changelog, release version, and Getting Started version in a PR",
 )
-@click.pass_obj
-def prep_cmd(git: GitService) -> None:
-    prep(git=git)
+@click.option(
+    "--collector",
+    type=click.Choice([c.value for c in PrCollector]),
+    default=PrCollector.REST.value,
+    show_default=True,
+    help="How to collect the PRs merged since the last release",
+)
+@click.option(
+    "--workers",
+    type=click.IntRange(min=1),
+    default=PR_FETCH_WORKERS,
+    show_default=True,
+    help="Number of PRs to resolve concurrently",
+)
+@click.option(
+    "--dry-run",
+    default=False,
+    is_flag=True,
+    help="Only show the version file changes prep would make to the current checkout",
+)
+@click.option(
+    "--resume",
+    default=False,
+    is_flag=True,
+    help="Skip the steps an interrupted prep of the same release already finished",
+)
+@click.option(
+    "--plumbing",
+    default=False,
+    is_flag=True,
+    help="Build the prep commit from the trunk's tree without touching the checkout (works in a bare clone)",
+)
+@pass_git(worktree_optional_flag="plumbing")
+def prep_cmd(
+    git: "GitService",
+    collector: str,
+    workers: int,
+    dry_run: bool,
+    resume: bool,
+    plumbing: bool,
+) -> None:
+    from ge_releaser.cmd.prep import prep
+
+    prep(
+        git=git,
+        collector=PrCollector(collector),
+        workers=workers,
+        dry_run=dry_run,
+        resume=resume,
+        plumbing=plumbing,
+    )
 
 
 @cli.command(name="publish", help="Publish a new release entry in our GitHub page")
-@click.pass_obj
-def publish_cmd(git: GitService) -> None:
-    publish(git=git)
+@click.option(
+    "--backfill",
+    default=False,
+    is_flag=True,
+    help="Create or update the release page of every tagged version in the changelog",
+)
+@click.option(
+    "--workers",
+    type=click.IntRange(min=1),
+    default=BACKFILL_WORKERS,
+    show_default=True,
+    help="Number of release pages to write concurrently with --backfill",
+)
+@pass_git()
+def publish_cmd(git: "GitService", backfill: bool, workers: int) -> None:
+    from ge_releaser.cmd.publish import backfill as backfill_releases
+    from ge_releaser.cmd.publish import publish
+
+    if backfill:
+        backfill_releases(git=git, workers=workers)
+    else:
+        publish(git=git)
+
+
+@cli.command(
+    name="batch",
+    help="Run tag, prep or publish for several (repo, trunk, version) targets at once",
+)
+@click.argument("command", type=click.Choice([c.value for c in ReleaseCommand]))
+@click.argument("targets_file", type=click.Path(exists=True, dir_okay=False))
+@click.option(
+    "--workers",
+    type=click.IntRange(min=1),
+    default=BATCH_WORKERS,
+    show_default=True,
+    help="Number of targets to process concurrently",
+)
+@pass_git()
+def batch_cmd(git: "GitService", command: str, targets_file: str, workers: int) -> None:
+    from ge_releaser.cmd.batch import batch, load_targets
+
+    try:
+        targets = load_targets(targets_file)
+    except ValueError as e:
+        raise click.BadParameter(str(e), param_hint="TARGETS_FILE") from e
+
+    batch(git=git, command=ReleaseCommand(command), targets=targets, workers=workers)
+
+
+@cli.command(
+    name="sync",
+    help="Update the local ledger of PRs merged into the trunk (used by `prep --collector ledger`)",
+)
+@click.option(
+    "--since",
+    type=click.DateTime(formats=["%Y-%m-%d", "%Y-%m-%dT%H:%M:%S"]),
+    default=None,
+    help="Backfill PRs merged since this UTC date (defaults to the last release for a new ledger)",
+)
+@pass_git()
+def sync_cmd(git: "GitService", since: Optional[dt.datetime]) -> None:
+    from ge_releaser.cmd.sync import sync
+
+    sync(git=git, since=since)
+
+
+@cli.command(
+    name="classify",
+    help="Report how the changelog rules sort every PR in the ledger into categories",
+)
+@click.option(
+    "--rules",
+    type=click.Path(exists=True, dir_okay=False),
+    default=None,
+    help="Rules file to try instead of the repo's .github/changelog_rules.json",
+)
+@click.option(
+    "--since",
+    type=click.DateTime(formats=["%Y-%m-%d", "%Y-%m-%dT%H:%M:%S"]),
+    default=None,
+    help="Only classify PRs merged since this UTC date, backfilling the ledger if needed",
+)
+@pass_git()
+def classify_cmd(
+    git: "GitService", rules: Optional[str], since: Optional[dt.datetime]
+) -> None:
+    from ge_releaser.cmd.classify import classify
+
+    classify(git=git, rules=rules, since=since)
+
+
+@cli.command(
+    name="changelog",
+    help="Regenerate the changelog sections of every release in a range of tags",
+)
+@click.option(
+    "--from",
+    "from_version",
+    required=True,
+    help="Release before the first section to regenerate",
+)
+@click.option("--to", "to_version", required=True, help="Last release to regenerate")
+@click.option(
+    "--in-place",
+    default=False,
+    is_flag=True,
+    help="Replace the sections in the changelog instead of printing them",
+)
+@click.option(
+    "--output",
+    type=click.Path(dir_okay=False, writable=True),
+    default=None,
+    help="Write the sections to this file instead of printing them",
+)
+@pass_git()
+def changelog_cmd(
+    git: "GitService",
+    from_version: str,
+    to_version: str,
+    in_place: bool,
+    output: Optional[str],
+) -> None:
+    from ge_releaser.cmd.changelog import changelog
+
+    if in_place and output is not None:
+        raise click.UsageError("--in-place and --output are mutually exclusive")
+
+    changelog(
+        git=git,
+        from_version=from_version,
+        to_version=to_version,
+        in_place=in_place,
+        output=output,
+    )
+
+
+@cli.command(name="cache-stats", help="Report on the local GitHub API response cache")
+def cache_stats_cmd() -> None:
+    from ge_releaser.http_cache import ResponseCache
+
+    stats = ResponseCache.open_default().stats()
+    click.echo(f"Cache file: {stats.path}")
+    click.echo(f"Entries: {stats.entries} ({stats.size / 1024 / 1024:.1f} MiB)")
+    click.echo(
+        f"Revalidated (304): {stats.hits}, fetched: {stats.misses} ({stats.hit_rate:.0%} hit rate)"
+    )
+    if stats.oldest is not None:
+        age_hours = (time.time() - stats.oldest) / 3600
+        click.echo(f"Oldest entry: {age_hours:.1f} hours old")
 
 
 if __name__ == "__main__":
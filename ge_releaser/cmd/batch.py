@@ -0,0 +1,191 @@
+import json
+import logging
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Final, List, NamedTuple, Optional, Tuple
+
+import click
+from packaging import version
+
+from ge_releaser.cmd.prep import prep
+from ge_releaser.cmd.publish import publish
+from ge_releaser.cmd.tag import tag
+from ge_releaser.constants import BATCH_WORKERS, ReleaseCommand
+from ge_releaser.git import GitService
+from ge_releaser.trace import TRACER
+
+LOGGER: Final[logging.Logger] = logging.getLogger(__name__)
+
+WORKTREES_DIR: Final[str] = "worktrees"
+
+
+class ReleaseTarget(NamedTuple):
+    """
+    One release in a batch: a version of `repo` cut from `trunk`.
+
+    `path` is the local clone to work in (the current one by default) and `commit` is what
+    `tag` tags (the tip of the remote trunk by default).
+    """
+
+    repo: str
+    trunk: str
+    version: str
+    path: Optional[str] = None
+    commit: Optional[str] = None
+
+    @property
+    def label(self) -> str:
+        return f"{self.repo}@{self.trunk} {self.version}"
+
+
+class TargetResult(NamedTuple):
+    target: ReleaseTarget
+    ok: bool
+    seconds: float
+    detail: str
+
+
+def load_targets(path: str) -> List[ReleaseTarget]:
+    """
+    Read targets from a JSON list of objects with `repo`, `trunk` and `version` keys (and
+    optionally `path` and `commit`).
+    """
+    with open(path) as f:
+        entries = json.load(f)
+    if not isinstance(entries, list) or not entries:
+        raise ValueError(f"{path} must contain a non-empty JSON list of targets")
+
+    targets: List[ReleaseTarget] = []
+    for i, entry in enumerate(entries):
+        missing = [key for key in ("repo", "trunk", "version") if key not in entry]
+        if missing:
+            raise ValueError(f"Target {i} in {path} is missing {missing}")
+        unknown = set(entry) - set(ReleaseTarget._fields)
+        if unknown:
+            raise ValueError(f"Target {i} in {path} has unknown keys {sorted(unknown)}")
+        version.Version(entry["version"])
+        targets.append(ReleaseTarget(**entry))
+
+    labels = [t.label for t in targets]
+    duplicates = sorted({label for label in labels if labels.count(label) > 1})
+    if duplicates:
+        raise ValueError(f"Duplicate targets in {path}: {duplicates}")
+    return targets
+
+
+def batch(
+    git: GitService,
+    command: ReleaseCommand,
+    targets: List[ReleaseTarget],
+    workers: int = BATCH_WORKERS,
+) -> None:
+    """
+    Run `command` for every target concurrently, each in a worktree of its own. All targets
+    share `git`'s GitHub client, so they draw from one connection pool and rate limit.
+    """
+    click.secho(
+        f"[batch] {command.value} for {len(targets)} targets", bold=True, fg="blue"
+    )
+
+    parent_span = TRACER.current()
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        results = list(
+            executor.map(
+                lambda target: _run_target(git, command, target, parent_span),
+                targets,
+            )
+        )
+
+    _print_status_table(command, results)
+
+    failed = [r for r in results if not r.ok]
+    if failed:
+        raise ValueError(f"{len(failed)} of {len(results)} targets failed")
+
+
+def _run_target(
+    git: GitService,
+    command: ReleaseCommand,
+    target: ReleaseTarget,
+    parent_span: Optional[int],
+) -> TargetResult:
+    start = time.perf_counter()
+    worktree: Optional[str] = None
+    try:
+        with TRACER.span(
+            f"batch.{command.value}", parent=parent_span, target=target.label
+        ):
+            clone = (
+                git
+                if target.path is None
+                else git.for_target(target.repo, target.trunk, root=target.path)
+            )
+            # Fetching and adding the worktree in one go keeps another target from moving the
+            # trunk in between; the fetches `prep` makes in the worktree take the same lock
+            with clone.repo_lock:
+                trunk_ref = clone.fetch_branch(target.trunk)
+                worktree = _worktree_path(clone, target)
+                clone.add_worktree(worktree, trunk_ref)
+
+            service = git.for_target(target.repo, target.trunk, root=worktree)
+            detail = _run_command(service, command, target, trunk_ref)
+
+            clone.remove_worktree(worktree)
+    except Exception as e:
+        LOGGER.info(f"{target.label} failed", exc_info=True)
+        detail = f"{type(e).__name__}: {e}"
+        if worktree is not None and os.path.exists(worktree):
+            detail += f" (worktree kept at {worktree})"
+        return TargetResult(target, False, time.perf_counter() - start, detail)
+
+    return TargetResult(target, True, time.perf_counter() - start, detail)
+
+
+def _run_command(
+    git: GitService, command: ReleaseCommand, target: ReleaseTarget, trunk_ref: str
+) -> str:
+    if command is ReleaseCommand.TAG:
+        commit = target.commit or trunk_ref
+        tag(
+            git=git,
+            commit=commit,
+            version_number=target.version,
+            is_stable_release=not version.Version(target.version).is_prerelease,
+        )
+        return f"tagged {commit}"
+    if command is ReleaseCommand.PREP:
+        url = prep(git=git, expected_version=target.version)
+        return f"opened {url}"
+    publish(git=git, expected_version=target.version)
+    return "created release"
+
+
+def _worktree_path(clone: GitService, target: ReleaseTarget) -> str:
+    name = f"{target.trunk}-{target.version}".replace("/", "_")
+    return os.path.join(clone.state_dir, WORKTREES_DIR, name)
+
+
+def _print_status_table(command: ReleaseCommand, results: List[TargetResult]) -> None:
+    rows = [
+        (
+            r.target.repo,
+            r.target.trunk,
+            r.target.version,
+            "ok" if r.ok else "FAILED",
+            f"{r.seconds:.1f}s",
+            r.detail,
+        )
+        for r in results
+    ]
+    header = ("REPO", "TRUNK", "VERSION", "STATUS", "TIME", "DETAIL")
+    widths = [max(len(row[i]) for row in [header, *rows]) for i in range(5)]
+
+    def _line(row: Tuple[str, ...]) -> str:
+        cells = [cell.ljust(width) for cell, width in zip(row, widths)]
+        return "  ".join([*cells, row[5]])
+
+    click.secho(f"\n[batch] {command.value} summary", bold=True, fg="blue")
+    click.echo(_line(header))
+    for result, row in zip(results, rows):
+        click.secho(_line(row), fg="green" if result.ok else "red")
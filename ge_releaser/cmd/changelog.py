@@ -0,0 +1,143 @@
+import os
+from typing import Dict, Generator, List, Optional
+
+import click
+
+from ge_releaser.changelog import ChangelogCommit, ChangelogEntry, TeamsIndex
+from ge_releaser.classify import Classifier
+from ge_releaser.changelog_io import ChangelogFile
+from ge_releaser.constants import CHANGELOG_RULES_FILE, GxFile
+from ge_releaser.git import GitService
+from ge_releaser.ledger import MERGE_TIME_SLACK, PrLedger
+from ge_releaser.pulls import PullRequestSnapshot, datetime_from_epoch
+from ge_releaser.tags import IndexedTag
+from ge_releaser.trace import TRACER
+
+
+def changelog(
+    git: GitService,
+    from_version: str,
+    to_version: str,
+    in_place: bool = False,
+    output: Optional[str] = None,
+) -> None:
+    """
+    Regenerate the changelog sections of every release after `from_version` up to and
+    including `to_version`.
+
+    The PRs of the whole range are streamed out of the PR ledger in one query, classified in
+    batches and filed under the release whose trunk commits hold their merge commit.
+    """
+    click.secho("[changelog]", bold=True, fg="blue")
+
+    releases = _releases_between(git, from_version, to_version)
+    after = datetime_from_epoch(releases[0].timestamp) - MERGE_TIME_SLACK
+    until = datetime_from_epoch(releases[-1].timestamp) + MERGE_TIME_SLACK
+    release_of_merge = _releases_of_merges(git, releases)
+
+    with TRACER.span("changelog.sync"):
+        ledger = PrLedger.open(git)
+        ledger.sync(git, since=after)
+    click.secho(" * Synced the PR ledger (1/3)", fg="yellow")
+
+    path = git.path(
+        GxFile.CHANGELOG_MD_V0 if git.trunk_is_0ver else GxFile.CHANGELOG_MD_V1
+    )
+    teams = TeamsIndex.from_file(git.path(GxFile.TEAMS))
+    classifier = Classifier.from_file(os.path.join(git.root, CHANGELOG_RULES_FILE))
+    # Newest release first, like the changelog
+    entries = {
+        tag.name: ChangelogEntry(
+            teams=teams, classifier=classifier, repo_name=git.repo_name
+        )
+        for tag in reversed(releases[1:])
+    }
+
+    # Ledger rows are classified and filed under their release as they are read, so only the
+    # compact changelog lines are kept; `release_of_pr` only holds the batch being classified
+    release_of_pr: Dict[int, str] = {}
+
+    def _pull_requests() -> Generator[PullRequestSnapshot, None, None]:
+        for pr, merge_sha in ledger.iter_merges_between(
+            git.repo_name, git.trunk, after, until
+        ):
+            release = release_of_merge.get(merge_sha or "")
+            if release is not None and "RELEASE" not in pr["title"]:
+                release_of_pr[pr["number"]] = release
+                yield pr
+
+    with TRACER.span("changelog.classify"):
+        for pr, classification in classifier.classify_stream(_pull_requests()):
+            entries[release_of_pr.pop(pr["number"])].add(
+                ChangelogCommit.from_snapshot(pr, teams, classification)
+            )
+    click.secho(
+        f" * Sorted the PRs merged between {from_version} and {to_version} into {len(entries)} releases (2/3)",
+        fg="yellow",
+    )
+    click.echo(f"Classified {classifier.stats}")
+
+    sections = (
+        (release_version, entry.render(path, release_version))
+        for release_version, entry in entries.items()
+    )
+    if in_place:
+        with TRACER.span("changelog.rewrite"):
+            replaced, inserted = ChangelogFile(path).replace_sections(dict(sections))
+        click.secho(
+            f" * Rewrote {replaced} and added {inserted} sections of {path} (3/3)",
+            fg="yellow",
+        )
+        return
+
+    if output is None:
+        click.secho(" * Rendered sections (3/3)", fg="yellow")
+        for _, text in sections:
+            click.echo(text, nl=False)
+        return
+    with open(output, "w") as f:
+        f.writelines(text for _, text in sections)
+    click.secho(f" * Wrote sections to {output} (3/3)", fg="yellow")
+
+
+def _releases_between(
+    git: GitService, from_version: str, to_version: str
+) -> List[IndexedTag]:
+    """
+    The tags of `from_version`, `to_version` and every final release between them, ordered
+    by commit time.
+    """
+    first, last = git.tag_index.get(from_version), git.tag_index.get(to_version)
+    for name, tag in ((from_version, first), (to_version, last)):
+        if tag is None:
+            raise ValueError(f"There is no tag for {name}")
+    assert first is not None and last is not None and first.version and last.version
+
+    if first.version >= last.version:
+        raise ValueError(f"{from_version} is not older than {to_version}")
+
+    releases = [
+        tag
+        for tag in git.tag_index.tags.values()
+        if tag.version is not None
+        and first.version < tag.version < last.version
+        and not tag.version.is_prerelease
+    ]
+    releases = sorted([first, *releases, last], key=IndexedTag.sort_key)
+    if releases[0] is not first or releases[-1] is not last:
+        raise ValueError(
+            f"{from_version} and {to_version} are not the oldest and newest commits of the range"
+        )
+    return releases
+
+
+def _releases_of_merges(git: GitService, releases: List[IndexedTag]) -> Dict[str, str]:
+    """
+    The release of every trunk commit in the range, i.e. release `i` gets the first-parent
+    commits in `releases[i - 1]..releases[i]`.
+    """
+    release_of_merge: Dict[str, str] = {}
+    for previous, release in zip(releases, releases[1:]):
+        for sha in git.trunk_commit_shas(previous.name, release.name):
+            release_of_merge[sha] = release.name
+    return release_of_merge
@@ -0,0 +1,54 @@
+import datetime as dt
+import os
+from typing import Optional
+
+import click
+
+from ge_releaser.classify import Classifier
+from ge_releaser.cmd.sync import last_release_time
+from ge_releaser.constants import CHANGELOG_RULES_FILE
+from ge_releaser.git import GitService
+from ge_releaser.ledger import PrLedger
+from ge_releaser.trace import TRACER
+
+
+def classify(
+    git: GitService,
+    rules: Optional[str] = None,
+    since: Optional[dt.datetime] = None,
+) -> None:
+    """
+    Classify every PR in the ledger of the trunk (merged after `since`, if given) and report
+    how many went to each category, i.e. to try out a rules file on the project's history.
+    """
+    click.secho("[classify]", bold=True, fg="blue")
+
+    classifier = Classifier.from_file(
+        rules or os.path.join(git.root, CHANGELOG_RULES_FILE)
+    )
+    ledger = PrLedger.open(git)
+    if since is None and ledger.synced_range(git.repo_name, git.trunk) is None:
+        since = last_release_time(git)
+    with TRACER.span("classify.sync"):
+        synced = ledger.sync(git, since=since)
+
+    after = since or synced.synced_from
+    # `merged_between` excludes its lower bound
+    pull_requests = ledger.iter_merged_between(
+        git.repo_name, git.trunk, after - dt.timedelta(seconds=1), synced.synced_until
+    )
+    with TRACER.span("classify.titles"):
+        for _ in classifier.classify_stream(pull_requests):
+            pass
+
+    stats = classifier.stats
+    click.secho(
+        f" * Classified {stats.titles} PRs merged since {after} at {stats.throughput:,.0f} titles/s",
+        fg="yellow",
+    )
+    for category, count in stats.categories.items():
+        click.echo(f"{category.value:<12} {count:>8}")
+    click.echo(
+        "By rule: "
+        + ", ".join(f"{rule.value} {count}" for rule, count in stats.rules.items())
+    )
@@ -1,57 +1,240 @@
+import datetime as dt
 import logging
 import os
-from typing import Final, List, Tuple
+import tempfile
+from typing import Any, Final, Generator, Iterable, List, Optional, Tuple
 
 import click
 from github.PullRequest import PullRequest
 from packaging import version
 
-from ge_releaser.changelog import ChangelogEntry
-from ge_releaser.constants import GxFile, GxURL
-from ge_releaser.git import GitService
+from ge_releaser.changelog import ChangelogEntry, TeamsIndex
+from ge_releaser.classify import Classifier
+from ge_releaser.constants import (
+    CHANGELOG_RULES_FILE,
+    PR_FETCH_WORKERS,
+    GxFile,
+    PrCollector,
+    PrepMode,
+)
+from ge_releaser.dag import Step, run_steps
+from ge_releaser.git import GitService, PullRequestDetails
+from ge_releaser.journal import PrepJournal
+from ge_releaser.ledger import MERGE_TIME_SLACK, PrLedger
+from ge_releaser.pulls import (
+    GHOST_USER,
+    PullRequestSnapshot,
+    datetime_from_epoch,
+    fetch_snapshots,
+    snapshot_from_json,
+    snapshot_to_json,
+)
+from ge_releaser.rewrite import (
+    VERSION_TARGETS,
+    apply_edits,
+    render_diff,
+    stage_version_rewrites,
+)
+from ge_releaser.trace import TRACER
 
 LOGGER: Final[logging.Logger] = logging.getLogger(__name__)
 
 
-def prep(git: GitService) -> None:
-    click.secho("[prep]", bold=True, fg="blue")
-
-    last_version, release_version = _parse_versions(git)
-
-    git.checkout_and_pull_trunk()
-
-    release_branch: str = _create_and_checkout_release_branch(git, release_version)
-    click.secho(" * Created a release branch (1/7)", fg="yellow")
+def prep(
+    git: GitService,
+    collector: PrCollector = PrCollector.REST,
+    workers: int = PR_FETCH_WORKERS,
+    dry_run: bool = False,
+    resume: bool = False,
+    expected_version: Optional[str] = None,
+    plumbing: bool = False,
+) -> Optional[str]:
+    """
+    Returns the URL of the prep PR (`None` on a dry run).
 
-    _update_deployment_version_file(release_version)
-    click.secho(" * Updated deployment version file (2/7)", fg="yellow")
+    With `plumbing`, the prep commit is built from the trunk's tree without checking anything
+    out (see `_commit_release_prep`).
+    """
+    click.secho("[prep]", bold=True, fg="blue")
 
-    _update_docs_component(last_version=last_version, release_version=release_version)
-    click.secho(" * Updated version in docs data component (3/7)", fg="yellow")
+    with TRACER.span("prep.parse_versions"):
+        last_version, release_version = _parse_versions(git)
+    if expected_version is not None and release_version != expected_version:
+        raise ValueError(
+            f"The latest tag on {git.trunk} is {release_version}, not {expected_version}"
+        )
 
-    _update_docs_version_dropdown(
-        last_version=last_version, release_version=release_version
+    if dry_run:
+        edits = stage_version_rewrites(
+            last_version=last_version, release_version=release_version, root=git.root
+        )
+        click.echo(render_diff(edits), nl=False)
+        return None
+
+    mode = PrepMode.PLUMBING if plumbing else PrepMode.CHECKOUT
+    journal = _open_journal(git, last_version, release_version, mode, resume)
+    completed = {
+        name: _decode_step_result(name, result)
+        for name, result in journal.completed.items()
+    }
+    if "branch" in completed and not plumbing:
+        # The edits of the interrupted run live on the release branch
+        git.checkout_branch(completed["branch"])
+
+    # Only reads tags and talks to GitHub, so it overlaps with the local steps
+    collect = Step(
+        name="collect",
+        run=lambda _: _collect_prs(
+            git, last_version, release_version, collector, workers
+        ),
+        progress=("Collected PRs since the last release",),
+        counted=False,
     )
-    click.secho(" * Updated version in docs version dropdown (4/7)", fg="yellow")
+    steps = (
+        _plumbing_steps(git, last_version, release_version, collect)
+        if plumbing
+        else _checkout_steps(git, last_version, release_version, collect)
+    )
+    url: str = run_steps(
+        steps,
+        completed=completed,
+        on_complete=lambda name, result: journal.record(
+            name, _encode_step_result(name, result)
+        ),
+    )["pr"]
+    journal.discard()
 
-    _update_changelogs(
-        git=git,
-        last_version=last_version,
-        release_version=release_version,
+    _print_next_steps(url, git)
+    return url
+
+
+def _checkout_steps(
+    git: GitService, last_version: str, release_version: str, collect: Step
+) -> List[Step]:
+    return [
+        Step(
+            name="checkout",
+            run=lambda _: git.checkout_and_pull_trunk(),
+            progress=(f"Pulled latest {git.trunk}",),
+            counted=False,
+        ),
+        Step(
+            name="branch",
+            run=lambda _: _create_and_checkout_release_branch(git, release_version),
+            depends_on=("checkout",),
+            progress=("Created a release branch",),
+        ),
+        Step(
+            name="version_files",
+            run=lambda _: _update_version_files(
+                git=git, last_version=last_version, release_version=release_version
+            ),
+            depends_on=("branch",),
+            progress=tuple(f"Updated {t.description}" for t in VERSION_TARGETS),
+        ),
+        collect,
+        Step(
+            name="changelog",
+            run=lambda results: _update_changelogs(
+                git=git,
+                relevant_prs=results["collect"],
+                release_version=release_version,
+            ),
+            depends_on=("branch", "collect"),
+            progress=("Updated changelog",),
+        ),
+        Step(
+            name="commit",
+            run=lambda _: git.stage_all_and_commit("release_prep"),
+            depends_on=("version_files", "changelog"),
+            progress=("Committed changes",),
+        ),
+        Step(
+            name="pr",
+            run=lambda results: _create_pr(
+                git=git,
+                release_branch=results["branch"],
+                release_version=release_version,
+            ),
+            depends_on=("commit",),
+            progress=("Opened prep PR",),
+        ),
+    ]
+
+
+def _plumbing_steps(
+    git: GitService, last_version: str, release_version: str, collect: Step
+) -> List[Step]:
+    return [
+        Step(
+            name="fetch",
+            run=lambda _: git.fetch_branch(git.trunk),
+            progress=(f"Fetched latest {git.trunk}",),
+            counted=False,
+        ),
+        collect,
+        Step(
+            name="plumbing_commit",
+            run=lambda results: _commit_release_prep(
+                git=git,
+                base=results["fetch"],
+                relevant_prs=results["collect"],
+                last_version=last_version,
+                release_version=release_version,
+            ),
+            depends_on=("fetch", "collect"),
+            progress=(
+                *(f"Updated {t.description}" for t in VERSION_TARGETS),
+                "Updated changelog",
+                "Committed changes to a release branch",
+            ),
+        ),
+        Step(
+            name="pr",
+            run=lambda results: _create_pr(
+                git=git,
+                release_branch=results["plumbing_commit"],
+                release_version=release_version,
+            ),
+            depends_on=("plumbing_commit",),
+            progress=("Opened prep PR",),
+        ),
+    ]
+
+
+def _open_journal(
+    git: GitService,
+    last_version: str,
+    release_version: str,
+    mode: PrepMode,
+    resume: bool,
+) -> PrepJournal:
+    if resume:
+        journal = PrepJournal.resume(
+            git.worktree_state_dir, last_version, release_version, mode
+        )
+        if journal is not None:
+            click.secho(f"Resuming from {journal.path}", dim=True)
+            return journal
+        click.secho(
+            f"No interrupted prep of {release_version} to resume; starting over",
+            fg="yellow",
+        )
+    return PrepJournal.start(
+        git.worktree_state_dir, last_version, release_version, mode
     )
-    click.secho(" * Updated changelog (5/7)", fg="yellow")
 
-    git.stage_all_and_commit("release_prep")
-    click.secho(" * Committed changes (6/7)", fg="yellow")
 
-    url: str = _create_pr(
-        git=git,
-        release_branch=release_branch,
-        release_version=release_version,
-    )
-    click.secho(" * Opened prep PR (7/7)", fg="yellow")
+def _encode_step_result(name: str, result: Any) -> Any:
+    if name == "collect":
+        return [snapshot_to_json(pr) for pr in result]
+    return result
 
-    _print_next_steps(url, git)
+
+def _decode_step_result(name: str, result: Any) -> Any:
+    if name == "collect":
+        return [snapshot_from_json(pr) for pr in result]
+    return result
 
 
 def _parse_versions(
@@ -76,77 +259,120 @@ def _create_and_checkout_release_branch(git: GitService, release_version: str) -
     return branch_name
 
 
-def _update_deployment_version_file(release_version: str) -> None:
-    with open(GxFile.DEPLOYMENT_VERSION, "w") as f:
-        f.write(f"{release_version.strip()}\n")
-
-
-def _update_docs_component(last_version: str, release_version: str) -> None:
-    """Updates the JSX file in our docs directory responsible for tracking GX and Python versions.
+def _update_version_files(
+    git: GitService,
+    last_version: str,
+    release_version: str,
+    root: Optional[str] = None,
+) -> None:
+    """Bumps every version string listed in `VERSION_TARGETS` in a single pass.
 
-    It looks something like this:
-    ```jsx
-    export default {
-      release_version: 'great_expectations, version 0.15.48',
-      min_python: 'Python 3.7',
-      max_python: 'Python 3.10'
-    }
-    ```
-    """
-    with open(GxFile.DOCS_DATA_COMPONENT) as f:
-        contents = f.read()
-    updated_contents = contents.replace(last_version, release_version)
-    with open(GxFile.DOCS_DATA_COMPONENT, "w") as f:
-        f.write(updated_contents)
-
-
-def _update_docs_version_dropdown(last_version: str, release_version: str) -> None:
-    """Updates the docusaurus config file responsible for display of the version dropdown.
-
-    It looks something like this:
-    ```js
-    versions: {
-        current: {
-          label: '0.16.6',
-          path: ''
-        }
-      }
-    ```
+    All edits are staged in memory first and then written together, so a missing or
+    ambiguous version string leaves every file untouched. `root` defaults to the working tree.
     """
-    with open(GxFile.DOCS_CONFIG) as f:
-        contents = f.read()
-    updated_contents = contents.replace(last_version, release_version)
-    with open(GxFile.DOCS_CONFIG, "w") as f:
-        f.write(updated_contents)
+    edits = stage_version_rewrites(
+        last_version=last_version,
+        release_version=release_version,
+        root=git.root if root is None else root,
+    )
+    apply_edits(edits)
 
 
 def _update_changelogs(
     git: GitService,
+    relevant_prs: List[PullRequestSnapshot],
+    release_version: str,
+    root: Optional[str] = None,
+) -> str:
+    if root is None:
+        root = git.root
+    classifier = Classifier.from_file(os.path.join(root, CHANGELOG_RULES_FILE))
+    changelog_entry = ChangelogEntry(
+        relevant_prs,
+        teams=TeamsIndex.from_file(os.path.join(root, GxFile.TEAMS.value)),
+        classifier=classifier,
+        repo_name=git.repo_name,
+    )
+    LOGGER.info(f"Classified {classifier.stats}")
+
+    changelog = GxFile.CHANGELOG_MD_V0 if git.trunk_is_0ver else GxFile.CHANGELOG_MD_V1
+    return changelog_entry.write(os.path.join(root, changelog.value), release_version)
+
+
+def _commit_release_prep(
+    git: GitService,
+    base: str,
+    relevant_prs: List[PullRequestSnapshot],
     last_version: str,
     release_version: str,
-) -> None:
-    relevant_prs = _collect_prs_since_last_release(git, last_version)
+) -> str:
+    """
+    Build the release prep commit on top of `base` without a checkout, and create the release
+    branch at it. Returns the branch name.
 
-    changelog_entry = ChangelogEntry(relevant_prs)
+    Only the files prep reads or edits are exported from the trunk tree into a scratch
+    directory, where they are edited as usual; the commit is then written with plumbing, so
+    the working tree and the index (if there is one) are never touched.
+    """
+    branch_name: str = f"release-{release_version}"
+    inputs = [
+        *(file.value for file in git.release_files),
+        *(target.path.value for target in VERSION_TARGETS),
+        GxFile.TEAMS.value,
+        CHANGELOG_RULES_FILE,
+    ]
+    with tempfile.TemporaryDirectory(prefix="ge_releaser-prep-") as root:
+        git.export_files(base, sorted(set(inputs)), root)
+        _update_version_files(git, last_version, release_version, root=root)
+        _update_changelogs(git, relevant_prs, release_version, root=root)
+        git.commit_files(
+            base,
+            {file.value: os.path.join(root, file.value) for file in git.release_files},
+            message="release_prep",
+            branch=branch_name,
+        )
+    return branch_name
 
-    if git.trunk_is_0ver:
-        changelog_entry.write(GxFile.CHANGELOG_MD_V0, last_version, release_version)
-    else:
-        changelog_entry.write(GxFile.CHANGELOG_MD_V1, last_version, release_version)
+
+def _collect_prs(
+    git: GitService,
+    last_version: str,
+    release_version: str,
+    collector: PrCollector,
+    workers: int,
+) -> List[PullRequestSnapshot]:
+    if collector is PrCollector.GRAPHQL:
+        return _collect_prs_since_last_release_graphql(git, last_version)
+    if collector is PrCollector.GIT:
+        return _collect_prs_between_tags(git, last_version, release_version)
+    if collector is PrCollector.LEDGER:
+        return _collect_prs_from_ledger(git, last_version, release_version)
+    return _collect_prs_since_last_release(git, last_version, workers)
 
 
 def _collect_prs_since_last_release(
     git: GitService,
     last_version: str,
-) -> List[PullRequest]:
+    workers: int,
+) -> List[PullRequestSnapshot]:
     # 20220923 - Chetan - Currently, this grabs all PRs from the last release until the moment of program execution.
     # This should be updated so the changelog generation stops once it hits the release commit.
 
     last_release = git.get_release_timestamp(last_version)
 
-    merged_prs = git.get_merged_prs()
-    recent_prs: List[PullRequest] = []
+    # PRs flow from each page of the listing straight into compact snapshots; only the
+    # snapshots are kept (the journal needs them)
+    recent_prs = _iter_prs_merged_since(git.get_merged_prs(), last_release)
+    return list(
+        fetch_snapshots(
+            recent_prs, workers=workers, before_fetch=git.wait_for_rate_limit
+        )
+    )
 
+
+def _iter_prs_merged_since(
+    merged_prs: Iterable[PullRequest], last_release: dt.datetime
+) -> Generator[PullRequest, None, None]:
     # To ensure we don't accidently exit early, we set a threshold and wait to see a few old PRs before completing iteration
     counter = 0
     threshold = 5
@@ -156,16 +382,104 @@ def _collect_prs_since_last_release(
             break
 
         # Ignore closed PRs and any release-specific PRs
-        if not pr.merged or "RELEASE" in pr.title:
+        # (`merged_at` is part of the listing, whereas `merged` would cost a request per PR)
+        if pr.merged_at is None or "RELEASE" in pr.title:
             continue
 
-        LOGGER.info(pr, pr.merged_at, counter)
+        LOGGER.info(f"{pr} {pr.merged_at} {counter}")
         if pr.merged_at < last_release:
             counter += 1
         if pr.merged_at > last_release:
-            recent_prs.append(pr)
+            yield pr
+
+
+def _collect_prs_since_last_release_graphql(
+    git: GitService,
+    last_version: str,
+) -> List[PullRequestSnapshot]:
+    """
+    Search for PRs merged since the last release; every field the changelog needs comes back
+    in the search results, so each page of 100 PRs costs exactly one request.
+    """
+    last_release = git.get_release_timestamp(last_version)
+
+    return [
+        pr
+        for pr in git.get_merged_prs_graphql(since=last_release)
+        if "RELEASE" not in pr["title"]
+    ]
+
 
-    return recent_prs
+def _collect_prs_between_tags(
+    git: GitService,
+    last_version: str,
+    release_version: str,
+) -> List[PullRequestSnapshot]:
+    """
+    Read PRs off the squash-merge commits between the two release tags.
+
+    Git supplies the number, title and merge time, so the collection stops exactly at the
+    release commit; only the authors (needed for attribution) and labels are looked up on
+    GitHub.
+    """
+    commits = []
+    for commit in git.iter_trunk_commits(last_version, release_version):
+        if commit.pr_number is None:
+            LOGGER.warning(f"Skipping commit without a PR number: {commit.subject}")
+            continue
+        if "RELEASE" in commit.pr_title:
+            continue
+        commits.append(commit)
+
+    details = git.get_pr_details([c.pr_number for c in commits]) if commits else {}
+    missing = PullRequestDetails(author=GHOST_USER, labels=[])
+
+    return [
+        PullRequestSnapshot(
+            number=commit.pr_number,
+            title=commit.pr_title,
+            merged_at=commit.timestamp,
+            author=details.get(commit.pr_number, missing).author,
+            base_ref=git.trunk,
+            labels=details.get(commit.pr_number, missing).labels,
+        )
+        for commit in commits
+    ]
+
+
+def _collect_prs_from_ledger(
+    git: GitService,
+    last_version: str,
+    release_version: str,
+) -> List[PullRequestSnapshot]:
+    """
+    Catch the local PR ledger up with GitHub, then look up the PRs whose merge commits are
+    on the trunk between the two release tags, like `_collect_prs_between_tags`.
+
+    After a `ge_releaser sync` earlier in the week, catching up costs a couple of requests.
+    """
+    last_tag = git.tag_index.get(last_version)
+    release_tag = git.tag_index.get(release_version)
+    for name, tag in ((last_version, last_tag), (release_version, release_tag)):
+        if tag is None:
+            raise ValueError(f"There is no tag for {name}")
+    # Only narrows the types; both were checked above
+    assert last_tag is not None and release_tag is not None
+    after = datetime_from_epoch(last_tag.timestamp) - MERGE_TIME_SLACK
+    until = datetime_from_epoch(release_tag.timestamp) + MERGE_TIME_SLACK
+    merges = git.trunk_commit_shas(last_version, release_version)
+
+    ledger = PrLedger.open(git)
+    # A ledger that was never synced only needs to start at the last release
+    ledger.sync(git, since=after)
+
+    return [
+        pr
+        for pr, merge_sha in ledger.iter_merges_between(
+            git.repo_name, git.trunk, after, until
+        )
+        if merge_sha in merges and "RELEASE" not in pr["title"]
+    ]
 
 
 def _create_pr(
@@ -181,7 +495,7 @@ def _create_pr(
         head=release_branch,
     )
 
-    return os.path.join(GxURL.PULL_REQUESTS, str(pr.number))
+    return pr.html_url
 
 
 def _print_next_steps(url: str, git: GitService) -> None:
@@ -1,37 +1,175 @@
+import enum
 import pathlib
-from typing import List, cast
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Final, List, NamedTuple, Optional, cast
 
 import click
+from github.GitRelease import GitRelease
 from packaging import version
 
-from ge_releaser.constants import GxFile, GxURL
+from ge_releaser.changelog_io import ChangelogFile
+from ge_releaser.constants import BACKFILL_WORKERS, GxFile, GxURL
 from ge_releaser.git import GitService
+from ge_releaser.trace import TRACER
 
 
-def publish(git: GitService) -> None:
+class BackfillAction(str, enum.Enum):
+    CREATE = "create"
+    UPDATE = "update"
+    UNCHANGED = "unchanged"
+    NO_TAG = "no tag"
+    EMPTY = "empty section"
+
+
+# How each action reads in the backfill report
+_REPORT_LABELS: Final[Dict[BackfillAction, str]] = {
+    BackfillAction.CREATE: "created",
+    BackfillAction.UPDATE: "updated",
+    BackfillAction.UNCHANGED: "unchanged",
+    BackfillAction.NO_TAG: "skipped",
+    BackfillAction.EMPTY: "skipped",
+}
+
+
+class BackfillResult(NamedTuple):
+    version: str
+    action: BackfillAction
+    ok: bool
+    detail: str
+
+
+def publish(git: GitService, expected_version: Optional[str] = None) -> None:
     click.secho("[publish]", bold=True, fg="blue")
 
-    release_version = _parse_deployment_version_file()
+    release_version = _parse_deployment_version_file(git)
+    if expected_version is not None and release_version != expected_version:
+        raise ValueError(
+            f"{GxFile.DEPLOYMENT_VERSION.value} on {git.trunk} is {release_version}, not {expected_version}"
+        )
 
-    _create_release(git, release_version, draft=False)
+    with TRACER.span("publish.create_release", version=release_version):
+        _create_release(git, release_version, draft=False)
 
     _print_next_steps()
 
 
-def _parse_deployment_version_file() -> str:
-    with open(GxFile.DEPLOYMENT_VERSION) as f:
+def _parse_deployment_version_file(git: GitService) -> str:
+    with open(git.path(GxFile.DEPLOYMENT_VERSION)) as f:
         contents: str = str(f.read()).strip()
         current_version = cast(version.Version, version.parse(contents))
 
     return str(current_version)
 
 
+def backfill(git: GitService, workers: int = BACKFILL_WORKERS) -> None:
+    """
+    Create or update the release page of every version in the changelog that has a tag.
+
+    The changelog is parsed once and compared against a single listing of the existing
+    releases; only pages that are missing or whose notes differ are written.
+    """
+    click.secho("[publish --backfill]", bold=True, fg="blue")
+
+    with TRACER.span("publish.read_changelog"):
+        notes = _gather_all_release_notes(pathlib.Path(git.path(_changelog_file(git))))
+    click.secho(f" * Read {len(notes)} changelog sections (1/3)", fg="yellow")
+
+    with TRACER.span("publish.list_releases"):
+        releases = git.get_releases()
+    click.secho(f" * Listed {len(releases)} existing releases (2/3)", fg="yellow")
+
+    plan = {
+        release_version: _plan_backfill(
+            git, release_version, message, releases.get(release_version)
+        )
+        for release_version, message in notes.items()
+    }
+    pending = [v for v, action in plan.items() if _is_write(action)]
+
+    def _write(release_version: str) -> BackfillResult:
+        action = plan[release_version]
+        try:
+            with TRACER.span(f"publish.{action.name.lower()}", version=release_version):
+                git.wait_for_rate_limit()
+                if action is BackfillAction.CREATE:
+                    git.create_release(
+                        version=release_version, message=notes[release_version]
+                    )
+                else:
+                    git.update_release(
+                        releases[release_version], notes[release_version]
+                    )
+        except Exception as e:
+            return BackfillResult(
+                release_version, action, False, f"{type(e).__name__}: {e}"
+            )
+        return BackfillResult(release_version, action, True, "")
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        written = {r.version: r for r in executor.map(_write, pending)}
+    click.secho(f" * Wrote {len(written)} release pages (3/3)", fg="yellow")
+
+    results = [
+        written.get(v, BackfillResult(v, action, True, ""))
+        for v, action in plan.items()
+    ]
+    _print_backfill_report(results)
+
+    failed = [r for r in results if not r.ok]
+    if failed:
+        raise ValueError(f"{len(failed)} of {len(pending)} release pages failed")
+
+
+def _plan_backfill(
+    git: GitService,
+    release_version: str,
+    message: str,
+    release: Optional[GitRelease],
+) -> BackfillAction:
+    if not message.strip():
+        return BackfillAction.EMPTY
+    if git.tag_index.get(release_version) is None:
+        return BackfillAction.NO_TAG
+    if release is None:
+        return BackfillAction.CREATE
+    if (release.body or "").strip() != message.strip():
+        return BackfillAction.UPDATE
+    return BackfillAction.UNCHANGED
+
+
+def _is_write(action: BackfillAction) -> bool:
+    return action in (BackfillAction.CREATE, BackfillAction.UPDATE)
+
+
+def _print_backfill_report(results: List[BackfillResult]) -> None:
+    width = max([len("VERSION")] + [len(r.version) for r in results])
+    click.secho("\n[publish --backfill] summary", bold=True, fg="blue")
+    click.echo(f"{'VERSION'.ljust(width)}  RESULT")
+    for r in results:
+        if not r.ok:
+            outcome, color = f"FAILED to {r.action.value}: {r.detail}", "red"
+        elif _is_write(r.action):
+            outcome, color = _REPORT_LABELS[r.action], "green"
+        elif r.action is BackfillAction.UNCHANGED:
+            outcome, color = _REPORT_LABELS[r.action], None
+        else:
+            outcome, color = f"{_REPORT_LABELS[r.action]} ({r.action.value})", None
+        click.secho(f"{r.version.ljust(width)}  {outcome}", fg=color)
+
+    counts: Dict[str, int] = {}
+    for r in results:
+        key = _REPORT_LABELS[r.action] if r.ok else "failed"
+        counts[key] = counts.get(key, 0) + 1
+    click.echo(", ".join(f"{count} {key}" for key, count in counts.items()))
+
+
+def _changelog_file(git: GitService) -> GxFile:
+    return GxFile.CHANGELOG_MD_V0 if git.trunk_is_0ver else GxFile.CHANGELOG_MD_V1
+
+
 def _create_release(git: GitService, release_version: str, draft: bool) -> None:
-    changelog_path = (
-        GxFile.CHANGELOG_MD_V0 if git.trunk_is_0ver else GxFile.CHANGELOG_MD_V1
-    )
     release_notes = _gather_release_notes(
-        release_version, pathlib.Path(changelog_path.value)
+        release_version, pathlib.Path(git.path(_changelog_file(git)))
     )
     message = "".join(line for line in release_notes)
     git.create_release(version=release_version, message=message, draft=draft)
@@ -40,19 +178,24 @@ def _create_release(git: GitService, release_version: str, draft: bool) -> None:
 def _gather_release_notes(
     release_version: str, changelog_path: pathlib.Path
 ) -> List[str]:
-    with open(changelog_path, "r") as f:
-        contents: List[str] = f.readlines()
-
-    start: int = 0
-    end: int = 0
-    for i, line in enumerate(contents):
-        if release_version in line:
-            start = i + 1
-        if start != 0 and len(line.strip()) == 0:
-            end = i
-            break
-
-    return contents[start:end]
+    changelog = ChangelogFile(str(changelog_path))
+    section = changelog.find(release_version)
+    if section is None:
+        return []
+    return changelog.read_section_lines(section)
+
+
+def _gather_all_release_notes(changelog_path: pathlib.Path) -> Dict[str, str]:
+    """
+    The release notes of every versioned section, newest first, from a single pass.
+    """
+    changelog = ChangelogFile(str(changelog_path))
+    versioned = [s for s in changelog.sections if s.version is not None]
+    notes: Dict[str, str] = {}
+    for section, lines in changelog.iter_section_lines(versioned):
+        # Like `find`, the section nearest the top wins if a version appears twice
+        notes.setdefault(section.title.split(maxsplit=1)[0], "".join(lines))
+    return notes
 
 
 def _print_next_steps() -> None:
@@ -0,0 +1,42 @@
+import datetime as dt
+from typing import Optional
+
+import click
+
+from ge_releaser.git import GitService
+from ge_releaser.ledger import PrLedger
+from ge_releaser.pulls import datetime_from_epoch
+from ge_releaser.trace import TRACER
+
+
+def sync(git: GitService, since: Optional[dt.datetime] = None) -> None:
+    """
+    Bring the local PR ledger of the trunk up to date, so that `prep --collector ledger` only
+    has to catch up on the last few merges.
+    """
+    click.secho("[sync]", bold=True, fg="blue")
+
+    ledger = PrLedger.open(git)
+    if since is None and ledger.synced_range(git.repo_name, git.trunk) is None:
+        since = last_release_time(git)
+
+    with TRACER.span("sync.ledger"):
+        result = ledger.sync(git, since=since)
+    click.secho(
+        f" * Synced {result.pull_requests} PRs merged into {git.trunk} "
+        f"in {result.windows} search window(s)",
+        fg="yellow",
+    )
+    click.echo(
+        f"The ledger at {ledger.path} covers {result.synced_from} to {result.synced_until} (UTC)"
+    )
+
+
+def last_release_time(git: GitService) -> dt.datetime:
+    tags_filter = "0." if git.trunk_is_0ver else "1."
+    latest = git.tag_index.latest(prefix_filter=tags_filter, limit=1)
+    if not latest:
+        raise ValueError(
+            f"No release tags starting with '{tags_filter}'; pass --since to start the ledger"
+        )
+    return datetime_from_epoch(latest[0].timestamp)
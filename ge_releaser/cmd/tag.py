@@ -1,30 +1,39 @@
+from __future__ import annotations
+
 import os
+from typing import TYPE_CHECKING
 
 import click
 from packaging import version
 
 from ge_releaser.constants import GxURL
-from ge_releaser.git import GitService
+from ge_releaser.trace import TRACER
+
+# Only needed for annotations; keeps `check_version_validity` importable without GitPython/PyGithub
+if TYPE_CHECKING:
+    from ge_releaser.git import GitService
 
 
 def tag(
     git: GitService, commit: str, version_number: str, is_stable_release: bool
 ) -> None:
-    _check_version_validity(
+    check_version_validity(
         version_number=version_number, is_stable_release=is_stable_release
     )
     click.secho("[tag]", bold=True, fg="blue")
 
-    _tag_release_commit(git, commit, version_number)
+    with TRACER.span("tag.tag_release_commit"):
+        _tag_release_commit(git, commit, version_number)
     click.secho(f" * Tagged commit '{commit}' on {git.trunk} (1/2)", fg="yellow")
 
-    git.push_branch_to_remote(branch=version_number, set_upstream=False)
+    with TRACER.span("tag.push_tag"):
+        git.push_branch_to_remote(branch=version_number, set_upstream=False)
     click.secho(" * Pushed tag to remote (2/2)", fg="yellow")
 
     _print_next_steps(version_number=version_number)
 
 
-def _check_version_validity(version_number: str, is_stable_release: bool) -> None:
+def check_version_validity(version_number: str, is_stable_release: bool) -> None:
     v = version.parse(version_number)
 
     if is_stable_release and v.is_prerelease:
@@ -60,3 +69,6 @@ def _print_next_steps(version_number: str) -> None:
     # this is here to make it easier to copy-paste the link
     click.echo(f"Link to Github Actions build: {GxURL.GITHUB_ACTIONS_BUILD}")
     click.echo(f"Link to PyPI page: {GxURL.PYPI_PAGE}")
+    click.echo(
+        f"Or let `ge_releaser wait {version_number}` tell you when both are done."
+    )
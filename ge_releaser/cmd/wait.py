@@ -0,0 +1,64 @@
+from typing import Dict
+
+import click
+
+from ge_releaser.constants import (
+    CI_WORKFLOW,
+    PYPI_PACKAGE,
+    WAIT_TIMEOUT,
+    ArtifactState,
+)
+from ge_releaser.git import GitService
+from ge_releaser.trace import TRACER
+from ge_releaser.watch import (
+    ActionsRunProbe,
+    Probe,
+    ProbeResult,
+    PyPIProbe,
+    wait_for_artifacts,
+)
+
+
+def wait(git: GitService, version_number: str, timeout: float = WAIT_TIMEOUT) -> None:
+    """
+    Block until the CI run of the pushed `version_number` tag has passed and the release is
+    on PyPI, polling both at once.
+    """
+    click.secho("[wait]", bold=True, fg="blue")
+
+    probes: Dict[str, Probe] = {
+        "CI": ActionsRunProbe(git, CI_WORKFLOW, version_number),
+        "PyPI": PyPIProbe(PYPI_PACKAGE, version_number),
+    }
+    succeeded = []
+
+    def _on_change(name: str, result: ProbeResult) -> None:
+        if result.state is ArtifactState.SUCCEEDED:
+            succeeded.append(name)
+            click.secho(
+                f" * {name}: {result.detail} ({len(succeeded)}/{len(probes)})",
+                fg="yellow",
+            )
+        else:
+            click.secho(f"   {name}: {result.detail}", dim=True)
+
+    with TRACER.span("wait.artifacts", version=version_number):
+        try:
+            results = wait_for_artifacts(probes, _on_change, timeout=timeout)
+        except TimeoutError as e:
+            raise ValueError(
+                f"{version_number} wasn't released within {timeout / 60:.0f} minutes"
+            ) from e
+
+    failed = {
+        name: result
+        for name, result in results.items()
+        if result.state is ArtifactState.FAILED
+    }
+    if failed:
+        raise ValueError(
+            "; ".join(f"{name}: {result.detail}" for name, result in failed.items())
+        )
+    click.secho(
+        f"\n{version_number} is built and published; run `prep` next.", fg="green"
+    )
@@ -1,4 +1,5 @@
 import enum
+import os
 import pathlib
 
 RELEASER_LOCAL_VERSION = str(
@@ -10,6 +11,66 @@ RELEASER_REMOTE_VERSION = (
 TRUNK = "develop"
 REMOTE = "origin"
 GITHUB_REPO = "great-expectations/great_expectations"
+# Point the releaser at a GitHub Enterprise instance or a local stand-in (see `benchmarks/`)
+GITHUB_API_URL = os.environ.get("GE_RELEASE_GITHUB_API_URL", "https://api.github.com")
+# Likewise for the PyPI JSON API that `wait` polls
+PYPI_URL = os.environ.get("GE_RELEASE_PYPI_URL", "https://pypi.org")
+PYPI_PACKAGE = "great-expectations"
+# The workflow that builds and publishes a pushed release tag
+CI_WORKFLOW = "ci.yml"
+
+# Per-repo state (tag index, etc.) is kept under `.git/` so it never shows up as untracked files
+RELEASER_STATE_DIR = "ge_releaser"
+
+# Per-user state (HTTP cache, etc.) that is worth keeping across repos and runs
+RELEASER_CACHE_DIR = os.environ.get(
+    "GE_RELEASE_CACHE_DIR",
+    os.path.join(os.path.expanduser("~"), ".cache", "ge_releaser"),
+)
+HTTP_CACHE_FILE = "http_cache.sqlite"
+HTTP_CACHE_MAX_BYTES = 256 * 1024 * 1024
+HTTP_CACHE_MAX_AGE = 14 * 24 * 60 * 60
+
+# The remote VERSION check is cached so back-to-back commands don't each pay for it
+VERSION_CHECK_CACHE = os.path.join(RELEASER_CACHE_DIR, "latest_version.json")
+VERSION_CHECK_TTL = 60 * 60
+VERSION_CHECK_TIMEOUT = 5
+PREFLIGHT_TIMEOUT = 30
+
+# Concurrent workers used to resolve PR details, and the rate-limit headroom at which they back off
+PR_FETCH_WORKERS = 8
+RATE_LIMIT_FLOOR = 50
+
+# Shared HTTP transport: pooled keep-alive connections and bounded, jittered retries
+HTTP_POOL_SIZE = 32
+HTTP_MAX_RETRIES = 4
+HTTP_BACKOFF_BASE = 0.5
+HTTP_BACKOFF_CAP = 30
+# Rate-limit waits longer than this are not retried; the caller gets the 403/429 instead
+HTTP_MAX_RETRY_WAIT = 60
+
+# Requests are paced once less than this share of a rate-limit window is left, spreading the
+# rest evenly until the reset, with bursts of up to `RATE_LIMIT_BURST` requests
+RATE_LIMIT_PACING_FRACTION = 0.2
+RATE_LIMIT_BURST = 10
+
+# Release targets processed at once by `batch`, each in its own worktree
+BATCH_WORKERS = 4
+
+# Items per page of REST listings (GitHub's maximum), and release pages written at once by
+# `publish --backfill`
+GITHUB_PAGE_SIZE = 100
+BACKFILL_WORKERS = 4
+
+# `wait` polls this often while something changes, backing off up to the max while nothing does
+WAIT_POLL_INTERVAL = 10
+WAIT_MAX_POLL_INTERVAL = 120
+WAIT_TIMEOUT = 60 * 60
+
+# PR titles classified per batch while building changelogs
+CLASSIFY_BATCH_SIZE = 10000
+# Optional overrides of the changelog rules; unlike the `GxFile`s, a repo needn't have it
+CHANGELOG_RULES_FILE = ".github/changelog_rules.json"
 
 
 class GxURL(str, enum.Enum):
@@ -29,3 +90,36 @@ class GxFile(str, enum.Enum):
     TEAMS = ".github/teams.yml"
     DOCS_DATA_COMPONENT = "docs/docusaurus/docs/components/_data.jsx"
     DOCS_CONFIG = "docs/docusaurus/docusaurus.config.js"
+
+
+class ReleaseCommand(str, enum.Enum):
+    TAG = "tag"
+    PREP = "prep"
+    PUBLISH = "publish"
+
+
+class PrCollector(str, enum.Enum):
+    REST = "rest"
+    GRAPHQL = "graphql"
+    GIT = "git"
+    LEDGER = "ledger"
+
+
+class PrepMode(str, enum.Enum):
+    # Edits a checkout of the release branch
+    CHECKOUT = "checkout"
+    # Builds the release commit with plumbing (`prep --plumbing`)
+    PLUMBING = "plumbing"
+
+
+class ClassificationRule(str, enum.Enum):
+    TAG = "tag"
+    PREFIX = "prefix"
+    LABEL = "label"
+    DEFAULT = "default"
+
+
+class ArtifactState(str, enum.Enum):
+    PENDING = "pending"
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
@@ -0,0 +1,166 @@
+import logging
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Final,
+    List,
+    NamedTuple,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+)
+
+import click
+
+from ge_releaser.trace import TRACER
+
+LOGGER: Final[logging.Logger] = logging.getLogger(__name__)
+
+DAG_WORKERS: Final[int] = 4
+
+StepResults = Dict[str, Any]
+
+
+class Step(NamedTuple):
+    """
+    A unit of work in a pipeline.
+
+    `run` receives the results of all completed steps (keyed by step name), which always
+    include those of `depends_on`. Each `progress` message is printed once the step finishes;
+    counted steps are numbered `(n/total)` in declaration order.
+    """
+
+    name: str
+    run: Callable[[StepResults], Any]
+    depends_on: Tuple[str, ...] = ()
+    progress: Tuple[str, ...] = ()
+    counted: bool = True
+
+
+class _Timing(NamedTuple):
+    start: float
+    end: float
+
+
+def run_steps(
+    steps: Sequence[Step],
+    max_workers: int = DAG_WORKERS,
+    completed: Optional[StepResults] = None,
+    on_complete: Optional[Callable[[str, Any], None]] = None,
+) -> StepResults:
+    """
+    Run steps as soon as their dependencies have finished, independent steps concurrently.
+
+    When a step fails, every step depending on it (directly or not) is cancelled, steps that
+    are already running finish, and the first failure (in declaration order) is re-raised.
+
+    Steps in `completed` (i.e. from an earlier, interrupted run) are not run again; their
+    recorded results are used instead. `on_complete` is called with each step's name and
+    result as it finishes, from the calling thread.
+    """
+    by_name = {step.name: step for step in steps}
+    for step in steps:
+        unknown = [d for d in step.depends_on if d not in by_name]
+        if unknown:
+            raise ValueError(f"Step '{step.name}' depends on unknown steps {unknown}")
+
+    labels = _number_progress(steps)
+    origin = time.perf_counter()
+    # Steps run on pool threads, so their spans are attached to the caller's span explicitly
+    parent_span = TRACER.current()
+
+    results: StepResults = {
+        name: result for name, result in (completed or {}).items() if name in by_name
+    }
+    failures: Dict[str, BaseException] = {}
+    cancelled: Set[str] = set()
+    pending: List[Step] = [step for step in steps if step.name not in results]
+    for step in steps:
+        if step.name in results:
+            _report(step, labels, None)
+    running: Dict[Future, str] = {}
+
+    def _timed(step: Step) -> Tuple[Any, _Timing]:
+        start = time.perf_counter() - origin
+        with TRACER.span(f"step.{step.name}", parent=parent_span):
+            result = step.run(results)
+        return result, _Timing(start, time.perf_counter() - origin)
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        while True:
+            scheduled = True
+            while scheduled:
+                scheduled = False
+                for step in list(pending):
+                    blocked_by = [
+                        d for d in step.depends_on if d in failures or d in cancelled
+                    ]
+                    if blocked_by:
+                        pending.remove(step)
+                        cancelled.add(step.name)
+                        scheduled = True
+                        click.secho(
+                            f" * Skipped '{step.name}' (depends on {', '.join(blocked_by)})",
+                            fg="red",
+                        )
+                    elif all(d in results for d in step.depends_on):
+                        pending.remove(step)
+                        running[executor.submit(_timed, step)] = step.name
+                        scheduled = True
+
+            if not running:
+                break
+
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                name = running.pop(future)
+                try:
+                    result, timing = future.result()
+                except BaseException as e:
+                    LOGGER.info(f"step {name} failed: {e!r}")
+                    failures[name] = e
+                    continue
+                results[name] = result
+                _report(by_name[name], labels, timing)
+                if on_complete is not None:
+                    on_complete(name, result)
+
+    if pending:
+        raise ValueError(
+            f"Steps with circular dependencies: {[step.name for step in pending]}"
+        )
+
+    for step in steps:
+        if step.name in failures:
+            raise failures[step.name]
+
+    return results
+
+
+def _number_progress(steps: Sequence[Step]) -> Dict[str, List[str]]:
+    total = sum(len(step.progress) for step in steps if step.counted)
+    labels: Dict[str, List[str]] = {}
+    counter = 0
+    for step in steps:
+        labels[step.name] = []
+        for _ in step.progress:
+            if step.counted:
+                counter += 1
+                labels[step.name].append(f" ({counter}/{total})")
+            else:
+                labels[step.name].append("")
+    return labels
+
+
+def _report(
+    step: Step, labels: Dict[str, List[str]], timing: Optional[_Timing]
+) -> None:
+    window = (
+        f"[{timing.start:.1f}s-{timing.end:.1f}s]" if timing else "[done previously]"
+    )
+    for message, label in zip(step.progress, labels[step.name]):
+        click.secho(f" * {message}{label} {window}", fg="yellow", dim=not step.counted)
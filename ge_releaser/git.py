@@ -1,15 +1,137 @@
 import datetime as dt
+import itertools
 import logging
-from typing import Final, Generator, Iterable, List
+import os
+import re
+import tempfile
+import threading
+import time
+from typing import (
+    Any,
+    Dict,
+    Final,
+    Generator,
+    List,
+    NamedTuple,
+    Optional,
+    Set,
+    Tuple,
+)
 
 import git
 import github
+from github.GitRelease import GitRelease
 from github.PullRequest import PullRequest
 
-from ge_releaser.constants import GxFile
+from ge_releaser.constants import (
+    GITHUB_API_URL,
+    GITHUB_PAGE_SIZE,
+    RATE_LIMIT_FLOOR,
+    RELEASER_STATE_DIR,
+    GxFile,
+)
+from ge_releaser.http_cache import ResponseCache, install_http_cache
+from ge_releaser.pulls import (
+    GHOST_USER,
+    PullRequestSnapshot,
+    datetime_from_epoch,
+    format_github_timestamp,
+    parse_github_timestamp,
+)
+from ge_releaser.tags import TagIndex
+from ge_releaser.trace import TRACER, traced
 
 LOGGER: Final[logging.Logger] = logging.getLogger(__name__)
 
+GRAPHQL_PAGE_SIZE: Final[int] = 100
+# GitHub's search API never returns more than this many results for a single query
+GRAPHQL_SEARCH_LIMIT: Final[int] = 1000
+# Searches over more PRs than that are split into windows, halved until each one fits under
+# the cap, but never below this
+MIN_SEARCH_WINDOW: Final[dt.timedelta] = dt.timedelta(minutes=10)
+
+MERGED_PRS_QUERY: Final[str] = """
+query($query: String!, $first: Int!, $after: String) {
+  search(query: $query, type: ISSUE, first: $first, after: $after) {
+    issueCount
+    pageInfo {
+      hasNextPage
+      endCursor
+    }
+    nodes {
+      ... on PullRequest {
+        number
+        title
+        mergedAt
+        author {
+          login
+        }
+        baseRefName
+        labels(first: 20) {
+          nodes {
+            name
+          }
+        }
+        mergeCommit {
+          oid
+        }
+      }
+    }
+  }
+}
+"""
+
+PULL_REQUEST_DETAILS_FRAGMENT: Final[str] = """
+    pr{number}: pullRequest(number: {number}) {{
+      author {{
+        login
+      }}
+      labels(first: 20) {{
+        nodes {{
+          name
+        }}
+      }}
+    }}"""
+
+# `git hash-object -t tree /dev/null`, for paths under directories the parent doesn't have
+# Fetches and worktree changes of one clone (shared by all of its worktrees) must not run
+# concurrently, i.e. across the targets of a batch; keyed by the clone's common git dir
+_repo_locks: Dict[str, "threading.RLock"] = {}
+_repo_locks_lock = threading.Lock()
+
+EMPTY_TREE: Final[str] = "4b825dc642cb6eb9a060e54bf8d69288fbee4904"
+
+# Squash merges on GitHub append the PR number to the subject, i.e. "[FEATURE] Foo (#1234)"
+SQUASH_MERGE_SUBJECT: Final[re.Pattern] = re.compile(
+    r"^(?P<title>.*?)\s*\(#(?P<number>\d+)\)$"
+)
+
+
+class TrunkCommit(NamedTuple):
+    sha: str
+    timestamp: dt.datetime
+    subject: str
+
+    @property
+    def pr_number(self) -> Optional[int]:
+        match = SQUASH_MERGE_SUBJECT.match(self.subject)
+        return int(match.group("number")) if match else None
+
+    @property
+    def pr_title(self) -> str:
+        match = SQUASH_MERGE_SUBJECT.match(self.subject)
+        return match.group("title") if match else self.subject
+
+
+class PullRequestDetails(NamedTuple):
+    author: str
+    labels: List[str]
+
+
+def _label_names(node: Dict[str, Any]) -> List[str]:
+    labels = node.get("labels")
+    return [label["name"] for label in labels["nodes"]] if labels else []
+
 
 class GitService:
     def __init__(
@@ -18,14 +140,63 @@ class GitService:
         repo_name: str,
         trunk: str,
         remote: str,
+        http_cache: Optional[ResponseCache] = None,
+        api_url: str = GITHUB_API_URL,
+        root: str = "",
+        detached_trunk: bool = False,
+        github_client: Optional[github.Github] = None,
+        rate_limit_lock: Optional[threading.Lock] = None,
     ) -> None:
-        self._git = git.Repo()
+        """
+        `root` is the working tree to operate on (the current directory by default). With
+        `detached_trunk`, the trunk is only ever checked out as a detached `<remote>/<trunk>`,
+        so that other worktrees of the same clone are free to have the trunk branch checked out.
+        """
+        self._git = git.Repo(root or None)
+        self._tag_index = TagIndex(self._git)
 
-        gh = github.Github(github_token)
-        self._gh = gh.get_repo(repo_name)
+        if github_client is None:
+            install_http_cache(http_cache)
+            github_client = github.Github(
+                github_token, base_url=api_url, per_page=GITHUB_PAGE_SIZE
+            )
+        self._github = github_client
+        # Lazy: the repo is only fetched if an API call needs more than its URL
+        self._gh = self._github.get_repo(repo_name, lazy=True)
 
+        self._rate_limit_lock = rate_limit_lock or threading.Lock()
+        self._repo_name = repo_name
         self._trunk = trunk
         self._remote = remote
+        self._root = root
+        self._detached_trunk = detached_trunk
+
+    def for_target(self, repo_name: str, trunk: str, root: str) -> "GitService":
+        """
+        A service for another repo and trunk checked out at `root`, sharing this service's
+        GitHub client: one connection pool and one view of the rate limit.
+        """
+        return GitService(
+            github_token="",
+            repo_name=repo_name,
+            trunk=trunk,
+            remote=self._remote,
+            root=root,
+            detached_trunk=True,
+            github_client=self._github,
+            rate_limit_lock=self._rate_limit_lock,
+        )
+
+    @property
+    def repo_name(self) -> str:
+        return self._repo_name
+
+    @property
+    def root(self) -> str:
+        return self._root
+
+    def path(self, file: GxFile) -> str:
+        return os.path.join(self._root, file.value)
 
     @property
     def trunk(self) -> str:
@@ -38,12 +209,34 @@ class GitService:
         """
         return self._trunk.startswith("0.")
 
-    def get_tags(self, reverse: bool = False) -> List[git.Tag]:
-        """See also `.iter_recent_tags()`"""
-        return sorted(
-            self._git.tags, key=lambda t: t.commit.committed_datetime, reverse=reverse
-        )
+    @property
+    def state_dir(self) -> str:
+        """
+        Where the releaser keeps per-repo state (under `.git/`, shared by all worktrees).
+        """
+        return os.path.join(self._git.common_dir, RELEASER_STATE_DIR)
+
+    @property
+    def worktree_state_dir(self) -> str:
+        """
+        Per-worktree state (i.e. an in-progress prep), under `.git/worktrees/<name>/` for
+        linked worktrees and the same as `state_dir` for the main one.
+        """
+        return os.path.join(self._git.git_dir, RELEASER_STATE_DIR)
+
+    @property
+    def tag_index(self) -> TagIndex:
+        return self._tag_index
 
+    @traced()
+    def get_tags(self, reverse: bool = False) -> List[str]:
+        """
+        Tag names ordered by commit timestamp, served from the on-disk tag index.
+        See also `.iter_recent_tags()`
+        """
+        return [tag.name for tag in self._tag_index.sorted(reverse=reverse)]
+
+    @traced()
     def iter_recent_tags(
         self, prefix_filter: str, limit: int = 2
     ) -> Generator[str, None, None]:
@@ -52,56 +245,405 @@ class GitService:
         Useful for filtering out unrelated tags.
         """
         LOGGER.info(f"iter_tags: prefix_filter={prefix_filter}, limit={limit}")
-        if limit < 1:
-            raise ValueError("Limit must be greater than 0")
-        itered: int = 0
-        for tag in self.get_tags(reverse=True):
-            LOGGER.debug(f"tag: {tag.name}")
-            if itered >= limit:
-                return
-            if tag.name.startswith(prefix_filter):
-                LOGGER.info(f"yielding tag: {tag.name}")
-                yield tag.name
-                itered += 1
+        for tag in self._tag_index.latest(prefix_filter=prefix_filter, limit=limit):
+            LOGGER.info(f"yielding tag: {tag.name}")
+            yield tag.name
+
+    @traced()
+    def iter_trunk_commits(
+        self, start: str, end: str
+    ) -> Generator[TrunkCommit, None, None]:
+        """
+        Iterate over the first-parent commits in `start..end`, newest first.
+        """
+        output = self._git.git.log(
+            "--first-parent", "--format=%H%x00%ct%x00%s", f"{start}..{end}"
+        )
+        for line in output.splitlines():
+            sha, timestamp, subject = line.split("\x00", 2)
+            yield TrunkCommit(
+                sha=sha,
+                timestamp=datetime_from_epoch(int(timestamp)),
+                subject=subject,
+            )
+
+    @traced()
+    def trunk_commit_shas(self, start: str, end: str) -> Set[str]:
+        """
+        The SHAs of the first-parent commits in `start..end`, i.e. the merges of a release.
+        """
+        output = self._git.git.rev_list("--first-parent", f"{start}..{end}")
+        return set(output.split())
 
+    @traced()
     def tag_commit(self, commit: str, version: str) -> None:
-        self._git.git.checkout(commit)
-        self._git.git.tag("-a", version, "-m", f'"{version}"')
+        # Tag the commit directly; checking it out first would rewrite the whole working tree
+        self._git.git.tag("-a", version, "-m", f'"{version}"', commit)
 
+    @traced()
     def create_and_checkout_branch(self, branch_name: str) -> None:
         self._git.git.checkout("HEAD", b=branch_name)
 
+    @traced()
+    def checkout_branch(self, branch_name: str) -> None:
+        self._git.git.checkout(branch_name)
+
+    @property
+    def repo_lock(self) -> "threading.RLock":
+        """
+        The lock every service for this clone or one of its worktrees holds while fetching or
+        changing worktrees. It is reentrant, so callers may hold it around several of those.
+        """
+        key = os.path.realpath(self._git.common_dir)
+        with _repo_locks_lock:
+            return _repo_locks.setdefault(key, threading.RLock())
+
+    @property
+    def _trunk_ref(self) -> str:
+        return f"{self._remote}/{self._trunk}" if self._detached_trunk else self._trunk
+
+    @traced()
     def checkout_and_pull_trunk(self) -> None:
+        if self._detached_trunk:
+            self.fetch_branch(self._trunk)
+            self._git.git.checkout("--detach", self._trunk_ref)
+            return
         self._git.git.checkout(self._trunk)
-        self._git.git.pull(self._remote, self._trunk)
+        with self.repo_lock:
+            self._git.git.pull(self._remote, self._trunk)
+
+    @traced()
+    def fetch_branch(self, branch: str) -> str:
+        """
+        Update the remote-tracking ref of `branch` and return its name.
+        """
+        ref = f"{self._remote}/{branch}"
+        with self.repo_lock:
+            self._git.git.fetch(self._remote, f"+{branch}:refs/remotes/{ref}")
+        return ref
+
+    @traced()
+    def add_worktree(self, path: str, ref: str) -> None:
+        """
+        Create (or recreate) a worktree at `path` with `ref` checked out detached.
+        """
+        with self.repo_lock:
+            if os.path.exists(path):
+                self.remove_worktree(path)
+            self._git.git.worktree("add", "--detach", path, ref)
+
+    @traced()
+    def remove_worktree(self, path: str) -> None:
+        with self.repo_lock:
+            self._git.git.worktree("remove", "--force", path)
 
     def _check_for_untracked_files(self) -> bool:
         return bool(self._git.untracked_files)
 
+    @traced()
     def verify_no_untracked_files(self) -> None:
         if self._check_for_untracked_files():
             raise ValueError(
                 "There are untracked files. Please make sure to run this step with a clean repo."
             )
 
-    def stage_all_and_commit(self, message: str) -> None:
-        files_to_commit = [
+    @property
+    def release_files(self) -> List[GxFile]:
+        """
+        The files a release prep commit changes.
+        """
+        return [
             GxFile.CHANGELOG_MD_V0 if self.trunk_is_0ver else GxFile.CHANGELOG_MD_V1,
             GxFile.DOCS_DATA_COMPONENT,
             GxFile.DOCS_CONFIG,
             GxFile.DEPLOYMENT_VERSION,
         ]
-        self._git.git.add([file.value for file in files_to_commit])
+
+    @traced()
+    def stage_all_and_commit(self, message: str) -> None:
+        self._git.git.add([file.value for file in self.release_files])
         self._git.git.commit("-m", message, "--no-verify")
 
+    @traced()
+    def export_files(self, ref: str, paths: List[str], destination: str) -> List[str]:
+        """
+        Write the files at `paths` in the tree of `ref` under `destination`, without checking
+        anything out. Paths that `ref` doesn't have are skipped; returns those written.
+        """
+        listed = self._git.git.ls_tree("-z", "--name-only", ref, "--", *paths)
+        exported = [path for path in listed.split("\0") if path]
+        for path in exported:
+            target = os.path.join(destination, path)
+            os.makedirs(os.path.dirname(target), exist_ok=True)
+            with open(target, "wb") as f:
+                self._git.git.cat_file("blob", f"{ref}:{path}", output_stream=f)
+        return exported
+
+    @traced()
+    def commit_files(
+        self, parent: str, files: Dict[str, str], message: str, branch: str
+    ) -> str:
+        """
+        Commit new contents for some paths on top of `parent` and create `branch` at the
+        commit, using plumbing only: neither the working tree nor the index is touched, so
+        this works the same in a dirty checkout or a bare clone.
+
+        `files` maps paths in the repo to local files with their new contents. Only the trees
+        on the way to those paths are rewritten; everything else is shared with `parent`.
+        """
+        blobs = {
+            path: self._git.git.hash_object("-w", f"--path={path}", "--", local)
+            for path, local in files.items()
+        }
+        tree = self._write_tree(f"{parent}^{{tree}}", blobs)
+        commit = self._git.git.commit_tree(tree, "-p", parent, "-m", message)
+        # An empty old value makes this fail instead of moving an existing branch
+        self._git.git.update_ref(f"refs/heads/{branch}", commit, "")
+        return commit
+
+    def _write_tree(self, tree: str, blobs: Dict[str, str]) -> str:
+        """
+        Write a copy of `tree` with the blobs at the given (relative) paths replaced.
+        """
+        entries: Dict[str, str] = {}
+        for entry in self._git.git.ls_tree("-z", tree).split("\0"):
+            if entry:
+                meta, name = entry.split("\t", 1)
+                entries[name] = meta
+
+        subtrees: Dict[str, Dict[str, str]] = {}
+        for path, sha in blobs.items():
+            name, _, rest = path.partition("/")
+            if rest:
+                subtrees.setdefault(name, {})[rest] = sha
+                continue
+            mode = entries[name].split()[0] if name in entries else "100644"
+            entries[name] = f"{mode} blob {sha}"
+        for name, subtree_blobs in subtrees.items():
+            subtree = entries[name].split()[2] if name in entries else EMPTY_TREE
+            entries[name] = f"040000 tree {self._write_tree(subtree, subtree_blobs)}"
+
+        with tempfile.TemporaryFile() as listing:
+            listing.write(
+                b"".join(
+                    f"{meta}\t{name}\0".encode("utf-8")
+                    for name, meta in entries.items()
+                )
+            )
+            listing.seek(0)
+            return self._git.git.mktree("-z", istream=listing)
+
+    @traced()
     def get_release_timestamp(self, version: str) -> dt.datetime:
         return self._gh.get_release(version).created_at
 
-    def get_merged_prs(self) -> Iterable[PullRequest]:
-        return self._gh.get_pulls(
+    def get_merged_prs(self) -> Generator[PullRequest, None, None]:
+        """
+        Yield the closed PRs of the trunk, most recently updated first, one page at a time.
+
+        Pages are requested directly rather than by iterating the `PaginatedList`, which would
+        keep every PR it ever returned (with its raw JSON) alive until the listing is dropped.
+        """
+        pulls = self._gh.get_pulls(
             base=self._trunk, state="closed", sort="updated", direction="desc"
         )
+        for page in itertools.count():
+            prs = pulls.get_page(page)
+            if not prs:
+                return
+            yield from prs
+
+    def wait_for_rate_limit(self, floor: int = RATE_LIMIT_FLOOR) -> None:
+        """
+        Block until the core rate limit resets if fewer than `floor` requests remain.
+
+        Relies on the `X-RateLimit-*` headers PyGithub records from previous responses, so it
+        is free to call before every request.
+        """
+        with self._rate_limit_lock:
+            remaining, _ = self._github.rate_limiting
+            if remaining >= floor:
+                return
+            delay = max(self._github.rate_limiting_resettime - time.time(), 0) + 1
+            LOGGER.warning(
+                f"Only {remaining} GitHub requests left; sleeping {delay:.0f}s until reset"
+            )
+            with TRACER.span("github.rate_limit_sleep", remaining=remaining):
+                time.sleep(delay)
+            TRACER.count("github.rate_limit_sleeps")
+            TRACER.count("github.rate_limit_sleep_seconds", delay)
+
+    @traced()
+    def verify_github_access(self) -> None:
+        # Completing the lazy repo handle fails fast on a bad token or an unknown repo
+        LOGGER.info(f"verified access to {self._gh.full_name}")
+
+    @traced()
+    def graphql(
+        self, query: str, variables: Dict[str, Any], allow_partial: bool = False
+    ) -> Dict[str, Any]:
+        # Reuse PyGithub's requester so GraphQL calls share its auth and connection handling
+        _, response = self._gh._requester.requestJsonAndCheck(
+            "POST", "/graphql", input={"query": query, "variables": variables}
+        )
+        errors = response.get("errors")
+        if errors and not (allow_partial and response.get("data")):
+            raise ValueError(f"GraphQL query failed: {errors}")
+        if errors:
+            LOGGER.warning(f"GraphQL query partially failed: {errors}")
+        return response["data"]
+
+    @traced()
+    def get_latest_workflow_run(
+        self, workflow: str, branch: str
+    ) -> Optional[Dict[str, Any]]:
+        """
+        The most recent push-triggered run of `workflow` for `branch` (or tag), if there is one.
 
+        Goes through PyGithub's requester, so with the HTTP cache on, repeated polls are
+        conditional requests that GitHub answers with a 304 until the run changes.
+        """
+        _, response = self._gh._requester.requestJsonAndCheck(
+            "GET",
+            f"{self._gh.url}/actions/workflows/{workflow}/runs",
+            parameters={"branch": branch, "event": "push", "per_page": 1},
+        )
+        runs = response["workflow_runs"]
+        return runs[0] if runs else None
+
+    @traced()
+    def get_merged_prs_graphql(
+        self, since: dt.datetime
+    ) -> Generator[PullRequestSnapshot, None, None]:
+        """
+        Yield every PR merged into the trunk after `since`, 100 per request.
+
+        The range is split into windows that each stay under the search cap, so that no PR
+        is left out of a busy release.
+        """
+        until = dt.datetime.now(dt.timezone.utc).replace(tzinfo=None, microsecond=0)
+        # Windows include their start, while `since` itself is excluded
+        for start, end, count in self.search_windows(
+            since + dt.timedelta(seconds=1), until
+        ):
+            if count == 0:
+                continue
+            for pr, _ in self.search_merged_prs(start, end):
+                yield pr
+
+    @traced()
+    def search_merged_prs(
+        self, since: dt.datetime, until: Optional[dt.datetime] = None
+    ) -> Generator[Tuple[PullRequestSnapshot, Optional[str]], None, None]:
+        """
+        Yield every PR merged into the trunk after `since` (or in `since..until`, both
+        inclusive), along with the SHA of its merge commit.
+
+        Raises `ValueError` if more PRs match than search returns; see `search_windows`.
+        """
+        query = self._merged_prs_query(since, until)
+        cursor: Optional[str] = None
+        while True:
+            search = self.graphql(
+                MERGED_PRS_QUERY,
+                {"query": query, "first": GRAPHQL_PAGE_SIZE, "after": cursor},
+            )["search"]
+            if cursor is None and search["issueCount"] > GRAPHQL_SEARCH_LIMIT:
+                raise ValueError(
+                    f"{search['issueCount']} PRs match '{query}' but search is capped at {GRAPHQL_SEARCH_LIMIT}"
+                )
+
+            for node in search["nodes"]:
+                snapshot = PullRequestSnapshot(
+                    number=node["number"],
+                    title=node["title"],
+                    merged_at=parse_github_timestamp(node["mergedAt"]),
+                    author=node["author"]["login"] if node["author"] else GHOST_USER,
+                    base_ref=node["baseRefName"],
+                    labels=_label_names(node),
+                )
+                merge_commit = node.get("mergeCommit")
+                yield snapshot, merge_commit["oid"] if merge_commit else None
+
+            page_info = search["pageInfo"]
+            if not page_info["hasNextPage"]:
+                return
+            cursor = page_info["endCursor"]
+
+    @traced()
+    def count_merged_prs(self, since: dt.datetime, until: dt.datetime) -> int:
+        """
+        Number of PRs merged into the trunk in `since..until`, at the cost of one small request.
+        """
+        search = self.graphql(
+            MERGED_PRS_QUERY,
+            {"query": self._merged_prs_query(since, until), "first": 1, "after": None},
+        )["search"]
+        return search["issueCount"]
+
+    def search_windows(
+        self, since: dt.datetime, until: dt.datetime
+    ) -> List[Tuple[dt.datetime, dt.datetime, int]]:
+        """
+        Split `since..until` into windows that each match no more PRs than a search returns,
+        along with their counts.
+        """
+        windows: List[Tuple[dt.datetime, dt.datetime, int]] = []
+        pending = [(since, until)]
+        while pending:
+            start, end = pending.pop()
+            count = self.count_merged_prs(start, end)
+            if count > GRAPHQL_SEARCH_LIMIT and end - start > MIN_SEARCH_WINDOW:
+                middle = start + (end - start) / 2
+                middle = middle.replace(microsecond=0)
+                # Newest half last, so windows come out oldest first
+                pending.append((middle + dt.timedelta(seconds=1), end))
+                pending.append((start, middle))
+                continue
+            windows.append((start, end, count))
+        return windows
+
+    def _merged_prs_query(
+        self, since: dt.datetime, until: Optional[dt.datetime]
+    ) -> str:
+        merged = (
+            f"merged:>{format_github_timestamp(since)}"
+            if until is None
+            else f"merged:{format_github_timestamp(since)}..{format_github_timestamp(until)}"
+        )
+        return f"repo:{self._repo_name} is:pr is:merged base:{self._trunk} {merged}"
+
+    @traced()
+    def get_pr_details(self, numbers: List[int]) -> Dict[int, PullRequestDetails]:
+        """
+        Look up PR authors and labels by number, batching up to 100 PRs into each GraphQL query.
+        """
+        owner, name = self._repo_name.split("/")
+        details: Dict[int, PullRequestDetails] = {}
+        for i in range(0, len(numbers), GRAPHQL_PAGE_SIZE):
+            fragments = "".join(
+                PULL_REQUEST_DETAILS_FRAGMENT.format(number=number)
+                for number in numbers[i : i + GRAPHQL_PAGE_SIZE]
+            )
+            query = f"""
+query($owner: String!, $name: String!) {{
+  repository(owner: $owner, name: $name) {{{fragments}
+  }}
+}}
+"""
+            # Numbers that turn out to be issues rather than PRs come back as null
+            repository = self.graphql(
+                query, {"owner": owner, "name": name}, allow_partial=True
+            )["repository"]
+            for alias, pr in repository.items():
+                author = pr["author"] if pr else None
+                details[int(alias[2:])] = PullRequestDetails(
+                    author=author["login"] if author else GHOST_USER,
+                    labels=_label_names(pr) if pr else [],
+                )
+        return details
+
+    @traced()
     def push_branch_to_remote(self, branch: str, set_upstream: bool) -> None:
         args = []
         if set_upstream:
@@ -109,6 +651,7 @@ class GitService:
         args += [self._remote, branch]
         self._git.git.push(*args)
 
+    @traced()
     def create_pr(self, title: str, body: str, head: str) -> PullRequest:
         return self._gh.create_pull(
             title=title,
@@ -117,10 +660,39 @@ class GitService:
             base=self._trunk,
         )
 
+    @traced()
     def create_release(self, version: str, message: str, draft: bool = False) -> None:
         self._gh.create_git_release(
             tag=version, name=version, message=message, draft=draft
         )
 
+    @traced()
+    def get_releases(self) -> Dict[str, GitRelease]:
+        """
+        Every release of the repo keyed by tag, from one paginated listing.
+        """
+        return {release.tag_name: release for release in self._gh.get_releases()}
+
+    @traced()
+    def update_release(self, release: GitRelease, message: str) -> None:
+        release.update_release(
+            name=release.title or release.tag_name,
+            message=message,
+            draft=release.draft,
+            prerelease=release.prerelease,
+        )
+
+    @traced()
     def check_if_commit_is_part_of_trunk(self, commit: str) -> bool:
-        return self._trunk in self._git.git.branch("--contains", commit)
+        """
+        A single reachability query against the trunk, which git answers from the
+        commit-graph when one has been written, instead of scanning every local branch.
+        """
+        try:
+            self._git.git.merge_base("--is-ancestor", commit, self._trunk_ref)
+        except git.GitCommandError as e:
+            # Exit status 1 means "not an ancestor"; anything else (i.e. a bad ref) is an error
+            if e.status == 1:
+                return False
+            raise
+        return True
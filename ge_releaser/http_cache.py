@@ -0,0 +1,342 @@
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Final, List, NamedTuple, Optional, Tuple
+
+from github.Requester import Requester
+
+from ge_releaser.constants import (
+    HTTP_CACHE_FILE,
+    HTTP_CACHE_MAX_AGE,
+    HTTP_CACHE_MAX_BYTES,
+    RELEASER_CACHE_DIR,
+)
+from ge_releaser.trace import TRACER
+from ge_releaser.transport import TRANSPORT
+
+LOGGER: Final[logging.Logger] = logging.getLogger(__name__)
+
+# Headers that describe the current state of the rate limit rather than the cached resource
+_VOLATILE_HEADERS: Final[Tuple[str, ...]] = (
+    "date",
+    "x-ratelimit-limit",
+    "x-ratelimit-remaining",
+    "x-ratelimit-reset",
+    "x-ratelimit-used",
+    "x-ratelimit-resource",
+)
+
+_SCHEMA: Final[str] = """
+CREATE TABLE IF NOT EXISTS responses (
+    key TEXT PRIMARY KEY,
+    url TEXT NOT NULL,
+    etag TEXT,
+    last_modified TEXT,
+    headers TEXT NOT NULL,
+    body TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    stored_at REAL NOT NULL,
+    last_used REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS responses_last_used ON responses (last_used);
+CREATE TABLE IF NOT EXISTS counters (
+    name TEXT PRIMARY KEY,
+    value INTEGER NOT NULL
+);
+"""
+
+
+class CachedResponse(NamedTuple):
+    etag: Optional[str]
+    last_modified: Optional[str]
+    headers: Dict[str, str]
+    body: str
+
+
+class CacheStats(NamedTuple):
+    path: str
+    entries: int
+    size: int
+    hits: int
+    misses: int
+    oldest: Optional[float]
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+
+class ResponseCache:
+    """
+    SQLite-backed store of GitHub GET responses and their validators (ETag/Last-Modified).
+
+    Entries older than `max_age` seconds are dropped, and the least recently used entries are
+    evicted once the stored bodies exceed `max_bytes`.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        max_bytes: int = HTTP_CACHE_MAX_BYTES,
+        max_age: int = HTTP_CACHE_MAX_AGE,
+    ) -> None:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._path = path
+        self._max_bytes = max_bytes
+        self._max_age = max_age
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.executescript(_SCHEMA)
+
+    @classmethod
+    def open_default(cls) -> "ResponseCache":
+        return cls(os.path.join(RELEASER_CACHE_DIR, HTTP_CACHE_FILE))
+
+    @staticmethod
+    def key(url: str, headers: Dict[str, str]) -> str:
+        # Responses depend on who is asking and in which media type
+        identity = "\n".join(
+            (url, headers.get("Authorization", ""), headers.get("Accept", ""))
+        )
+        return hashlib.sha256(identity.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[CachedResponse]:
+        with self._lock:
+            row = self._db.execute(
+                "SELECT etag, last_modified, headers, body, stored_at FROM responses WHERE key = ?",
+                (key,),
+            ).fetchone()
+        if row is None:
+            return None
+        etag, last_modified, headers, body, stored_at = row
+        if time.time() - stored_at > self._max_age:
+            return None
+        return CachedResponse(etag, last_modified, json.loads(headers), body)
+
+    def put(self, key: str, url: str, headers: Dict[str, str], body: str) -> None:
+        etag = headers.get("etag")
+        last_modified = headers.get("last-modified")
+        if etag is None and last_modified is None:
+            return
+
+        now = time.time()
+        stored_headers = {
+            k: v for k, v in headers.items() if k not in _VOLATILE_HEADERS
+        }
+        with self._lock, self._db:
+            self._db.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    key,
+                    url,
+                    etag,
+                    last_modified,
+                    json.dumps(stored_headers),
+                    body,
+                    len(body),
+                    now,
+                    now,
+                ),
+            )
+            self._evict(now)
+
+    def touch(self, key: str) -> None:
+        with self._lock, self._db:
+            self._db.execute(
+                "UPDATE responses SET last_used = ? WHERE key = ?", (time.time(), key)
+            )
+
+    def record(self, hit: bool) -> None:
+        name = "hits" if hit else "misses"
+        with self._lock, self._db:
+            self._db.execute(
+                "INSERT INTO counters VALUES (?, 1) ON CONFLICT(name) DO UPDATE SET value = value + 1",
+                (name,),
+            )
+
+    def stats(self) -> CacheStats:
+        with self._lock:
+            entries, size, oldest = self._db.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0), MIN(stored_at) FROM responses"
+            ).fetchone()
+            counters = dict(self._db.execute("SELECT name, value FROM counters"))
+        return CacheStats(
+            path=self._path,
+            entries=entries,
+            size=size,
+            hits=counters.get("hits", 0),
+            misses=counters.get("misses", 0),
+            oldest=oldest,
+        )
+
+    def _evict(self, now: float) -> None:
+        self._db.execute(
+            "DELETE FROM responses WHERE stored_at < ?", (now - self._max_age,)
+        )
+        (total,) = self._db.execute(
+            "SELECT COALESCE(SUM(size), 0) FROM responses"
+        ).fetchone()
+        if total <= self._max_bytes:
+            return
+
+        evicted: List[str] = []
+        for key, size in self._db.execute(
+            "SELECT key, size FROM responses ORDER BY last_used"
+        ):
+            if total <= self._max_bytes:
+                break
+            evicted.append(key)
+            total -= size
+        self._db.executemany(
+            "DELETE FROM responses WHERE key = ?", [(key,) for key in evicted]
+        )
+        LOGGER.info(f"evicted {len(evicted)} cached responses")
+
+
+class _Response:
+    # mimics the httplib response object, like PyGithub's own `RequestsResponse`
+    def __init__(self, status: int, headers: Dict[str, str], text: str) -> None:
+        self.status = status
+        self.headers = headers
+        self.text = text
+
+    def getheaders(self) -> List[Tuple[str, str]]:
+        return list(self.headers.items())
+
+    def read(self) -> str:
+        return self.text
+
+
+class CachingConnection:
+    """
+    Drop-in replacement for PyGithub's connection classes that revalidates GETs against the cache.
+
+    Pending requests are kept per thread and all connections send through the shared
+    `TRANSPORT`, so a single `Requester` can safely be used from several threads and its
+    requests are pooled, retried and paced against the rate limit.
+    """
+
+    protocol: str = "https"
+    cache: Optional[ResponseCache] = None
+
+    def __init__(
+        self,
+        host: str,
+        port: Optional[int] = None,
+        strict: bool = False,
+        timeout: Optional[int] = None,
+        retry: Any = None,
+        pool_size: Optional[int] = None,
+        **kwargs: Any,
+    ) -> None:
+        self.host = host
+        self.port = port if port else (443 if self.protocol == "https" else 80)
+        self.timeout = timeout
+        self.verify = kwargs.get("verify", True)
+        self._pending = threading.local()
+
+    def request(self, verb: str, url: str, input: Any, headers: Dict[str, str]) -> None:
+        self._pending.request = (verb, url, input, dict(headers))
+
+    def getresponse(self) -> _Response:
+        verb, url, input, headers = self._pending.request
+        with TRACER.span("github.request", verb=verb, path=url) as span:
+            response = self._getresponse(verb, url, input, headers)
+            if span is not None:
+                span.set(status=response.status)
+            return response
+
+    def _getresponse(
+        self, verb: str, url: str, input: Any, headers: Dict[str, str]
+    ) -> _Response:
+        cache = self.cache
+        cacheable = (
+            cache is not None
+            and verb == "GET"
+            and "If-None-Match" not in headers
+            and "If-Modified-Since" not in headers
+        )
+
+        key: Optional[str] = None
+        cached: Optional[CachedResponse] = None
+        if cacheable:
+            key = ResponseCache.key(url, headers)
+            cached = cache.get(key)
+            if cached is not None and cached.etag:
+                headers["If-None-Match"] = cached.etag
+            elif cached is not None and cached.last_modified:
+                headers["If-Modified-Since"] = cached.last_modified
+
+        r = TRANSPORT.request(
+            verb,
+            f"{self.protocol}://{self.host}:{self.port}{url}",
+            rate_limit=_rate_limit_resource(url),
+            # GraphQL is only used for queries, which are safe to resend
+            retry_unsafe=_rate_limit_resource(url) == "graphql",
+            headers=headers,
+            data=input,
+            timeout=self.timeout,
+            verify=self.verify,
+            allow_redirects=False,
+        )
+        response_headers = {k.lower(): v for k, v in r.headers.items()}
+        TRACER.count("github.requests")
+        TRACER.count("github.bytes", len(r.content))
+        if "x-ratelimit-remaining" in response_headers:
+            TRACER.observe_min(
+                "github.rate_limit_remaining",
+                int(response_headers["x-ratelimit-remaining"]),
+            )
+
+        if not cacheable:
+            return _Response(r.status_code, response_headers, r.text)
+
+        if r.status_code == 304 and cached is not None:
+            LOGGER.debug(f"cache hit: {url}")
+            cache.record(hit=True)
+            TRACER.count("github.not_modified")
+            cache.touch(key)
+            # Replay the stored resource, but report the live rate-limit state
+            replayed = {**cached.headers, **response_headers}
+            return _Response(200, replayed, cached.body)
+
+        cache.record(hit=False)
+        if r.status_code == 200:
+            cache.put(key, url, response_headers, r.text)
+        return _Response(r.status_code, response_headers, r.text)
+
+    def close(self) -> None:
+        return
+
+
+def _rate_limit_resource(url: str) -> str:
+    # GitHub keeps separate rate-limit windows for these
+    path = url.split("?", 1)[0]
+    if path.endswith("/graphql"):
+        return "graphql"
+    if "/search/" in path:
+        return "search"
+    return "core"
+
+
+class CachingHTTPConnection(CachingConnection):
+    protocol = "http"
+
+
+class CachingHTTPSConnection(CachingConnection):
+    protocol = "https"
+
+
+def install_http_cache(cache: Optional[ResponseCache]) -> None:
+    """
+    Route every PyGithub request through `cache`; must run before `github.Github` is created.
+
+    Passing `None` still installs the thread-safe connection classes, just without caching.
+    """
+    CachingConnection.cache = cache
+    Requester.injectConnectionClasses(CachingHTTPConnection, CachingHTTPSConnection)
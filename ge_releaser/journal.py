@@ -0,0 +1,120 @@
+import json
+import logging
+import os
+import tempfile
+from typing import Any, Dict, Final, Optional
+
+from ge_releaser.constants import PrepMode
+
+LOGGER: Final[logging.Logger] = logging.getLogger(__name__)
+
+PREP_JOURNAL_FILE: Final[str] = "prep_journal.json"
+JOURNAL_FORMAT: Final[int] = 2
+
+
+class PrepJournal:
+    """
+    Checkpoints of a `prep` run: the results of each completed step, keyed by step name.
+
+    The journal is tied to the version pair and the mode (whose steps differ) it was started
+    for, and is rewritten atomically after every step, so an interrupted run leaves it
+    describing exactly the steps that finished.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        last_version: str,
+        release_version: str,
+        mode: PrepMode,
+        completed: Optional[Dict[str, Any]] = None,
+    ) -> None:
+        self._path = path
+        self._last_version = last_version
+        self._release_version = release_version
+        self._mode = mode
+        self._completed: Dict[str, Any] = completed or {}
+
+    @property
+    def path(self) -> str:
+        return self._path
+
+    @property
+    def completed(self) -> Dict[str, Any]:
+        return dict(self._completed)
+
+    @classmethod
+    def start(
+        cls, state_dir: str, last_version: str, release_version: str, mode: PrepMode
+    ) -> "PrepJournal":
+        journal = cls(
+            os.path.join(state_dir, PREP_JOURNAL_FILE),
+            last_version,
+            release_version,
+            mode,
+        )
+        journal._save()
+        return journal
+
+    @classmethod
+    def resume(
+        cls, state_dir: str, last_version: str, release_version: str, mode: PrepMode
+    ) -> Optional["PrepJournal"]:
+        """
+        Load the journal left by an earlier run, if there is one. Raises `ValueError` if that
+        run was for other versions or in the other mode, whose steps can't be picked up.
+        """
+        path = os.path.join(state_dir, PREP_JOURNAL_FILE)
+        try:
+            with open(path) as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return None
+
+        if data.get("format") != JOURNAL_FORMAT:
+            return None
+        if (data.get("last_version"), data.get("release_version")) != (
+            last_version,
+            release_version,
+        ):
+            raise ValueError(
+                f"{path} is from a prep of {data.get('last_version')} -> {data.get('release_version')}, "
+                f"not {last_version} -> {release_version}; run prep without --resume to start over"
+            )
+        if data.get("mode") != mode.value:
+            raise ValueError(
+                f"{path} is from a prep in {data.get('mode')} mode, not {mode.value}; "
+                "resume it the same way or run prep without --resume to start over"
+            )
+        return cls(path, last_version, release_version, mode, data.get("completed"))
+
+    def record(self, step: str, result: Any) -> None:
+        self._completed[step] = result
+        self._save()
+
+    def discard(self) -> None:
+        if os.path.exists(self._path):
+            os.remove(self._path)
+
+    def _save(self) -> None:
+        directory = os.path.dirname(self._path)
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".prep_journal.")
+        try:
+            with os.fdopen(fd, "w") as f:
+                json.dump(
+                    {
+                        "format": JOURNAL_FORMAT,
+                        "last_version": self._last_version,
+                        "release_version": self._release_version,
+                        "mode": self._mode.value,
+                        "completed": self._completed,
+                    },
+                    f,
+                    indent=2,
+                )
+            os.replace(tmp_path, self._path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+            raise
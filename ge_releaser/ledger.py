@@ -0,0 +1,231 @@
+import datetime as dt
+import logging
+import os
+import sqlite3
+import threading
+from typing import Final, Generator, List, NamedTuple, Optional, Tuple
+
+from ge_releaser.git import GitService
+from ge_releaser.pulls import (
+    PullRequestSnapshot,
+    format_github_timestamp,
+    parse_github_timestamp,
+)
+
+LOGGER: Final[logging.Logger] = logging.getLogger(__name__)
+
+LEDGER_FILE: Final[str] = "ledger.sqlite"
+
+# Each sync re-reads this much before its cursor, to pick up PRs GitHub's search index was
+# still catching up on the last time round
+SYNC_OVERLAP: Final[dt.timedelta] = dt.timedelta(hours=1)
+
+# A squash commit's date and GitHub's `mergedAt` are separate clocks, so the PRs of a release
+# are looked up this far beyond its tags' commit times and then picked by merge commit
+MERGE_TIME_SLACK: Final[dt.timedelta] = dt.timedelta(hours=1)
+
+# Rows read at once when streaming PRs out of the ledger
+_FETCH_SIZE: Final[int] = 1000
+
+_SCHEMA: Final[str] = """
+CREATE TABLE IF NOT EXISTS pull_requests (
+    repo TEXT NOT NULL,
+    number INTEGER NOT NULL,
+    base_ref TEXT NOT NULL,
+    title TEXT NOT NULL,
+    merged_at TEXT NOT NULL,
+    author TEXT NOT NULL,
+    merge_sha TEXT,
+    labels TEXT NOT NULL,
+    PRIMARY KEY (repo, number)
+);
+CREATE INDEX IF NOT EXISTS pull_requests_merged_at
+    ON pull_requests (repo, base_ref, merged_at);
+CREATE TABLE IF NOT EXISTS cursors (
+    repo TEXT NOT NULL,
+    base_ref TEXT NOT NULL,
+    synced_from TEXT NOT NULL,
+    synced_until TEXT NOT NULL,
+    PRIMARY KEY (repo, base_ref)
+);
+"""
+
+
+class SyncResult(NamedTuple):
+    synced_from: dt.datetime
+    synced_until: dt.datetime
+    pull_requests: int
+    windows: int
+
+
+class PrLedger:
+    """
+    Local SQLite record of the PRs merged into each trunk, kept up to date incrementally.
+
+    The ledger lives in `.git/ge_releaser/ledger.sqlite`. Every trunk has a cursor marking how
+    far it has been synced, so a sync only searches GitHub for what was merged since, and the
+    PRs of a release range come from an indexed query instead of the API.
+    """
+
+    def __init__(self, path: str) -> None:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._path = path
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        columns = {
+            row[1] for row in self._db.execute("PRAGMA table_info(pull_requests)")
+        }
+        if columns and "labels" not in columns:
+            # The ledger is only a copy of what GitHub has, so it is simply synced again
+            LOGGER.warning(f"Rebuilding {path}, which was created without PR labels")
+            self._db.executescript("DROP TABLE pull_requests; DROP TABLE cursors;")
+        self._db.executescript(_SCHEMA)
+
+    @classmethod
+    def open(cls, git: GitService) -> "PrLedger":
+        return cls(os.path.join(git.state_dir, LEDGER_FILE))
+
+    @property
+    def path(self) -> str:
+        return self._path
+
+    def synced_range(
+        self, repo: str, base_ref: str
+    ) -> Optional[Tuple[dt.datetime, dt.datetime]]:
+        with self._lock:
+            row = self._db.execute(
+                "SELECT synced_from, synced_until FROM cursors WHERE repo = ? AND base_ref = ?",
+                (repo, base_ref),
+            ).fetchone()
+        if row is None:
+            return None
+        return parse_github_timestamp(row[0]), parse_github_timestamp(row[1])
+
+    def sync(
+        self,
+        git: GitService,
+        since: Optional[dt.datetime] = None,
+        until: Optional[dt.datetime] = None,
+    ) -> SyncResult:
+        """
+        Fetch the PRs merged into `git`'s trunk since the last sync, up to `until` (now by
+        default), and advance the cursor.
+
+        `since` is where a trunk that was never synced starts; for one that was, an earlier
+        `since` also backfills the gap before what the ledger already covers.
+        """
+        if until is None:
+            until = dt.datetime.now(dt.timezone.utc).replace(tzinfo=None, microsecond=0)
+
+        synced = self.synced_range(git.repo_name, git.trunk)
+        ranges: List[Tuple[dt.datetime, dt.datetime]] = []
+        if synced is None:
+            if since is None:
+                raise ValueError(
+                    f"{git.repo_name}@{git.trunk} was never synced; pass a date to start from"
+                )
+            synced_from = since
+            ranges.append((since, until))
+        else:
+            synced_from, synced_until = synced
+            if since is not None and since < synced_from:
+                ranges.append((since, synced_from))
+                synced_from = since
+            ranges.append((synced_until - SYNC_OVERLAP, until))
+
+        rows: List[Tuple[str, int, str, str, str, str, Optional[str], str]] = []
+        windows = 0
+        for range_start, range_end in ranges:
+            for start, end, count in git.search_windows(range_start, range_end):
+                windows += 1
+                if count == 0:
+                    continue
+                for pr, merge_sha in git.search_merged_prs(start, end):
+                    rows.append(
+                        (
+                            git.repo_name,
+                            pr["number"],
+                            pr["base_ref"],
+                            pr["title"],
+                            format_github_timestamp(pr["merged_at"]),
+                            pr["author"],
+                            merge_sha,
+                            "\n".join(pr["labels"]),
+                        )
+                    )
+
+        with self._lock, self._db:
+            self._db.executemany(
+                "INSERT OR REPLACE INTO pull_requests VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                rows,
+            )
+            self._db.execute(
+                "INSERT OR REPLACE INTO cursors VALUES (?, ?, ?, ?)",
+                (
+                    git.repo_name,
+                    git.trunk,
+                    format_github_timestamp(synced_from),
+                    format_github_timestamp(until),
+                ),
+            )
+        LOGGER.info(f"synced {len(rows)} PRs in {ranges}")
+        return SyncResult(
+            synced_from=synced_from,
+            synced_until=until,
+            pull_requests=len(rows),
+            windows=windows,
+        )
+
+    def merged_between(
+        self, repo: str, base_ref: str, after: dt.datetime, until: dt.datetime
+    ) -> List[PullRequestSnapshot]:
+        """
+        PRs merged into `base_ref` after `after` and no later than `until`, newest first.
+        """
+        return list(self.iter_merged_between(repo, base_ref, after, until))
+
+    def iter_merged_between(
+        self, repo: str, base_ref: str, after: dt.datetime, until: dt.datetime
+    ) -> Generator[PullRequestSnapshot, None, None]:
+        """
+        Like `merged_between`, but reads the rows a batch at a time as they are consumed.
+        """
+        for pr, _ in self.iter_merges_between(repo, base_ref, after, until):
+            yield pr
+
+    def iter_merges_between(
+        self, repo: str, base_ref: str, after: dt.datetime, until: dt.datetime
+    ) -> Generator[Tuple[PullRequestSnapshot, Optional[str]], None, None]:
+        """
+        Like `iter_merged_between`, along with the SHA of each PR's merge commit.
+        """
+        with self._lock:
+            cursor = self._db.execute(
+                """
+                SELECT number, title, merged_at, author, base_ref, labels, merge_sha
+                FROM pull_requests
+                WHERE repo = ? AND base_ref = ? AND merged_at > ? AND merged_at <= ?
+                ORDER BY merged_at DESC
+                """,
+                (
+                    repo,
+                    base_ref,
+                    format_github_timestamp(after),
+                    format_github_timestamp(until),
+                ),
+            )
+        while True:
+            with self._lock:
+                rows = cursor.fetchmany(_FETCH_SIZE)
+            if not rows:
+                return
+            for number, title, merged_at, author, base_ref, labels, merge_sha in rows:
+                pr = PullRequestSnapshot(
+                    number=number,
+                    title=title,
+                    merged_at=parse_github_timestamp(merged_at),
+                    author=author,
+                    base_ref=base_ref,
+                    labels=labels.split("\n") if labels else [],
+                )
+                yield pr, merge_sha
@@ -0,0 +1,99 @@
+import collections
+import datetime as dt
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Deque, Dict, Generator, Iterable, List, TypedDict
+
+from github.PullRequest import PullRequest
+
+GHOST_USER = "ghost"
+
+
+class PullRequestSnapshot(TypedDict):
+    """
+    The handful of PR fields the changelog needs, independent of how they were fetched.
+    """
+
+    number: int
+    title: str
+    merged_at: dt.datetime
+    author: str
+    base_ref: str
+    labels: List[str]
+
+
+def snapshot_from_pr(pr: PullRequest) -> PullRequestSnapshot:
+    return PullRequestSnapshot(
+        number=pr.number,
+        title=pr.title,
+        merged_at=pr.merged_at,
+        author=pr.user.login if pr.user else GHOST_USER,
+        base_ref=pr.base.ref,
+        labels=[label.name for label in pr.labels],
+    )
+
+
+def parse_github_timestamp(timestamp: str) -> dt.datetime:
+    """
+    Parse a GraphQL `DateTime` into the naive UTC datetime PyGithub hands out for REST fields.
+    """
+    return dt.datetime.strptime(timestamp, "%Y-%m-%dT%H:%M:%SZ")
+
+
+def format_github_timestamp(timestamp: dt.datetime) -> str:
+    return timestamp.strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+def datetime_from_epoch(timestamp: int) -> dt.datetime:
+    """
+    Convert a Unix timestamp (i.e. a git commit time) into a naive UTC datetime.
+    """
+    return dt.datetime.fromtimestamp(timestamp, dt.timezone.utc).replace(tzinfo=None)
+
+
+def epoch_from_datetime(timestamp: dt.datetime) -> int:
+    return int(timestamp.replace(tzinfo=dt.timezone.utc).timestamp())
+
+
+def snapshot_to_json(pr: PullRequestSnapshot) -> Dict[str, Any]:
+    return {**pr, "merged_at": pr["merged_at"].isoformat()}
+
+
+def snapshot_from_json(data: Dict[str, Any]) -> PullRequestSnapshot:
+    return PullRequestSnapshot(
+        number=data["number"],
+        title=data["title"],
+        merged_at=dt.datetime.fromisoformat(data["merged_at"]),
+        author=data["author"],
+        base_ref=data["base_ref"],
+        # Journals written before labels were collected don't have them
+        labels=data.get("labels", []),
+    )
+
+
+def fetch_snapshots(
+    pull_requests: Iterable[PullRequest],
+    workers: int,
+    before_fetch: Callable[[], None],
+) -> Generator[PullRequestSnapshot, None, None]:
+    """
+    Resolve the snapshot fields of many PRs concurrently.
+
+    Reading a field PyGithub hasn't loaded yet costs a round-trip, so these are spread over a
+    bounded pool. `before_fetch` runs ahead of each PR (i.e. to back off near the rate limit).
+    Results come back in input order regardless of completion order. At most `2 * workers`
+    PRs are in flight, so a lazy `pull_requests` is only read as fast as snapshots are consumed
+    and each PR object can be dropped as soon as its snapshot is out.
+    """
+
+    def _fetch(pr: PullRequest) -> PullRequestSnapshot:
+        before_fetch()
+        return snapshot_from_pr(pr)
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        pending: Deque["Future[PullRequestSnapshot]"] = collections.deque()
+        for pr in pull_requests:
+            pending.append(executor.submit(_fetch, pr))
+            if len(pending) >= 2 * workers:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
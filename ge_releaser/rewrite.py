@@ -0,0 +1,155 @@
+import difflib
+import os
+import re
+import tempfile
+from typing import Dict, Final, List, NamedTuple, Sequence
+
+from ge_releaser.constants import GxFile
+
+
+class VersionTarget(NamedTuple):
+    """
+    A version string to bump in one file.
+
+    `pattern` must match exactly once and capture the version in a group named `version`;
+    `{last_version}` is replaced with the escaped previous release before compiling.
+    """
+
+    path: GxFile
+    description: str
+    pattern: str
+
+
+VERSION_TARGETS: Final[List[VersionTarget]] = [
+    # 0.18.8
+    VersionTarget(
+        path=GxFile.DEPLOYMENT_VERSION,
+        description="deployment version file",
+        pattern=r"\A(?P<version>\S+)\s*\Z",
+    ),
+    # export default {
+    #   release_version: 'great_expectations, version 0.15.48',
+    #   min_python: 'Python 3.7',
+    #   max_python: 'Python 3.10'
+    # }
+    VersionTarget(
+        path=GxFile.DOCS_DATA_COMPONENT,
+        description="version in docs data component",
+        pattern=r"""release_version:\s*['"]great_expectations, version (?P<version>{last_version})['"]""",
+    ),
+    # versions: {
+    #     current: {
+    #       label: '0.16.6',
+    #       path: ''
+    #     }
+    #   }
+    VersionTarget(
+        path=GxFile.DOCS_CONFIG,
+        description="version in docs version dropdown",
+        pattern=r"""current:\s*\{\s*label:\s*['"](?P<version>{last_version})['"]""",
+    ),
+]
+
+
+class FileEdit(NamedTuple):
+    path: str
+    original: str
+    updated: str
+
+
+def stage_version_rewrites(
+    last_version: str,
+    release_version: str,
+    targets: Sequence[VersionTarget] = VERSION_TARGETS,
+    root: str = "",
+) -> List[FileEdit]:
+    """
+    Apply every target in memory, reading each file (relative to `root`) once; nothing is
+    written to disk.
+    """
+    contents: Dict[str, str] = {}
+    originals: Dict[str, str] = {}
+    for target in targets:
+        path = os.path.join(root, target.path.value)
+        if path not in contents:
+            with open(path) as f:
+                originals[path] = contents[path] = f.read()
+
+        pattern = re.compile(
+            target.pattern.replace("{last_version}", re.escape(last_version))
+        )
+        matches = list(pattern.finditer(contents[path]))
+        if len(matches) != 1:
+            raise ValueError(
+                f"Expected exactly one match for the {target.description} in {path}, found {len(matches)}"
+            )
+
+        match = matches[0]
+        start, end = match.span("version")
+        contents[path] = contents[path][:start] + release_version + contents[path][end:]
+
+    return [
+        FileEdit(path=path, original=originals[path], updated=updated)
+        for path, updated in contents.items()
+        if updated != originals[path]
+    ]
+
+
+def render_diff(edits: Sequence[FileEdit]) -> str:
+    return "".join(
+        "".join(
+            difflib.unified_diff(
+                edit.original.splitlines(keepends=True),
+                edit.updated.splitlines(keepends=True),
+                fromfile=f"a/{edit.path}",
+                tofile=f"b/{edit.path}",
+            )
+        )
+        for edit in edits
+    )
+
+
+def apply_edits(edits: Sequence[FileEdit]) -> None:
+    """
+    Write all edits or none of them.
+
+    Every new file is first written and fsynced next to its target; only then are they renamed
+    into place. If a rename fails, the files already replaced are restored.
+    """
+    staged: List[str] = []
+    try:
+        for edit in edits:
+            staged.append(_write_temp(edit.path, edit.updated))
+    except BaseException:
+        for tmp_path in staged:
+            os.unlink(tmp_path)
+        raise
+
+    replaced: List[FileEdit] = []
+    try:
+        for edit, tmp_path in zip(edits, staged):
+            os.replace(tmp_path, edit.path)
+            replaced.append(edit)
+    except BaseException:
+        for edit in replaced:
+            os.replace(_write_temp(edit.path, edit.original), edit.path)
+        for tmp_path in staged[len(replaced) :]:
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+        raise
+
+
+def _write_temp(path: str, contents: str) -> str:
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=f".{os.path.basename(path)}.")
+    try:
+        with os.fdopen(fd, "w") as f:
+            f.write(contents)
+            f.flush()
+            os.fsync(f.fileno())
+        if os.path.exists(path):
+            os.chmod(tmp_path, os.stat(path).st_mode)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+    return tmp_path
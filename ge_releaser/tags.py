@@ -0,0 +1,222 @@
+import heapq
+import json
+import logging
+import os
+import tempfile
+from typing import Dict, Final, Iterable, List, NamedTuple, Optional, Tuple
+
+import git
+from packaging import version
+
+from ge_releaser.constants import RELEASER_STATE_DIR
+
+LOGGER: Final[logging.Logger] = logging.getLogger(__name__)
+
+TAG_INDEX_FILE: Final[str] = "tags.json"
+TAG_INDEX_FORMAT: Final[int] = 1
+
+# Number of commits resolved per `git log --no-walk` invocation when (re)building the index
+_RESOLVE_BATCH_SIZE: Final[int] = 500
+
+Fingerprint = List[Tuple[str, int, int]]
+
+
+class IndexedTag(NamedTuple):
+    name: str
+    sha: str
+    timestamp: int
+    version: Optional[version.Version]
+
+    def sort_key(self) -> Tuple[int, version.Version]:
+        # Tags on the same commit (i.e. an rc and its final release) are ordered by version
+        return self.timestamp, self.version or _NO_VERSION
+
+
+_NO_VERSION: Final[version.Version] = version.Version("0")
+
+
+def _parse_version(name: str) -> Optional[version.Version]:
+    try:
+        return version.Version(name)
+    except version.InvalidVersion:
+        return None
+
+
+class TagIndex:
+    """
+    On-disk index of tag name -> (commit timestamp, version).
+
+    The index lives in `.git/ge_releaser/tags.json` and is fingerprinted against `packed-refs`
+    and the `refs/tags` directories; when either changes, only new or moved tags have their
+    commits resolved. Queries never touch commit objects.
+    """
+
+    def __init__(self, repo: git.Repo) -> None:
+        self._repo = repo
+        self._common_dir = repo.common_dir
+        self._path = os.path.join(repo.common_dir, RELEASER_STATE_DIR, TAG_INDEX_FILE)
+        self._tags: Optional[Dict[str, IndexedTag]] = None
+
+    @property
+    def tags(self) -> Dict[str, IndexedTag]:
+        if self._tags is None:
+            self._tags = self._load_or_refresh()
+        return self._tags
+
+    def get(self, name: str) -> Optional[IndexedTag]:
+        return self.tags.get(name)
+
+    def sorted(self, reverse: bool = False) -> List[IndexedTag]:
+        return sorted(self.tags.values(), key=IndexedTag.sort_key, reverse=reverse)
+
+    def latest(self, prefix_filter: str = "", limit: int = 1) -> List[IndexedTag]:
+        """
+        Return the `limit` most recently committed tags whose name starts with `prefix_filter`.
+        """
+        if limit < 1:
+            raise ValueError("Limit must be greater than 0")
+        candidates = (t for t in self.tags.values() if t.name.startswith(prefix_filter))
+        return heapq.nlargest(limit, candidates, key=IndexedTag.sort_key)
+
+    def previous_release(
+        self, release_version: str, include_prereleases: bool = False
+    ) -> Optional[IndexedTag]:
+        """
+        Return the tag with the highest version strictly lower than `release_version`.
+        """
+        target = version.Version(release_version)
+        previous: Optional[IndexedTag] = None
+        for tag in self.tags.values():
+            if tag.version is None or tag.version >= target:
+                continue
+            if tag.version.is_prerelease and not include_prereleases:
+                continue
+            if previous is None or tag.version > previous.version:
+                previous = tag
+        return previous
+
+    def _load_or_refresh(self) -> Dict[str, IndexedTag]:
+        fingerprint = self._fingerprint()
+        stored_fingerprint, stored = self._read()
+        if stored and stored_fingerprint == fingerprint:
+            LOGGER.info(f"tag index is fresh ({len(stored)} tags)")
+            return stored
+
+        tags = self._refresh(stored)
+        self._write(fingerprint, tags)
+        return tags
+
+    def _fingerprint(self) -> Fingerprint:
+        """
+        Cheap stat-only summary of the tag refs.
+
+        Git updates refs through lockfile renames, so any tag creation, deletion or move
+        changes the mtime of `packed-refs` or of a directory under `refs/tags`.
+        """
+        fingerprint: Fingerprint = []
+        packed_refs = os.path.join(self._common_dir, "packed-refs")
+        if os.path.exists(packed_refs):
+            st = os.stat(packed_refs)
+            fingerprint.append(("packed-refs", st.st_mtime_ns, st.st_size))
+
+        refs_root = os.path.join(self._common_dir, "refs", "tags")
+        for dirpath, _, filenames in os.walk(refs_root):
+            st = os.stat(dirpath)
+            rel = os.path.relpath(dirpath, self._common_dir)
+            fingerprint.append((rel, st.st_mtime_ns, len(filenames)))
+
+        return sorted(fingerprint)
+
+    def _refresh(self, stored: Dict[str, IndexedTag]) -> Dict[str, IndexedTag]:
+        refs = self._repo.git.for_each_ref(
+            "--format=%(refname:strip=2) %(objectname) %(*objectname)", "refs/tags"
+        )
+
+        tags: Dict[str, IndexedTag] = {}
+        unresolved: Dict[str, Tuple[str, str]] = {}
+        for line in refs.splitlines():
+            name, sha, *peeled = line.split(" ")
+            existing = stored.get(name)
+            if existing is not None and existing.sha == sha:
+                tags[name] = existing
+            else:
+                # Annotated tags peel to their commit; lightweight tags point at it directly
+                unresolved[name] = (sha, peeled[0] if peeled and peeled[0] else sha)
+
+        LOGGER.info(
+            f"refreshing tag index: {len(tags)} unchanged, {len(unresolved)} to resolve"
+        )
+        timestamps = self._resolve_timestamps(c for _, c in unresolved.values())
+        for name, (sha, commit) in unresolved.items():
+            if commit not in timestamps:
+                LOGGER.debug(f"skipping tag {name}; it does not point at a commit")
+                continue
+            tags[name] = IndexedTag(
+                name=name,
+                sha=sha,
+                timestamp=timestamps[commit],
+                version=_parse_version(name),
+            )
+
+        return tags
+
+    def _resolve_timestamps(self, commits: Iterable[str]) -> Dict[str, int]:
+        unique = sorted(set(commits))
+        timestamps: Dict[str, int] = {}
+        for i in range(0, len(unique), _RESOLVE_BATCH_SIZE):
+            batch = unique[i : i + _RESOLVE_BATCH_SIZE]
+            try:
+                output = self._repo.git.log(
+                    "--no-walk=unsorted", "--format=%H %ct", *batch
+                )
+            except git.GitCommandError:
+                # A batch containing a non-commit object fails as a whole; fall back per commit
+                output = "\n".join(self._resolve_one(c) for c in batch)
+            for line in output.splitlines():
+                if line:
+                    sha, timestamp = line.split(" ")
+                    timestamps[sha] = int(timestamp)
+        return timestamps
+
+    def _resolve_one(self, commit: str) -> str:
+        try:
+            return self._repo.git.log("--no-walk", "--format=%H %ct", commit)
+        except git.GitCommandError:
+            return ""
+
+    def _read(self) -> Tuple[Optional[Fingerprint], Dict[str, IndexedTag]]:
+        try:
+            with open(self._path) as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return None, {}
+
+        if data.get("format") != TAG_INDEX_FORMAT:
+            return None, {}
+
+        fingerprint = [tuple(entry) for entry in data["fingerprint"]]
+        tags = {
+            name: IndexedTag(
+                name=name, sha=sha, timestamp=timestamp, version=_parse_version(name)
+            )
+            for name, (sha, timestamp) in data["tags"].items()
+        }
+        return fingerprint, tags
+
+    def _write(self, fingerprint: Fingerprint, tags: Dict[str, IndexedTag]) -> None:
+        data = {
+            "format": TAG_INDEX_FORMAT,
+            "fingerprint": fingerprint,
+            "tags": {name: [t.sha, t.timestamp] for name, t in tags.items()},
+        }
+        directory = os.path.dirname(self._path)
+        os.makedirs(directory, exist_ok=True)
+        # Worktrees share the index, so concurrent writers each need their own temp file
+        fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=f".{TAG_INDEX_FILE}.")
+        try:
+            with os.fdopen(fd, "w") as f:
+                json.dump(data, f)
+            os.replace(tmp_path, self._path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
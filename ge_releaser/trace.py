@@ -0,0 +1,207 @@
+import contextlib
+import datetime as dt
+import functools
+import inspect
+import itertools
+import json
+import os
+import sys
+import threading
+import time
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Final,
+    Generator,
+    Iterator,
+    List,
+    Optional,
+    TypeVar,
+    cast,
+)
+
+from ge_releaser.constants import RELEASER_LOCAL_VERSION
+
+TRACE_FORMAT: Final[int] = 1
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+
+class Span:
+    __slots__ = ("id", "parent", "name", "thread", "start", "end", "attrs", "error")
+
+    def __init__(
+        self, id: int, parent: Optional[int], name: str, attrs: Dict[str, Any]
+    ) -> None:
+        self.id = id
+        self.parent = parent
+        self.name = name
+        self.thread = threading.current_thread().name
+        self.start = time.perf_counter()
+        self.end: Optional[float] = None
+        self.attrs = attrs
+        self.error: Optional[str] = None
+
+    def set(self, **attrs: Any) -> None:
+        self.attrs.update(attrs)
+
+
+class Tracer:
+    """
+    Collects timed spans and counters for one command run.
+
+    Spans nest under the innermost open span of the same thread; work handed to another thread
+    passes `parent=tracer.current()` explicitly. While disabled, every call is a cheap no-op.
+    """
+
+    def __init__(self) -> None:
+        self.enabled = False
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._ids = itertools.count(1)
+        self._spans: List[Span] = []
+        self._counters: Dict[str, float] = {}
+        self._minimums: Dict[str, float] = {}
+        self._origin = time.perf_counter()
+        self._started_at = dt.datetime.now(dt.timezone.utc)
+
+    def enable(self) -> None:
+        self.enabled = True
+        self._origin = time.perf_counter()
+        self._started_at = dt.datetime.now(dt.timezone.utc)
+
+    def current(self) -> Optional[int]:
+        stack: List[int] = getattr(self._local, "stack", [])
+        return stack[-1] if stack else None
+
+    @contextlib.contextmanager
+    def span(
+        self, name: str, parent: Optional[int] = None, **attrs: Any
+    ) -> Iterator[Optional[Span]]:
+        if not self.enabled:
+            yield None
+            return
+
+        if not hasattr(self._local, "stack"):
+            self._local.stack = []
+        stack: List[int] = self._local.stack
+        span = Span(
+            next(self._ids),
+            parent if parent is not None else self.current(),
+            name,
+            attrs,
+        )
+        stack.append(span.id)
+        try:
+            yield span
+        except BaseException as e:
+            span.error = repr(e)
+            raise
+        finally:
+            span.end = time.perf_counter()
+            # An abandoned generator's span may close late, after spans opened above it
+            stack.remove(span.id)
+            with self._lock:
+                self._spans.append(span)
+
+    def count(self, name: str, value: float = 1) -> None:
+        if not self.enabled:
+            return
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + value
+
+    def observe_min(self, name: str, value: float) -> None:
+        """
+        Keep the lowest value seen for `name`, i.e. the least rate-limit headroom.
+        """
+        if not self.enabled:
+            return
+        with self._lock:
+            self._minimums[name] = min(value, self._minimums.get(name, value))
+
+    def to_dict(self, command: Optional[str] = None) -> Dict[str, Any]:
+        with self._lock:
+            spans = sorted(self._spans, key=lambda s: s.start)
+            counters = dict(self._counters)
+            minimums = dict(self._minimums)
+
+        totals: Dict[str, Dict[str, float]] = {}
+        for span in spans:
+            total = totals.setdefault(span.name, {"count": 0, "seconds": 0.0})
+            total["count"] += 1
+            total["seconds"] += (span.end or span.start) - span.start
+
+        return {
+            "format": TRACE_FORMAT,
+            "command": command,
+            "releaser_version": _releaser_version(),
+            "argv": sys.argv[1:],
+            "started_at": self._started_at.isoformat(),
+            "duration": time.perf_counter() - self._origin,
+            "counters": counters,
+            "minimums": minimums,
+            "totals": totals,
+            "spans": [
+                {
+                    "id": span.id,
+                    "parent": span.parent,
+                    "name": span.name,
+                    "thread": span.thread,
+                    "start": span.start - self._origin,
+                    "duration": (span.end or span.start) - span.start,
+                    "attrs": span.attrs,
+                    "error": span.error,
+                }
+                for span in spans
+            ],
+        }
+
+    def write(self, path: str, command: Optional[str] = None) -> None:
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        with open(path, "w") as f:
+            json.dump(self.to_dict(command), f, indent=2, default=str)
+            f.write("\n")
+
+
+def _releaser_version() -> Optional[str]:
+    try:
+        with open(RELEASER_LOCAL_VERSION) as f:
+            return f.read().strip()
+    except OSError:
+        return None
+
+
+TRACER: Final[Tracer] = Tracer()
+
+
+def traced(name: Optional[str] = None) -> Callable[[F], F]:
+    """
+    Record a span for every call of the decorated function, named after its qualified name.
+
+    For generator functions, the span covers the iteration rather than the (instant) call.
+    """
+
+    def decorator(f: F) -> F:
+        span_name = name or f.__qualname__
+
+        if inspect.isgeneratorfunction(f):
+
+            @functools.wraps(f)
+            def gen_wrapper(*args: Any, **kwargs: Any) -> Generator[Any, Any, Any]:
+                with TRACER.span(span_name):
+                    return (yield from f(*args, **kwargs))
+
+            return cast(F, gen_wrapper)
+
+        @functools.wraps(f)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            if not TRACER.enabled:
+                return f(*args, **kwargs)
+            with TRACER.span(span_name):
+                return f(*args, **kwargs)
+
+        return cast(F, wrapper)
+
+    return decorator
@@ -0,0 +1,238 @@
+import logging
+import random
+import threading
+import time
+from typing import Any, Dict, Final, FrozenSet, Mapping, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from ge_releaser.constants import (
+    HTTP_BACKOFF_BASE,
+    HTTP_BACKOFF_CAP,
+    HTTP_MAX_RETRIES,
+    HTTP_MAX_RETRY_WAIT,
+    HTTP_POOL_SIZE,
+    RATE_LIMIT_BURST,
+    RATE_LIMIT_PACING_FRACTION,
+)
+from ge_releaser.trace import TRACER
+
+LOGGER: Final[logging.Logger] = logging.getLogger(__name__)
+
+# Methods that are safe to send again after a server error or a dropped connection
+IDEMPOTENT_METHODS: Final[FrozenSet[str]] = frozenset(
+    ("GET", "HEAD", "OPTIONS", "PUT", "DELETE")
+)
+RETRY_STATUSES: Final[FrozenSet[int]] = frozenset((500, 502, 503, 504))
+
+
+class RateLimitBucket:
+    """
+    Token bucket pacing the requests made against one rate-limit window (e.g. GitHub's `core`).
+
+    It doesn't get in the way while plenty of the window is left. Once less than
+    `pacing_fraction` of it remains, tokens refill at the rate that spreads the remaining
+    requests evenly until the reset, so a long run slows down instead of stalling at the limit.
+    An exhausted window blocks everyone until it resets.
+    """
+
+    def __init__(
+        self,
+        burst: int = RATE_LIMIT_BURST,
+        pacing_fraction: float = RATE_LIMIT_PACING_FRACTION,
+    ) -> None:
+        self._burst = burst
+        self._pacing_fraction = pacing_fraction
+        self._lock = threading.Lock()
+        # Tokens per second; None while the bucket isn't pacing
+        self._rate: Optional[float] = None
+        self._tokens = float(burst)
+        self._refilled_at = time.monotonic()
+        self._blocked_until = 0.0
+
+    @property
+    def rate(self) -> Optional[float]:
+        return self._rate
+
+    def acquire(self) -> float:
+        """
+        Take a token, sleeping until one is available; returns the seconds spent waiting.
+        """
+        with self._lock:
+            now = time.monotonic()
+            if now < self._blocked_until:
+                wait = self._blocked_until - now
+            elif self._rate is None:
+                return 0.0
+            else:
+                self._refill(now)
+                # Reserve the token now so concurrent callers queue up behind each other
+                self._tokens -= 1
+                wait = max(-self._tokens / self._rate, 0.0)
+
+        if wait > 0:
+            LOGGER.debug(f"pacing request for {wait:.2f}s")
+            time.sleep(wait)
+        return wait
+
+    def update(self, limit: int, remaining: int, reset_at: float) -> None:
+        """
+        Adjust the pace to the `X-RateLimit-*` headers of a response (`reset_at` is epoch seconds).
+        """
+        with self._lock:
+            now = time.monotonic()
+            reset_in = max(reset_at - time.time(), 1.0)
+            if self._rate is not None:
+                self._refill(now)
+
+            if remaining <= 0:
+                LOGGER.warning(
+                    f"Rate limit exhausted; waiting {reset_in:.0f}s for reset"
+                )
+                self._blocked_until = now + reset_in
+                self._rate = None
+                self._tokens = float(self._burst)
+            elif remaining > limit * self._pacing_fraction:
+                self._rate = None
+            else:
+                if self._rate is None:
+                    self._tokens = float(self._burst)
+                    self._refilled_at = now
+                self._rate = remaining / reset_in
+
+    def _refill(self, now: float) -> None:
+        assert self._rate is not None
+        elapsed = now - self._refilled_at
+        self._tokens = min(self._tokens + elapsed * self._rate, float(self._burst))
+        self._refilled_at = now
+
+
+class Transport:
+    """
+    HTTP client shared by PyGithub (through `CachingConnection`) and the releaser's own requests.
+
+    All requests go through one `requests.Session` with a keep-alive connection pool. Server
+    errors and dropped connections are retried with jittered exponential backoff for
+    idempotent requests, and rate-limit rejections (429s, GitHub's secondary rate limit) are
+    retried for any request once the server-specified wait is over.
+    """
+
+    def __init__(
+        self,
+        pool_size: int = HTTP_POOL_SIZE,
+        max_retries: int = HTTP_MAX_RETRIES,
+        backoff_base: float = HTTP_BACKOFF_BASE,
+        backoff_cap: float = HTTP_BACKOFF_CAP,
+    ) -> None:
+        self._max_retries = max_retries
+        self._backoff_base = backoff_base
+        self._backoff_cap = backoff_cap
+        self._session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self._session.mount("https://", adapter)
+        self._session.mount("http://", adapter)
+        self._buckets: Dict[str, RateLimitBucket] = {}
+        self._buckets_lock = threading.Lock()
+
+    def bucket(self, name: str) -> RateLimitBucket:
+        with self._buckets_lock:
+            return self._buckets.setdefault(name, RateLimitBucket())
+
+    def request(
+        self,
+        method: str,
+        url: str,
+        rate_limit: Optional[str] = None,
+        retry_unsafe: bool = False,
+        **kwargs: Any,
+    ) -> requests.Response:
+        """
+        Send a request, retrying transient failures.
+
+        `rate_limit` names the bucket that paces the request and is fed the response's
+        rate-limit headers. `retry_unsafe` also retries server errors for non-idempotent
+        methods, for requests that are known to be read-only (e.g. GraphQL queries).
+        """
+        retryable = retry_unsafe or method.upper() in IDEMPOTENT_METHODS
+        bucket = self.bucket(rate_limit) if rate_limit is not None else None
+
+        attempt = 0
+        while True:
+            if bucket is not None:
+                waited = bucket.acquire()
+                if waited:
+                    TRACER.count("http.throttle_seconds", waited)
+
+            try:
+                response = self._session.request(method, url, **kwargs)
+            except (requests.ConnectionError, requests.Timeout) as e:
+                if not retryable or attempt >= self._max_retries:
+                    raise
+                delay = self._backoff(attempt)
+                reason = type(e).__name__
+            else:
+                if bucket is not None:
+                    _update_bucket(bucket, response.headers)
+                retry_delay = self._retry_delay(response, attempt, retryable)
+                if retry_delay is None or attempt >= self._max_retries:
+                    return response
+                delay = retry_delay
+                reason = str(response.status_code)
+
+            attempt += 1
+            LOGGER.info(
+                f"{method} {url} failed ({reason}); retry {attempt}/{self._max_retries} in {delay:.1f}s"
+            )
+            TRACER.count("http.retries")
+            time.sleep(delay)
+
+    def _retry_delay(
+        self, response: requests.Response, attempt: int, retryable: bool
+    ) -> Optional[float]:
+        status = response.status_code
+        if status == 429 or (status == 403 and _is_rate_limited(response)):
+            # The request was turned away rather than processed, so it is always safe to resend
+            retry_after = response.headers.get("Retry-After")
+            if retry_after is not None and retry_after.isdigit():
+                delay = float(retry_after)
+            elif response.headers.get("X-RateLimit-Remaining") == "0":
+                # The bucket holds everyone back until the reset
+                delay = max(
+                    float(response.headers.get("X-RateLimit-Reset", 0)) - time.time(),
+                    0.0,
+                )
+                return 0.0 if delay <= HTTP_MAX_RETRY_WAIT else None
+            else:
+                delay = self._backoff(attempt)
+            return delay if delay <= HTTP_MAX_RETRY_WAIT else None
+        if status in RETRY_STATUSES and retryable:
+            return self._backoff(attempt)
+        return None
+
+    def _backoff(self, attempt: int) -> float:
+        # "Equal jitter": half the exponential delay, plus a random share of the other half
+        delay = min(self._backoff_cap, self._backoff_base * 2**attempt)
+        return delay / 2 + random.uniform(0, delay / 2)
+
+
+def _is_rate_limited(response: requests.Response) -> bool:
+    if response.headers.get("X-RateLimit-Remaining") == "0":
+        return True
+    if "Retry-After" in response.headers:
+        return True
+    return "rate limit" in response.text.lower()
+
+
+def _update_bucket(bucket: RateLimitBucket, headers: Mapping[str, str]) -> None:
+    try:
+        limit = int(headers["X-RateLimit-Limit"])
+        remaining = int(headers["X-RateLimit-Remaining"])
+        reset_at = float(headers["X-RateLimit-Reset"])
+    except (KeyError, ValueError):
+        return
+    bucket.update(limit, remaining, reset_at)
+
+
+# One pool and one set of rate-limit buckets for the whole process
+TRANSPORT: Final[Transport] = Transport()
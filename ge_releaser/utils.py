@@ -1,7 +1,10 @@
 from __future__ import annotations
 
+import json
 import os
-from typing import Optional
+import threading
+import time
+from typing import Callable, Dict, Optional
 
 import click
 import requests
@@ -9,19 +12,26 @@ from requests.models import HTTPError
 
 from ge_releaser.constants import (
     GITHUB_REPO,
+    PREFLIGHT_TIMEOUT,
     RELEASER_LOCAL_VERSION,
     RELEASER_REMOTE_VERSION,
     REMOTE,
     TRUNK,
+    VERSION_CHECK_CACHE,
+    VERSION_CHECK_TIMEOUT,
+    VERSION_CHECK_TTL,
     GxFile,
 )
 from ge_releaser.git import GitService
+from ge_releaser.http_cache import ResponseCache
+from ge_releaser.trace import TRACER
+from ge_releaser.transport import TRANSPORT
 
 
-def check_if_in_gx_root() -> None:
+def check_if_in_gx_root(root: str = "") -> None:
     nonexistent: list[GxFile] = []
     for constant in GxFile:
-        if not os.path.exists(constant):
+        if not os.path.exists(os.path.join(root, constant.value)):
             nonexistent.append(constant)
     if not (
         len(nonexistent) == 1
@@ -47,15 +57,55 @@ def _get_current_version() -> str:
 
 
 def _get_latest_version() -> str:
-    response = requests.get(RELEASER_REMOTE_VERSION)
+    cached = _read_cached_latest_version()
+    if cached is not None:
+        return cached
+
     try:
+        response = TRANSPORT.request(
+            "GET", RELEASER_REMOTE_VERSION, timeout=VERSION_CHECK_TIMEOUT
+        )
         response.raise_for_status()
-    except HTTPError as e:
+    except (HTTPError, requests.exceptions.RequestException) as e:
         raise ValueError("Could not access remote version of `ge_releaser`") from e
-    return response.text.strip()
 
+    latest_version = response.text.strip()
+    _write_cached_latest_version(latest_version)
+    return latest_version
+
+
+def _read_cached_latest_version() -> Optional[str]:
+    try:
+        with open(VERSION_CHECK_CACHE) as f:
+            cached = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if time.time() - cached.get("fetched_at", 0) > VERSION_CHECK_TTL:
+        return None
+    return cached.get("version")
+
+
+def _write_cached_latest_version(latest_version: str) -> None:
+    try:
+        os.makedirs(os.path.dirname(VERSION_CHECK_CACHE), exist_ok=True)
+        with open(VERSION_CHECK_CACHE, "w") as f:
+            json.dump({"version": latest_version, "fetched_at": time.time()}, f)
+    except OSError:
+        # The cache is an optimization; an unwritable cache dir shouldn't block a release
+        pass
+
+
+def _open_http_cache() -> Optional[ResponseCache]:
+    if os.environ.get("GE_RELEASE_HTTP_CACHE", "1") == "0":
+        return None
+    return ResponseCache.open_default()
+
+
+def setup(needs_github: bool = True, needs_worktree: bool = True) -> GitService:
+    if needs_worktree:
+        # Local and cheap, and the clearest error when run outside of the repo
+        check_if_in_gx_root()
 
-def setup(ctx: click.Context) -> None:
     token: Optional[str] = os.environ.get("GITHUB_TOKEN")
     assert token is not None, "Must set GITHUB_TOKEN environment variable!"
 
@@ -66,14 +116,72 @@ def setup(ctx: click.Context) -> None:
             abort=True,
         )
 
-    check_if_in_gx_root()
-    check_if_using_latest_version()
-
     git = GitService(
         github_token=token,
         repo_name=GITHUB_REPO,
         trunk=trunk_override or TRUNK,
         remote=REMOTE,
+        http_cache=_open_http_cache(),
+    )
+    if needs_worktree:
+        git.verify_no_untracked_files()
+
+    # Only the checks that go over the network are worth overlapping
+    checks: Dict[str, Callable[[], None]] = {
+        "releaser version": check_if_using_latest_version,
+    }
+    if needs_github:
+        checks["github access"] = git.verify_github_access
+    run_preflight_checks(checks)
+
+    return git
+
+
+def run_preflight_checks(
+    checks: Dict[str, Callable[[], None]], timeout: float = PREFLIGHT_TIMEOUT
+) -> None:
+    """
+    Run independent checks concurrently, failing if any raises or all don't finish in `timeout`.
+    """
+    start = time.perf_counter()
+    durations: Dict[str, float] = {}
+    errors: Dict[str, Exception] = {}
+    parent_span = TRACER.current()
+
+    def _timed(name: str, check: Callable[[], None]) -> None:
+        check_start = time.perf_counter()
+        try:
+            with TRACER.span(f"preflight.{name}", parent=parent_span):
+                check()
+        except Exception as e:
+            errors[name] = e
+        finally:
+            durations[name] = time.perf_counter() - check_start
+
+    # Daemon threads, unlike an executor's, don't keep the process alive at exit, so a hung
+    # check can't outlast the error reporting it
+    threads = {
+        name: threading.Thread(
+            target=_timed, args=(name, check), name=f"preflight-{name}", daemon=True
+        )
+        for name, check in checks.items()
+    }
+    for thread in threads.values():
+        thread.start()
+    deadline = start + timeout
+    for thread in threads.values():
+        thread.join(max(deadline - time.perf_counter(), 0))
+
+    slow = [name for name, thread in threads.items() if thread.is_alive()]
+    if slow:
+        raise ValueError(f"Preflight checks did not finish within {timeout}s: {slow}")
+
+    for name in checks:
+        if name in errors:
+            raise errors[name]
+
+    report = ", ".join(f"{name} {durations[name]:.2f}s" for name in checks)
+    click.secho(
+        f"Preflight checks passed in {time.perf_counter() - start:.2f}s ({report})",
+        dim=True,
     )
-    git.verify_no_untracked_files()
-    ctx.obj = git
@@ -0,0 +1,183 @@
+import asyncio
+import logging
+import time
+from typing import Callable, Dict, Final, List, NamedTuple, Optional
+
+from ge_releaser.constants import (
+    PYPI_URL,
+    WAIT_MAX_POLL_INTERVAL,
+    WAIT_POLL_INTERVAL,
+    WAIT_TIMEOUT,
+    ArtifactState,
+)
+from ge_releaser.git import GitService
+from ge_releaser.trace import TRACER
+from ge_releaser.transport import TRANSPORT
+
+LOGGER: Final[logging.Logger] = logging.getLogger(__name__)
+
+_PYPI_TIMEOUT: Final[int] = 10
+
+
+class ProbeResult(NamedTuple):
+    state: ArtifactState
+    detail: str
+
+
+class ActionsRunProbe:
+    """
+    Checks the CI workflow run GitHub started for a pushed release tag.
+    """
+
+    def __init__(self, git: GitService, workflow: str, tag: str) -> None:
+        self._git = git
+        self._workflow = workflow
+        self._tag = tag
+
+    def __call__(self) -> ProbeResult:
+        run = self._git.get_latest_workflow_run(self._workflow, self._tag)
+        if run is None:
+            return ProbeResult(
+                ArtifactState.PENDING, f"no {self._workflow} run for {self._tag} yet"
+            )
+        if run["status"] != "completed":
+            return ProbeResult(
+                ArtifactState.PENDING, f"{run['html_url']} is {run['status']}"
+            )
+        if run["conclusion"] == "success":
+            return ProbeResult(ArtifactState.SUCCEEDED, f"{run['html_url']} passed")
+        return ProbeResult(
+            ArtifactState.FAILED, f"{run['html_url']} concluded {run['conclusion']}"
+        )
+
+
+class PyPIProbe:
+    """
+    Checks whether a release has files on PyPI, with conditional requests against its JSON API.
+    """
+
+    def __init__(self, package: str, version: str, base_url: str = PYPI_URL) -> None:
+        self._url = f"{base_url.rstrip('/')}/pypi/{package}/{version}/json"
+        self._package = package
+        self._version = version
+        self._etag: Optional[str] = None
+        self._last: Optional[ProbeResult] = None
+
+    def __call__(self) -> ProbeResult:
+        headers = {"Accept": "application/json"}
+        if self._etag is not None:
+            headers["If-None-Match"] = self._etag
+        response = TRANSPORT.request(
+            "GET", self._url, headers=headers, timeout=_PYPI_TIMEOUT
+        )
+        if response.status_code == 304 and self._last is not None:
+            TRACER.count("pypi.not_modified")
+            return self._last
+
+        if response.status_code == 404:
+            result = ProbeResult(
+                ArtifactState.PENDING, f"{self._package} {self._version} isn't up yet"
+            )
+        else:
+            response.raise_for_status()
+            files = response.json().get("urls") or []
+            result = (
+                ProbeResult(
+                    ArtifactState.SUCCEEDED,
+                    f"{self._package} {self._version} is up with {len(files)} files",
+                )
+                if files
+                else ProbeResult(
+                    ArtifactState.PENDING,
+                    f"{self._package} {self._version} has no files yet",
+                )
+            )
+        self._etag = response.headers.get("ETag")
+        self._last = result
+        return result
+
+
+Probe = Callable[[], ProbeResult]
+
+
+def wait_for_artifacts(
+    probes: Dict[str, Probe],
+    on_change: Callable[[str, ProbeResult], None],
+    timeout: float = WAIT_TIMEOUT,
+    interval: float = WAIT_POLL_INTERVAL,
+    max_interval: float = WAIT_MAX_POLL_INTERVAL,
+) -> Dict[str, ProbeResult]:
+    """
+    Poll every probe concurrently until all of them succeed, one fails, or `timeout` passes.
+
+    Each probe is polled every `interval` seconds while its result changes, doubling up to
+    `max_interval` while it doesn't. `on_change` gets every new result. Returns the last
+    result of each probe; a probe cut short by another's failure stays pending.
+    """
+    return asyncio.run(_wait_all(probes, on_change, timeout, interval, max_interval))
+
+
+async def _wait_all(
+    probes: Dict[str, Probe],
+    on_change: Callable[[str, ProbeResult], None],
+    timeout: float,
+    interval: float,
+    max_interval: float,
+) -> Dict[str, ProbeResult]:
+    results = {
+        name: ProbeResult(ArtifactState.PENDING, "not checked yet") for name in probes
+    }
+
+    def _record(name: str, result: ProbeResult) -> None:
+        results[name] = result
+        on_change(name, result)
+
+    tasks: List["asyncio.Task[ProbeResult]"] = [
+        asyncio.ensure_future(_poll(name, probe, _record, interval, max_interval))
+        for name, probe in probes.items()
+    ]
+    deadline = time.monotonic() + timeout
+    pending = set(tasks)
+    try:
+        while pending:
+            done, pending = await asyncio.wait(
+                pending,
+                timeout=max(deadline - time.monotonic(), 0),
+                return_when=asyncio.FIRST_COMPLETED,
+            )
+            if not done:
+                raise TimeoutError(f"Still waiting after {timeout:.0f}s")
+            # Re-raises whatever a probe raised
+            if any(task.result().state is ArtifactState.FAILED for task in done):
+                break
+    finally:
+        for task in pending:
+            task.cancel()
+        await asyncio.gather(*pending, return_exceptions=True)
+    return results
+
+
+async def _poll(
+    name: str,
+    probe: Probe,
+    on_change: Callable[[str, ProbeResult], None],
+    interval: float,
+    max_interval: float,
+) -> ProbeResult:
+    loop = asyncio.get_running_loop()
+    last: Optional[ProbeResult] = None
+    delay = interval
+    while True:
+        # Probes make blocking requests through the shared transport
+        result = await loop.run_in_executor(None, probe)
+        TRACER.count(f"wait.{name.lower()}.polls")
+        if result != last:
+            on_change(name, result)
+            last = result
+            delay = interval
+        else:
+            delay = min(delay * 2, max_interval)
+        if result.state is not ArtifactState.PENDING:
+            return result
+        LOGGER.debug(f"{name}: polling again in {delay:.0f}s")
+        await asyncio.sleep(delay)
@@ -0,0 +1,117 @@
+import pathlib
+
+import pytest
+
+from ge_releaser.changelog_io import ChangelogFile
+
+CHANGELOG = """\
+# Changelog
+
+### 1.2.0
+* [FEATURE] Newest
+* [BUGFIX] Also newest
+
+### 1.1.10 (yanked)
+* [BUGFIX] Yanked
+
+### 1.1.9
+* [DOCS] Oldest
+"""
+
+
+@pytest.fixture
+def changelog(tmp_path: pathlib.Path) -> ChangelogFile:
+    path = tmp_path / "changelog.md"
+    path.write_text(CHANGELOG)
+    return ChangelogFile(str(path))
+
+
+def _read(changelog: ChangelogFile) -> str:
+    return pathlib.Path(changelog.path).read_text()
+
+
+def test_sections_are_found_by_byte_offset(changelog: ChangelogFile) -> None:
+    section = changelog.find("1.2.0")
+
+    assert section is not None
+    assert CHANGELOG.encode()[section.heading_offset :].startswith(b"### 1.2.0\n")
+    assert CHANGELOG.encode()[section.insert_offset :].startswith(b"\n### 1.2.0")
+    assert changelog.read_section_lines(section) == [
+        "* [FEATURE] Newest\n",
+        "* [BUGFIX] Also newest\n",
+    ]
+
+
+def test_versions_are_compared_as_versions(changelog: ChangelogFile) -> None:
+    # 1.1.10 sorts above 1.1.9, and trailing annotations don't hide the version
+    assert changelog.find("1.1.10") is not None
+    assert changelog.table.below("1.1.10").title == "1.1.9"
+    assert changelog.table.above("1.1.9").title == "1.1.10 (yanked)"
+    assert changelog.table.below("1.1.11").title == "1.1.10 (yanked)"
+    assert changelog.table.below("1.1.0") is None
+    assert changelog.find("1.1.1") is None
+
+
+def test_find_stops_at_the_section_until_the_table_is_needed(
+    changelog: ChangelogFile,
+) -> None:
+    assert changelog.find("1.2.0") is not None
+    assert changelog._sections is None
+
+    # A miss reads every heading, which is kept for the table
+    assert changelog.find("1.3.0") is None
+    assert [s.title for s in changelog.sections] == [
+        "Changelog",
+        "1.2.0",
+        "1.1.10 (yanked)",
+        "1.1.9",
+    ]
+
+
+def test_insert_goes_in_front_of_the_next_lower_version(
+    changelog: ChangelogFile,
+) -> None:
+    section = changelog.table.below("1.1.11")
+    changelog.insert(section.insert_offset, "\n### 1.1.11\n* [BUGFIX] Inserted\n")
+
+    assert _read(changelog) == CHANGELOG.replace(
+        "\n### 1.1.10", "\n### 1.1.11\n* [BUGFIX] Inserted\n\n### 1.1.10"
+    )
+    # Offsets are recomputed after an edit
+    assert changelog.find("1.1.11") is not None
+    assert changelog.find("1.1.9").heading_offset > section.heading_offset
+
+
+def test_splice_rejects_overlapping_edits(changelog: ChangelogFile) -> None:
+    with pytest.raises(ValueError):
+        changelog.splice([(10, 20, "a"), (15, 25, "b")])
+    assert _read(changelog) == CHANGELOG
+
+
+def test_replace_sections_replaces_and_inserts_in_one_pass(
+    changelog: ChangelogFile,
+) -> None:
+    replaced, inserted = changelog.replace_sections(
+        {
+            "1.2.0": "\n### 1.2.0\n* [FEATURE] Rewritten\n",
+            "1.1.12": "\n### 1.1.12\n* [BUGFIX] New\n",
+            "1.1.11": "\n### 1.1.11\n* [BUGFIX] Also new\n",
+        }
+    )
+
+    assert (replaced, inserted) == (1, 2)
+    assert _read(changelog) == (
+        "# Changelog\n"
+        "\n### 1.2.0\n* [FEATURE] Rewritten\n"
+        "\n### 1.1.12\n* [BUGFIX] New\n"
+        "\n### 1.1.11\n* [BUGFIX] Also new\n"
+        "\n### 1.1.10 (yanked)\n* [BUGFIX] Yanked\n"
+        "\n### 1.1.9\n* [DOCS] Oldest\n"
+    )
+
+
+def test_empty_changelog_has_no_sections(tmp_path: pathlib.Path) -> None:
+    path = tmp_path / "changelog.md"
+    path.write_text("")
+
+    assert ChangelogFile(str(path)).find("1.0.0") is None
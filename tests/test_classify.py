@@ -0,0 +1,120 @@
+import datetime as dt
+import json
+import pathlib
+
+import pytest
+
+from ge_releaser.classify import (
+    ChangelogCategory,
+    ClassificationRules,
+    Classifier,
+)
+from ge_releaser.constants import ClassificationRule
+from ge_releaser.pulls import PullRequestSnapshot
+
+
+@pytest.mark.parametrize(
+    "title, category, desc, rule",
+    [
+        ("[FEATURE] Add a thing", "FEATURE", "Add a thing", "tag"),
+        ("[fix] lower-case alias", "BUGFIX", "lower-case alias", "tag"),
+        ("feat(core)!: Breaking", "FEATURE", "Breaking", "prefix"),
+        ("Docs: capitalized prefix", "DOCS", "capitalized prefix", "prefix"),
+        ("  [MAINT]   padded  ", "MAINTENANCE", "padded", "tag"),
+        # An unknown tag falls through, but is still stripped from the description
+        ("[WIP] Unknown tag", "MAINTENANCE", "Unknown tag", "default"),
+        ("No marker at all", "MAINTENANCE", "No marker at all", "default"),
+        # A prefix must be followed by a colon
+        ("fixes everything", "MAINTENANCE", "fixes everything", "default"),
+    ],
+)
+def test_titles(title: str, category: str, desc: str, rule: str) -> None:
+    classification = Classifier().classify(title)
+
+    assert classification.category is ChangelogCategory[category]
+    assert classification.desc == desc
+    assert classification.rule is ClassificationRule(rule)
+
+
+def test_title_markers_win_over_labels() -> None:
+    classification = Classifier().classify("[DOCS] Typo", labels=["bug"])
+
+    assert classification.category is ChangelogCategory.DOCS
+    assert classification.rule is ClassificationRule.TAG
+
+
+def test_earlier_labels_in_the_rules_win() -> None:
+    # "bug" comes before "enhancement" in the defaults, whatever order the PR lists them in
+    classification = Classifier().classify("Untagged", labels=["Enhancement", "bug"])
+
+    assert classification.category is ChangelogCategory.BUGFIX
+    assert classification.rule is ClassificationRule.LABEL
+
+
+def test_rules_file_extends_the_defaults(tmp_path: pathlib.Path) -> None:
+    path = tmp_path / "rules.json"
+    path.write_text(
+        json.dumps(
+            {
+                "tags": {"hotfix": "bugfix"},
+                "prefixes": {"Deps": "MAINTENANCE"},
+                "default": "docs",
+            }
+        )
+    )
+    classifier = Classifier.from_file(str(path))
+
+    assert classifier.classify("[HOTFIX] x").category is ChangelogCategory.BUGFIX
+    assert classifier.classify("deps: bump").category is ChangelogCategory.MAINTENANCE
+    assert classifier.classify("[FEATURE] x").category is ChangelogCategory.FEATURE
+    assert classifier.classify("other").category is ChangelogCategory.DOCS
+
+
+def test_missing_rules_file_keeps_the_defaults(tmp_path: pathlib.Path) -> None:
+    rules = ClassificationRules.from_file(str(tmp_path / "missing.json"))
+
+    assert rules == ClassificationRules.defaults()
+
+
+@pytest.mark.parametrize(
+    "entries",
+    [
+        [],
+        {"unknown": {}},
+        {"tags": {"HOT-FIX": "BUGFIX"}},
+        {"labels": {"bug": "NOT_A_CATEGORY"}},
+        {"default": 1},
+    ],
+)
+def test_invalid_rules_files_are_rejected(
+    tmp_path: pathlib.Path, entries: object
+) -> None:
+    path = tmp_path / "rules.json"
+    path.write_text(json.dumps(entries))
+
+    with pytest.raises(ValueError):
+        ClassificationRules.from_file(str(path))
+
+
+def test_stream_classifies_in_batches_and_counts() -> None:
+    prs = [
+        PullRequestSnapshot(
+            number=number,
+            title=title,
+            merged_at=dt.datetime(2024, 1, 1),
+            author="someone",
+            base_ref="develop",
+            labels=[],
+        )
+        for number, title in enumerate(["[FEATURE] a", "fix: b", "c", "[DOCS] d", "e"])
+    ]
+    classifier = Classifier()
+
+    results = list(classifier.classify_stream(iter(prs), batch_size=2))
+
+    assert [pr["number"] for pr, _ in results] == [0, 1, 2, 3, 4]
+    stats = classifier.stats
+    assert stats.titles == 5
+    assert stats.categories[ChangelogCategory.MAINTENANCE] == 2
+    assert stats.rules[ClassificationRule.DEFAULT] == 2
+    assert stats.rules[ClassificationRule.TAG] == 2
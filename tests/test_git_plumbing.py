@@ -0,0 +1,117 @@
+import os
+import pathlib
+import subprocess
+
+import pytest
+from git.exc import GitCommandError
+
+from ge_releaser.git import GitService
+
+
+def _git(root: pathlib.Path, *args: str) -> str:
+    return subprocess.run(
+        ["git", *args], cwd=root, check=True, capture_output=True, text=True
+    ).stdout.strip()
+
+
+@pytest.fixture
+def repo(tmp_path: pathlib.Path, monkeypatch: pytest.MonkeyPatch) -> pathlib.Path:
+    for kind in ("AUTHOR", "COMMITTER"):
+        monkeypatch.setenv(f"GIT_{kind}_NAME", "Releaser")
+        monkeypatch.setenv(f"GIT_{kind}_EMAIL", "releaser@example.com")
+
+    root = tmp_path / "repo"
+    files = {
+        "top.txt": "top\n",
+        "a/b/c.txt": "c\n",
+        "a/d.txt": "d\n",
+        "x/y.txt": "y\n",
+        "run.sh": "#!/bin/sh\n",
+    }
+    for path, contents in files.items():
+        (root / path).parent.mkdir(parents=True, exist_ok=True)
+        (root / path).write_text(contents)
+    os.chmod(root / "run.sh", 0o755)
+    _git(root, "init", "--quiet", "--initial-branch", "develop")
+    _git(root, "add", ".")
+    _git(root, "commit", "--quiet", "-m", "initial")
+    return root
+
+
+@pytest.fixture
+def service(repo: pathlib.Path) -> GitService:
+    return GitService(
+        github_token="",
+        repo_name="great-expectations/great_expectations",
+        trunk="develop",
+        remote="origin",
+        root=str(repo),
+    )
+
+
+def test_commit_files_rewrites_only_the_changed_paths(
+    repo: pathlib.Path, service: GitService, tmp_path: pathlib.Path
+) -> None:
+    (repo / "top.txt").write_text("uncommitted edit\n")
+    status = _git(repo, "status", "--porcelain")
+    head = _git(repo, "rev-parse", "HEAD")
+
+    updates = tmp_path / "updates"
+    updates.mkdir()
+    for name, contents in (("c", "new c\n"), ("e", "e\n"), ("run", "#!/bin/bash\n")):
+        (updates / name).write_text(contents)
+    commit = service.commit_files(
+        "HEAD",
+        {
+            "a/b/c.txt": str(updates / "c"),
+            "a/new/e.txt": str(updates / "e"),
+            "run.sh": str(updates / "run"),
+        },
+        message="release_prep",
+        branch="release-1.0.0",
+    )
+
+    assert _git(repo, "rev-parse", "release-1.0.0") == commit
+    assert _git(repo, "rev-parse", f"{commit}^") == head
+    assert _git(repo, "diff", "--name-status", head, commit).splitlines() == [
+        "M\ta/b/c.txt",
+        "A\ta/new/e.txt",
+        "M\trun.sh",
+    ]
+    assert _git(repo, "show", f"{commit}:a/b/c.txt") == "new c"
+    # Untouched trees are shared, and modes are kept
+    assert _git(repo, "rev-parse", f"{commit}:x") == _git(repo, "rev-parse", "HEAD:x")
+    assert _git(repo, "ls-tree", commit, "run.sh").startswith("100755 ")
+    # The checkout is left as it was
+    assert _git(repo, "rev-parse", "HEAD") == head
+    assert _git(repo, "status", "--porcelain") == status
+
+
+def test_commit_files_never_moves_an_existing_branch(
+    repo: pathlib.Path, service: GitService
+) -> None:
+    _git(repo, "branch", "release-1.0.0")
+
+    with pytest.raises(GitCommandError, match="release-1.0.0"):
+        service.commit_files(
+            "HEAD",
+            {"top.txt": str(repo / "a" / "d.txt")},
+            message="release_prep",
+            branch="release-1.0.0",
+        )
+    assert _git(repo, "rev-parse", "release-1.0.0") == _git(repo, "rev-parse", "HEAD")
+
+
+def test_export_files_skips_missing_paths(
+    repo: pathlib.Path, service: GitService, tmp_path: pathlib.Path
+) -> None:
+    (repo / "a" / "b" / "c.txt").write_text("uncommitted edit\n")
+    destination = tmp_path / "export"
+
+    exported = service.export_files(
+        "HEAD", ["a/b/c.txt", "x/y.txt", "missing.txt"], str(destination)
+    )
+
+    assert sorted(exported) == ["a/b/c.txt", "x/y.txt"]
+    assert (destination / "a" / "b" / "c.txt").read_text() == "c\n"
+    assert not (destination / "missing.txt").exists()
@@ -0,0 +1,98 @@
+import os
+import pathlib
+from typing import Dict
+
+import pytest
+
+from ge_releaser.constants import GxFile
+from ge_releaser.rewrite import (
+    VERSION_TARGETS,
+    FileEdit,
+    apply_edits,
+    stage_version_rewrites,
+)
+
+FILES: Dict[GxFile, str] = {
+    GxFile.DEPLOYMENT_VERSION: "0.18.7\n",
+    GxFile.DOCS_DATA_COMPONENT: (
+        "export default {\n"
+        "  release_version: 'great_expectations, version 0.18.7',\n"
+        "  min_python: 'Python 3.8',\n"
+        "}\n"
+    ),
+    GxFile.DOCS_CONFIG: (
+        "versions: {\n  current: {\n    label: '0.18.7',\n    path: ''\n  }\n}\n"
+    ),
+}
+
+
+@pytest.fixture
+def root(tmp_path: pathlib.Path) -> pathlib.Path:
+    for file, contents in FILES.items():
+        path = tmp_path / file.value
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(contents)
+    return tmp_path
+
+
+def _contents(root: pathlib.Path) -> Dict[GxFile, str]:
+    return {file: (root / file.value).read_text() for file in FILES}
+
+
+def test_every_target_is_bumped(root: pathlib.Path) -> None:
+    edits = stage_version_rewrites("0.18.7", "0.18.8", root=str(root))
+    # Staging alone doesn't write anything
+    assert _contents(root) == FILES
+
+    apply_edits(edits)
+
+    assert len(edits) == len(VERSION_TARGETS)
+    assert _contents(root) == {
+        file: contents.replace("0.18.7", "0.18.8") for file, contents in FILES.items()
+    }
+
+
+def test_a_missing_match_stages_nothing(root: pathlib.Path) -> None:
+    (root / GxFile.DOCS_CONFIG.value).write_text("versions: {}\n")
+
+    with pytest.raises(ValueError, match="version in docs version dropdown"):
+        stage_version_rewrites("0.18.7", "0.18.8", root=str(root))
+    assert (root / GxFile.DEPLOYMENT_VERSION.value).read_text() == "0.18.7\n"
+
+
+def test_a_failed_rename_restores_the_files_already_replaced(
+    root: pathlib.Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    edits = stage_version_rewrites("0.18.7", "0.18.8", root=str(root))
+    real_replace = os.replace
+    calls = []
+
+    def _replace(src: str, dst: str) -> None:
+        calls.append(dst)
+        # Fail the second rename of the commit phase
+        if len(calls) == 2:
+            raise OSError("disk full")
+        real_replace(src, dst)
+
+    monkeypatch.setattr(os, "replace", _replace)
+
+    with pytest.raises(OSError, match="disk full"):
+        apply_edits(edits)
+
+    assert _contents(root) == FILES
+    # No temporary files are left behind
+    leftovers = [p.name for p in root.rglob(".*") if p.is_file()]
+    assert leftovers == []
+
+
+def test_a_failed_write_leaves_every_file_alone(root: pathlib.Path) -> None:
+    edits = stage_version_rewrites("0.18.7", "0.18.8", root=str(root))
+    missing_dir = FileEdit(
+        path=str(root / "missing" / "file"), original="", updated="new"
+    )
+
+    with pytest.raises(OSError):
+        apply_edits([*edits, missing_dir])
+
+    assert _contents(root) == FILES
+    assert [p.name for p in root.rglob(".*") if p.is_file()] == []
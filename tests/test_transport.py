@@ -0,0 +1,94 @@
+import time
+from typing import Dict, Optional
+
+import pytest
+import requests
+
+from ge_releaser.constants import HTTP_MAX_RETRY_WAIT
+from ge_releaser.transport import Transport
+
+
+def _response(
+    status: int, headers: Optional[Dict[str, str]] = None, body: str = ""
+) -> requests.Response:
+    response = requests.Response()
+    response.status_code = status
+    response.headers.update(headers or {})
+    response._content = body.encode()
+    return response
+
+
+@pytest.fixture
+def transport() -> Transport:
+    return Transport(backoff_base=1.0, backoff_cap=8.0)
+
+
+@pytest.mark.parametrize("status", [500, 502, 503, 504])
+def test_server_errors_back_off_with_jitter(transport: Transport, status: int) -> None:
+    for attempt, full in enumerate([1.0, 2.0, 4.0, 8.0, 8.0]):
+        delay = transport._retry_delay(_response(status), attempt, retryable=True)
+        # Equal jitter: at least half of the capped exponential delay, at most all of it
+        assert delay is not None and full / 2 <= delay <= full
+
+
+def test_server_errors_are_not_retried_for_unsafe_requests(
+    transport: Transport,
+) -> None:
+    assert transport._retry_delay(_response(502), 0, retryable=False) is None
+
+
+@pytest.mark.parametrize("status", [200, 304, 400, 404, 422])
+def test_other_statuses_are_not_retried(transport: Transport, status: int) -> None:
+    assert transport._retry_delay(_response(status), 0, retryable=True) is None
+
+
+def test_retry_after_is_honored_even_for_unsafe_requests(
+    transport: Transport,
+) -> None:
+    response = _response(429, {"Retry-After": "7"})
+
+    assert transport._retry_delay(response, 0, retryable=False) == 7.0
+
+
+def test_retry_after_beyond_the_max_wait_is_not_retried(
+    transport: Transport,
+) -> None:
+    response = _response(429, {"Retry-After": str(HTTP_MAX_RETRY_WAIT + 1)})
+
+    assert transport._retry_delay(response, 0, retryable=True) is None
+
+
+def test_exhausted_rate_limit_is_retried_once_the_reset_is_near(
+    transport: Transport,
+) -> None:
+    soon = _response(
+        403,
+        {"X-RateLimit-Remaining": "0", "X-RateLimit-Reset": str(int(time.time()) + 5)},
+    )
+    later = _response(
+        403,
+        {
+            "X-RateLimit-Remaining": "0",
+            "X-RateLimit-Reset": str(int(time.time()) + HTTP_MAX_RETRY_WAIT + 60),
+        },
+    )
+
+    # The rate-limit bucket does the waiting, so the retry itself isn't delayed
+    assert transport._retry_delay(soon, 0, retryable=True) == 0.0
+    assert transport._retry_delay(later, 0, retryable=True) is None
+
+
+def test_secondary_rate_limit_backs_off(transport: Transport) -> None:
+    response = _response(
+        403, body='{"message": "You have exceeded a secondary rate limit"}'
+    )
+
+    delay = transport._retry_delay(response, 2, retryable=False)
+
+    assert delay is not None and 2.0 <= delay <= 4.0
+
+
+def test_forbidden_without_a_rate_limit_is_not_retried(transport: Transport) -> None:
+    response = _response(403, {"X-RateLimit-Remaining": "4000"}, "Bad credentials")
+
+    assert transport._retry_delay(response, 0, retryable=True) is None